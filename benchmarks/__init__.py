@@ -0,0 +1,5 @@
+"""Microbenchmarks of Ethel's CPU-side hot paths
+
+Run with `python -m benchmarks`. Results are stored per commit and compared with the
+previous commit to catch performance regressions.
+"""
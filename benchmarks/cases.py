@@ -0,0 +1,160 @@
+"""Benchmark cases
+
+CPU-side hot paths of Ethel, fed by the Hypothesis strategies used by the tests. Each
+case prepares its data once and returns a callable, which is then timed.
+"""
+from datetime import date, timedelta
+from types import SimpleNamespace
+from typing import Callable, Dict, List
+
+from hypothesis import HealthCheck, Phase, given, settings
+from hypothesis.strategies import SearchStrategy
+from requests import HTTPError, Response
+
+import tests.strategies as custom_st
+from ethel import Account
+from ethel.api.exceptions import EthelError, raises_from_ebs
+from ethel.api.subscription import RegnumV5
+from ethel.api.user import UserV1
+from ethel.utils import get_instance_multiplier, get_quantity, parse_date, parse_duration
+
+Case = Callable[[int], Callable[[], None]]
+
+
+def sample(strategy: SearchStrategy, count: int) -> list:
+    """Draw reproducible examples from a strategy.
+
+    Args:
+        strategy (SearchStrategy): Strategy to draw from.
+        count (int): Number of examples.
+
+    Returns:
+        list: Examples, the same for every run.
+    """
+    examples: list = []
+
+    @settings(
+        max_examples=count,
+        derandomize=True,
+        database=None,
+        phases=[Phase.generate],
+        suppress_health_check=list(HealthCheck),
+        deadline=None,
+    )
+    @given(strategy)
+    def collect(example):
+        examples.append(example)
+
+    collect()  # pylint: disable=no-value-for-parameter
+    return examples
+
+
+def sample_pools(size: int) -> List[dict]:
+    """A pool list of the given size, cycling through drawn pools."""
+    drawn = [pool for pools in sample(custom_st.pools, 100) for pool in pools]
+    drawn = drawn or sample(custom_st.pools.filter(bool), 1)[0]
+    return [dict(drawn[i % len(drawn)], id=i) for i in range(size)]
+
+
+def template_render(size: int) -> Callable[[], None]:
+    """Render order and user creation payloads."""
+    order = RegnumV5.PAYLOAD_TEMPLATE
+    user = UserV1.CREATE_PAYLOAD_TEMPLATE
+    start = date(2020, 1, 1)
+
+    def run() -> None:
+        for i in range(size):
+            order.render(
+                username="USERNAME",
+                sku_id="SKU",
+                quantity=i,
+                start_date=start,
+                duration=365,
+            )
+            user.render(
+                username="USERNAME",
+                password="PASSWORD",
+                first_name="First",
+                last_name="Last",
+                email="user@example.com",
+            )
+
+    return run
+
+
+def list_pools(size: int) -> Callable[[], None]:
+    """Map a large pool list with Account.POOL_ATTRIBUTES_MAPPING."""
+    pools = sample_pools(size)
+    candlepin = SimpleNamespace(get_pools=lambda *args, **kwargs: pools)
+    account = Account.restore(
+        SimpleNamespace(candlepin=candlepin), "USERNAME", "PASSWORD", 1, 1
+    )
+    return lambda: account.list_pools() and None
+
+
+def quantity(size: int) -> Callable[[], None]:
+    """Compute quantities and instance multipliers of a large pool list."""
+    pools = sample_pools(size)
+
+    def run() -> None:
+        for pool in pools:
+            get_quantity(pool)
+            get_instance_multiplier(pool)
+
+    return run
+
+
+def parse_dates(size: int) -> Callable[[], None]:
+    """Parse dates and durations of all accepted types."""
+    dates = ["today", "yesterday", "tomorrow", "2020-02-08", date(2020, 2, 9)]
+    durations = [365, timedelta(days=10)]
+
+    def run() -> None:
+        for i in range(size):
+            parse_date(dates[i % len(dates)])
+            parse_duration(durations[i % len(durations)])
+
+    return run
+
+
+def ebs_exception_mapping(size: int) -> Callable[[], None]:
+    """Map EBS error responses to EthelError."""
+    response = Response()
+    response.status_code = 500
+    response._content = (  # pylint: disable=protected-access
+        b'{"msgName": "com.redhat.services.util.rest.ExceptionMessage", '
+        b'"message": ["Login exists"], '
+        b'"type": ["com.redhat.services.user.LoginExistsException"]}'
+    )
+    error = HTTPError(response=response)
+
+    @raises_from_ebs
+    def fail(_):
+        raise error
+
+    def run() -> None:
+        for _ in range(size):
+            try:
+                fail(None)
+            except EthelError:
+                pass
+
+    return run
+
+
+# Cases and their default size
+CASES: Dict[str, Case] = dict(
+    template_render=template_render,
+    list_pools=list_pools,
+    quantity=quantity,
+    parse_dates=parse_dates,
+    ebs_exception_mapping=ebs_exception_mapping,
+)
+
+SIZES: Dict[str, int] = dict(
+    template_render=100,
+    list_pools=10000,
+    quantity=10000,
+    parse_dates=10000,
+    ebs_exception_mapping=1000,
+)
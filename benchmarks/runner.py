@@ -0,0 +1,167 @@
+"""Benchmark runner
+
+Time benchmark cases, store the results per commit in a JSON lines history file and
+compare them with a baseline commit.
+"""
+import argparse
+import json
+import subprocess
+import timeit
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from .cases import CASES, SIZES
+
+HISTORY = Path(".benchmarks/history.jsonl")
+
+# Relative slowdown reported as a regression
+THRESHOLD = 0.1
+
+
+def git_revision() -> str:
+    """Current commit, suffixed with "+dirty" if the working tree has changes."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, check=True, text=True
+        ).stdout.strip()
+        status = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"],
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+    return f"{commit}+dirty" if status else commit
+
+
+def measure(
+    names: Iterable[str], size_scale: float = 1.0, repeat: int = 5
+) -> Dict[str, float]:
+    """Time benchmark cases.
+
+    Args:
+        names (Iterable[str]): Names of cases to run.
+        size_scale (float, optional): Multiplier of the default case sizes.
+            Defaults to 1.0.
+        repeat (int, optional): Number of timed runs, the fastest one is kept.
+            Defaults to 5.
+
+    Returns:
+        Dict[str, float]: Seconds per run of each case.
+    """
+    results = {}
+    for name in names:
+        run = CASES[name](max(1, int(SIZES[name] * size_scale)))
+        results[name] = min(timeit.repeat(run, number=1, repeat=repeat))
+    return results
+
+
+def load_history(path: Path) -> List[dict]:
+    """Read all stored records, oldest first."""
+    if not path.exists():
+        return []
+    with path.open() as history:
+        return [json.loads(line) for line in history if line.strip()]
+
+
+def store(path: Path, record: dict) -> None:
+    """Append a record to the history."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("a") as history:
+        history.write(json.dumps(record) + "\n")
+
+
+def find_baseline(
+    history: List[dict], revision: str, baseline: str = None
+) -> Optional[dict]:
+    """Find the record to compare with.
+
+    Args:
+        history (List[dict]): Stored records, oldest first.
+        revision (str): Revision of the current run.
+        baseline (str, optional): Revision (or its prefix) to compare with. Defaults
+            to None (the latest record of a different revision).
+
+    Returns:
+        Optional[dict]: Baseline record, None if there is none.
+    """
+    for record in reversed(history):
+        if baseline is not None and record["revision"].startswith(baseline):
+            return record
+        if baseline is None and record["revision"] != revision:
+            return record
+    return None
+
+
+def compare(
+    results: Dict[str, float], baseline: Dict[str, float], threshold: float = THRESHOLD
+) -> Dict[str, float]:
+    """Find regressions against a baseline.
+
+    Args:
+        results (Dict[str, float]): Seconds per run of each case.
+        baseline (Dict[str, float]): Seconds per run of the baseline.
+        threshold (float, optional): Relative slowdown considered a regression.
+            Defaults to THRESHOLD.
+
+    Returns:
+        Dict[str, float]: Relative slowdown of each regressed case.
+    """
+    return {
+        name: seconds / baseline[name] - 1
+        for name, seconds in results.items()
+        if baseline.get(name) and seconds / baseline[name] - 1 > threshold
+    }
+
+
+def main(argv: List[str] = None) -> int:
+    """Run benchmarks, store and compare results.
+
+    Returns:
+        int: Exit code, 1 if there is a regression.
+    """
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__)
+    parser.add_argument("--only", nargs="+", choices=sorted(CASES), default=list(CASES))
+    parser.add_argument("--history", type=Path, default=HISTORY)
+    parser.add_argument("--baseline", help="Revision to compare with.")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD)
+    parser.add_argument("--size-scale", type=float, default=1.0)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--no-store", action="store_true", help="Don't store results.")
+    args = parser.parse_args(argv)
+
+    revision = git_revision()
+    results = measure(args.only, args.size_scale, args.repeat)
+    history = [
+        record
+        for record in load_history(args.history)
+        if record.get("size_scale") == args.size_scale
+    ]
+    baseline = find_baseline(history, revision, args.baseline)
+    regressions = compare(
+        results, baseline["results"] if baseline else {}, args.threshold
+    )
+
+    if baseline:
+        print(f"Compared with {baseline['revision']}")
+    for name, seconds in results.items():
+        line = f"{name:<24} {seconds * 1000:10.3f} ms"
+        if baseline and name in baseline["results"]:
+            line += f" {seconds / baseline['results'][name] - 1:+8.1%}"
+        if name in regressions:
+            line += "  REGRESSION"
+        print(line)
+
+    if not args.no_store:
+        store(
+            args.history,
+            dict(
+                revision=revision,
+                timestamp=datetime.now().isoformat(),
+                size_scale=args.size_scale,
+                results=results,
+            ),
+        )
+    return 1 if regressions else 0
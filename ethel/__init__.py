@@ -3,5 +3,7 @@
 Account management tool for testing.
 """
 from .account import Account
-from .api import EthelConnectionError, EthelError
-from .ethel import Ethel
+from .api import DeadlineExceeded, EthelConnectionError, EthelError, deadline
+from .ethel import Ethel, register_environment
+from .handle import AccountHandle
+from .ledger import Ledger
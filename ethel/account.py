@@ -1,13 +1,28 @@
+import threading
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
 from datetime import date, datetime, timedelta
-from typing import List, Union
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Union
 
-from .api import API
+from .api import API, deadline
+from .ledger import Ledger, Subscription
+from .pools import FINGERPRINT_FIELDS, PoolChanges, PoolSnapshot, diff_pools
+from .scheduler import PhaseScheduler
 from .utils import (apply_mapping, get_instance_multiplier, get_quantity,
-                    parse_date, parse_duration)
+                    map_concurrently, parse_date, parse_duration, wait_for)
 
+# Pending subscription IDs by SKU of each account, collected by the innermost
+# defer_visibility() block of the current context
+_DEFERRED: ContextVar[Dict["Account", Dict[str, Set[str]]]] = ContextVar(
+    "deferred_visibility", default={}
+)
 
-class Account:
-    def __init__(
+
+# Account is the single entry point to all operations on an account, by design
+class Account:  # pylint: disable=too-many-public-methods
+    # Keyword arguments are the account spec, also accepted by bulk creation
+    def __init__(  # pylint: disable=too-many-arguments
         self,
         api: API,
         username: str,
@@ -17,11 +32,14 @@ class Account:
         email: str = None,
         create_owners: bool = True,
         accept_terms: bool = True,
+        skus: Iterable[str] = (),
+        ledger: Ledger = None,
+        timeout: float = None,
     ) -> None:
         """
         New account.
 
-        Create new account.
+        Create new account. Account methods are safe to call from multiple threads.
 
         Args:
             api (API): API data structure instance.
@@ -34,7 +52,36 @@ class Account:
                 candlepin owners account. Defaults to True.
             accept_terms (bool, optional): Activate the account by acception Terms and
                 Conditions. Defaults to True.
+            skus (Iterable[str], optional): Subscribe the new account to these SKUs.
+                Defaults to no subscriptions.
+            ledger (Ledger, optional): Ledger to record subscriptions into. Defaults
+                to a new unbounded in-memory ledger.
+            timeout (float, optional): Deadline in seconds for the whole creation, each
+                phase gets only the remaining time. Defaults to None (no deadline).
+
+        Raises:
+            DeadlineExceeded: Account was not created within the timeout.
         """
+        self._init_state(api, username, password, first_name, last_name, email, ledger)
+
+        with nullcontext() if timeout is None else deadline(timeout):
+            if self.does_exist():
+                self.login()
+                return
+
+            self._provision(create_owners, accept_terms, list(skus))
+
+    def _init_state(  # pylint: disable=too-many-arguments
+        self,
+        api: API,
+        username: str,
+        password: str,
+        first_name: Optional[str],
+        last_name: Optional[str],
+        email: Optional[str],
+        ledger: Optional[Ledger],
+    ) -> None:
+        """Initialize account attributes, without any requests."""
         self.username = username
         self.password = password
         self.first_name = first_name
@@ -45,20 +92,85 @@ class Account:
         self._org_id: int = None  # type: ignore
         self._owner_id: int = None  # type: ignore
         self._latest_refresh_job_id: str = None  # type: ignore
-        self.orders: List[dict] = []
-        self.activations: List[dict] = []
+        self.ledger = Ledger() if ledger is None else ledger
+        self.consumers: List[str] = []
+        self._registered_consumers = 0
+        self._lock = threading.RLock()
+
+    @classmethod
+    def restore(
+        cls,
+        api: API,
+        username: str,
+        password: str,
+        org_id: int = None,
+        owner_id: int = None,
+        ledger: Ledger = None,
+    ) -> "Account":
+        """Rebuild an already provisioned account without any requests.
 
-        if self.does_exist():
-            self.login()
-            return
+        Neither existence nor credentials are verified.
+
+        Args:
+            api (API): API data structure instance.
+            username (str): Account's username.
+            password (str): Account's password.
+            org_id (int, optional): Known organization ID. Defaults to None (looked
+                up on first use).
+            owner_id (int, optional): Known owner ID. Defaults to None (looked up on
+                first use).
+            ledger (Ledger, optional): Ledger to record subscriptions into. Defaults
+                to a new unbounded in-memory ledger.
 
-        self.create()
+        Returns:
+            Account: Account object.
+        """
+        account = cls.__new__(cls)
+        account._init_state(  # pylint: disable=protected-access
+            api, username, password, None, None, None, ledger
+        )
+        account._org_id = org_id  # pylint: disable=protected-access
+        account._owner_id = owner_id  # pylint: disable=protected-access
+        return account
 
-        if create_owners:
-            self.start_refresh()
+    def _provision(
+        self, create_owners: bool, accept_terms: bool, skus: List[str]
+    ) -> None:
+        """Run the account creation phases.
+
+        Phases which don't depend on each other run concurrently. Terms acceptance
+        needs only the username, while Candlepin refresh and subscriptions need to know
+        the organization ID first. The refresh waits for all subscriptions, so it
+        creates their pools.
+
+        Args:
+            create_owners (bool): Perform a Candlepin refresh.
+            accept_terms (bool): Accept required Terms and Conditions.
+            skus (List[str]): SKUs to subscribe to.
+        """
+        scheduler = PhaseScheduler()
+        scheduler.add("create", self.create)
+
+        if create_owners or skus:
+            scheduler.add("org_id", lambda: self.org_id, depends_on=["create"])
 
         if accept_terms:
-            self.accept_all_terms()
+            scheduler.add("terms", self.accept_all_terms, depends_on=["create"])
+
+        subscriptions = [f"subscribe:{idx}:{sku_id}" for idx, sku_id in enumerate(skus)]
+        for name, sku_id in zip(subscriptions, skus):
+            scheduler.add(
+                name,
+                lambda sku_id=sku_id: self.subscribe(sku_id),
+                depends_on=["org_id"],
+            )
+
+        if create_owners:
+            scheduler.add(
+                "refresh", self.start_refresh, depends_on=["org_id", *subscriptions]
+            )
+
+        scheduler.run()
 
     @property
     def org_id(self) -> int:
@@ -69,12 +181,13 @@ class Account:
         Returns:
             int: Organization ID
         """
-        if self._org_id is None:
-            account_list = self.api.user.login(self.username)
-            account = account_list[0] if account_list else {}
-            self._org_id = account.get("orgId")
+        with self._lock:
+            if self._org_id is None:
+                account_list = self.api.user.login(self.username)
+                account = account_list[0] if account_list else {}
+                self._org_id = account.get("orgId")
 
-        return self._org_id
+            return self._org_id
 
     @property
     def owner_id(self) -> int:
@@ -85,13 +198,14 @@ class Account:
         Returns:
             int: Owner ID
         """
-        if not self._owner_id:
-            owners = self.api.candlepin.get_owners(self.username, self.password)
-            if not len(owners) == 1:
-                raise IndexError('A single owner is expected', owners)
-            self._owner_id = int(owners[0].get("key"))
+        with self._lock:
+            if not self._owner_id:
+                owners = self.api.candlepin.get_owners(self.username, self.password)
+                if not len(owners) == 1:
+                    raise IndexError('A single owner is expected', owners)
+                self._owner_id = int(owners[0].get("key"))
 
-        return self._owner_id
+            return self._owner_id
 
     def does_exist(self) -> bool:
         """Check if account already exists.
@@ -141,6 +255,36 @@ class Account:
         instance_multiplier=get_instance_multiplier,
     )
 
+    # Pool attributes needed by POOL_ATTRIBUTES_MAPPING
+    POOL_FIELDS = (
+        "id",
+        "productId",
+        "productName",
+        "startDate",
+        "endDate",
+        "multiplier",
+        "quantity",
+        "productAttributes",
+    )
+
+    def _pool_fields(self, filter_attributes: dict) -> Optional[List[str]]:
+        """Pool attributes required by a mapping.
+
+        Args:
+            filter_attributes (dict): Mapping of pool attributes.
+
+        Returns:
+            Optional[List[str]]: Required pool attributes, None if unknown.
+        """
+        if filter_attributes is self.POOL_ATTRIBUTES_MAPPING:
+            return list(self.POOL_FIELDS)
+
+        mapped = list(filter_attributes.values())
+        if mapped and all(isinstance(value, str) for value in mapped):
+            return mapped
+
+        return None
+
     def list_pools(  # pylint: disable=dangerous-default-value
         self, future: bool = False, filter_attributes: dict = POOL_ATTRIBUTES_MAPPING
     ) -> list:
@@ -156,12 +300,111 @@ class Account:
                     value: Either a key of the API response dict or a callable
                 Defaults to Account.POOL_ATTRIBUTES_MAPPING
 
+        Only the pool attributes required by filter_attributes are requested from
+        Candlepin, when they are known.
+
         Returns:
             list: List of all subscriptions.
         """
         raw_pools = self.api.candlepin.get_pools(
-            self.username, self.password, self.owner_id, future=future
+            self.username,
+            self.password,
+            self.owner_id,
+            future=future,
+            fields=self._pool_fields(filter_attributes),
+        )
+        return self._map_pools(raw_pools, filter_attributes)
+
+    def find_pools(  # pylint: disable=dangerous-default-value
+        self,
+        sku: str = None,
+        active_on: Union[datetime, date, str] = None,
+        matches: str = None,
+        attributes: Dict[str, str] = None,
+        consumer: str = None,
+        filter_attributes: dict = POOL_ATTRIBUTES_MAPPING,
+    ) -> list:
+        """Find pools using Candlepin's server-side filters.
+
+        Only matching pools are transferred, unlike list_pools which lists all pools of
+        the account. Future pools are included unless active_on is set.
+
+        Examples:
+        >>> account.find_pools(sku="SKU_A", active_on="today")
+
+        Args:
+            sku (str, optional): Product ID (SKU) of the pools. Defaults to None.
+            active_on (Union[datetime, date, str], optional): Pools active on this date.
+                See ethel.utils.parse_date for all accepted values. Defaults to None.
+            matches (str, optional): Pools whose product ID, name or attributes match
+                this string, "*" and "?" are wildcards. Defaults to None.
+            attributes (Dict[str, str], optional): Pools with these attribute values.
+                Defaults to None.
+            consumer (str, optional): Pools available to this consumer UUID. Defaults
+                to None.
+            filter_attributes (dict, optional): Mapping of pool attributes, see
+                list_pools. Defaults to Account.POOL_ATTRIBUTES_MAPPING
+
+        Returns:
+            list: List of matching pools.
+        """
+        raw_pools = self.api.candlepin.get_pools(
+            self.username,
+            self.password,
+            self.owner_id,
+            future=active_on is None,
+            product=sku,
+            fields=self._pool_fields(filter_attributes),
+            active_on=None if active_on is None else parse_date(active_on),
+            matches=matches,
+            attributes=attributes,
+            consumer=consumer,
+        )
+        return self._map_pools(raw_pools, filter_attributes)
+
+    def pool_changes(  # pylint: disable=dangerous-default-value
+        self,
+        since: PoolSnapshot = None,
+        future: bool = False,
+        filter_attributes: dict = POOL_ATTRIBUTES_MAPPING,
+    ) -> PoolChanges:
+        """List pools added, changed or removed since a previous snapshot.
+
+        Pools are compared by a compact fingerprint (ID, dates and quantity) and only
+        added and changed pools are mapped by filter_attributes.
+
+        Examples:
+        >>> changes = account.pool_changes()  # All pools are added
+        >>> changes = account.pool_changes(since=changes.snapshot)
+        >>> changes.added, changes.changed, changes.removed
+        ([], [], [])
+
+        Args:
+            since (PoolSnapshot, optional): Snapshot of a previous listing, see
+                PoolChanges.snapshot. Defaults to None (all pools are added).
+            future (bool, optional): Include also subscription pools available in
+                future. Defaults to False.
+            filter_attributes (dict, optional): Mapping of pool attributes, see
+                list_pools. Defaults to Account.POOL_ATTRIBUTES_MAPPING
+
+        Returns:
+            PoolChanges: Added and changed pools, removed pool IDs and a new snapshot.
+        """
+        fields = self._pool_fields(filter_attributes)
+        if fields is not None:
+            fields = list(dict.fromkeys([*fields, *FINGERPRINT_FIELDS]))
+
+        raw_pools = self.api.candlepin.get_pools(
+            self.username, self.password, self.owner_id, future=future, fields=fields
         )
+        changes = diff_pools(raw_pools, since)
+        changes.added = self._map_pools(changes.added, filter_attributes)
+        changes.changed = self._map_pools(changes.changed, filter_attributes)
+        return changes
+
+    @staticmethod
+    def _map_pools(raw_pools: list, filter_attributes: dict) -> list:
+        """Apply a mapping of pool attributes to raw pools."""
         if not filter_attributes:
             return raw_pools
 
@@ -172,6 +415,83 @@ class Account:
 
         return pools
 
+    def expired_pools(self, today: Union[datetime, date, str] = None) -> List[str]:
+        """List pools which already ended.
+
+        Args:
+            today (Union[datetime, date, str], optional): Pools ending before this date
+                are expired. See ethel.utils.parse_date for all accepted values.
+                Defaults to None (today).
+
+        Returns:
+            List[str]: IDs of expired pools.
+        """
+        today = parse_date(today)
+        pools = self.api.candlepin.get_pools(
+            self.username,
+            self.password,
+            self.owner_id,
+            future=True,
+            fields=["id", "endDate"],
+        )
+        return [
+            pool["id"]
+            for pool in pools
+            if date.fromisoformat(pool["endDate"][:10]) < today
+        ]
+
+    def reset(self, to_skus: Iterable[str] = (), timeout: float = 300) -> None:
+        """Reset the account to the given subscriptions.
+
+        Reuse an existing account instead of creating a new one. Expired pools are
+        deleted, missing SKUs are subscribed to and a single Candlepin refresh makes
+        them visible. Pools of other SKUs and pools over the requested count of their
+        SKU are kept: their subscriptions stay active upstream, so the next refresh
+        would create them again.
+
+        Examples:
+        >>> account.reset(to_skus=["SKU_A", "SKU_A", "SKU_B"])
+
+        Args:
+            to_skus (Iterable[str], optional): SKUs the account should be subscribed
+                to, repeat a SKU for multiple pools. Defaults to no subscriptions.
+            timeout (float, optional): Seconds to wait for the new pools. Defaults
+                to 300.
+
+        Raises:
+            TimeoutError: New pools didn't appear in time.
+        """
+        active: Counter = Counter()
+        today = date.today()
+
+        pools = self.api.candlepin.get_pools(
+            self.username,
+            self.password,
+            self.owner_id,
+            future=True,
+            fields=["id", "productId", "endDate"],
+        )
+        for pool in pools:
+            if date.fromisoformat(pool["endDate"][:10]) < today:
+                self.api.candlepin.delete_pool(pool["id"])
+            else:
+                active[pool["productId"]] += 1
+
+        with self.defer_visibility(timeout):
+            for sku_id in (Counter(to_skus) - active).elements():
+                self.subscribe(sku_id, wait=True)
+
+    def retire(self) -> None:
+        """Delete the account from Candlepin.
+
+        Deletes the Candlepin owner, including all its pools, and the Candlepin user.
+        The user account itself is kept by the User service.
+        """
+        self.api.candlepin.delete_owner(self.owner_id)
+        self.api.candlepin.delete_user(self.username)
+        with self._lock:
+            self._owner_id = None  # type: ignore
+
     def start_refresh(self) -> None:
         """Requests a Candlepin refresh job.
 
@@ -203,6 +523,7 @@ class Account:
         quantity: int = 1,
         start_date: Union[datetime, date, str] = None,
         duration: Union[timedelta, int] = 365,
+        wait: bool = False,
     ) -> int:
         """Create subscription to a product.
 
@@ -221,6 +542,9 @@ class Account:
                 Defaults to None.
             duration (Union[timedelta, int], optional): Subscription duration. See
                 ethel.utils.parse_duration for all accepted values. Defaults to 365.
+            wait (bool, optional): Wait until the pool is visible in Candlepin. When
+                called within defer_visibility(), the wait is postponed until the end
+                of the block. Defaults to False.
 
         Returns:
             int: Subscription ID
@@ -231,15 +555,115 @@ class Account:
         order = self.api.regnum.order(
             self.username, sku_id, quantity, start_date, duration
         )
-        self.orders.append(order)
         registration_num = order["regNumbers"][0][0]["regNumber"]
 
         activation = self.api.activation.activate(
             self.username, self.org_id, registration_num, start_date
         )
-        self.activations.append(activation)
+        self.ledger.add(
+            Subscription(
+                sku_id=sku_id,
+                quantity=quantity,
+                reg_number=registration_num,
+                activation_id=activation["id"],
+                start_date=start_date,
+                duration=duration.days,
+            )
+        )
+
+        if wait:
+            subscription_id = str(activation["id"])
+            deferred = _DEFERRED.get().get(self)
+            if deferred is None:
+                self.wait_for_pools({sku_id: {subscription_id}})
+            else:
+                with self._lock:
+                    deferred.setdefault(sku_id, set()).add(subscription_id)
+
         return activation["id"]
 
+    @contextmanager
+    def defer_visibility(self, timeout: float = 300) -> Iterator["Account"]:
+        """Postpone waiting for subscribed pools till the end of the block.
+
+        All subscribe(..., wait=True) calls within the block are collected and a single
+        Candlepin refresh is triggered for all of them when the block is left. Deferral
+        applies to the current thread and to work it submits through
+        ethel.api.deadline.propagate, not to other threads using the same account.
+        Nested blocks are waited for by the outermost one.
+
+        Examples:
+        >>> with account.defer_visibility():
+        ...     account.subscribe("SKU_A", wait=True)
+        ...     account.subscribe("SKU_B", wait=True)
+
+        Args:
+            timeout (float, optional): Seconds to wait for the pools. Defaults to 300.
+
+        Yields:
+            Account: This account.
+        """
+        deferred = _DEFERRED.get()
+        if self in deferred:
+            yield self
+            return
+
+        pending: Dict[str, Set[str]] = {}
+        token = _DEFERRED.set({**deferred, self: pending})
+        try:
+            yield self
+        finally:
+            _DEFERRED.reset(token)
+
+        self.wait_for_pools(pending, timeout=timeout)
+
+    def wait_for_pools(
+        self, subscriptions: Dict[str, Iterable[str]], timeout: float = 300
+    ) -> None:
+        """Wait until pools of subscriptions are visible in Candlepin.
+
+        Requests a single Candlepin refresh and polls Candlepin for each SKU separately
+        until it lists a pool of every given subscription of the SKU. Pools which
+        existed before don't count.
+
+        Args:
+            subscriptions (Dict[str, Iterable[str]]): Subscription IDs by SKU.
+            timeout (float, optional): Seconds to wait for the pools. Defaults to 300.
+
+        Raises:
+            TimeoutError: Pools didn't appear in time.
+        """
+        expected = {
+            sku_id: {str(i) for i in ids} for sku_id, ids in subscriptions.items() if ids
+        }
+        if not expected:
+            return
+
+        self.start_refresh()
+
+        def all_visible() -> bool:
+            try:
+                self.owner_id  # pylint: disable=pointless-statement
+            except IndexError:
+                # Owner is created by the refresh job, it may not exist yet
+                return False
+
+            for sku_id in list(expected):
+                pools = self.api.candlepin.get_pools(
+                    self.username,
+                    self.password,
+                    self.owner_id,
+                    future=True,
+                    product=sku_id,
+                    fields=["subscriptionId"],
+                )
+                visible = {str(pool.get("subscriptionId")) for pool in pools}
+                if expected[sku_id] <= visible:
+                    del expected[sku_id]
+            return not expected
+
+        wait_for(all_visible, timeout=timeout)
+
     def accept_all_terms(self, optional: bool = False) -> None:
         """Accept all Terms and Conditions.
 
@@ -261,3 +685,101 @@ class Account:
 
             pdf_id = translations[0].get("termsPdfId")
             self.api.terms.accept_terms(self.username, pdf_id)
+
+    def register_consumers(
+        self,
+        count: int = 1,
+        name_prefix: str = "ethel-system",
+        facts: Dict[str, str] = None,
+        concurrency: int = 8,
+    ) -> List[str]:
+        """Register simulated systems under this account's owner.
+
+        Consumers are registered concurrently and remembered in `consumers`.
+
+        Args:
+            count (int, optional): Number of consumers. Defaults to 1.
+            name_prefix (str, optional): Consumer names are this prefix followed by
+                a sequence number. Defaults to "ethel-system".
+            facts (Dict[str, str], optional): Facts of all consumers. Defaults to None.
+            concurrency (int, optional): Maximal number of concurrent requests.
+                Defaults to 8.
+
+        Returns:
+            List[str]: UUIDs of the registered consumers.
+        """
+        with self._lock:
+            offset = self._registered_consumers
+            self._registered_consumers += count
+
+        def register(idx: int) -> str:
+            consumer = self.api.candlepin.register_consumer(
+                self.username,
+                self.password,
+                self.owner_id,
+                f"{name_prefix}-{offset + idx}",
+                facts=facts,
+            )
+            return consumer["uuid"]
+
+        uuids = map_concurrently(register, range(count), concurrency)
+        with self._lock:
+            self.consumers.extend(uuids)
+        return uuids
+
+    def attach(
+        self,
+        pool_id: str,
+        consumers: Iterable[str] = None,
+        quantity: int = 1,
+        concurrency: int = 8,
+    ) -> List[list]:
+        """Attach a pool to many consumers concurrently.
+
+        Args:
+            pool_id (str): Pool ID to consume.
+            consumers (Iterable[str], optional): Consumer UUIDs. Defaults to all
+                consumers registered by this account.
+            quantity (int, optional): Quantity consumed by each consumer. Defaults
+                to 1.
+            concurrency (int, optional): Maximal number of concurrent requests.
+                Defaults to 8.
+
+        Returns:
+            List[list]: Entitlements created for each consumer.
+        """
+        return map_concurrently(
+            lambda uuid: self.api.candlepin.attach_pool(
+                self.username, self.password, uuid, pool_id, quantity
+            ),
+            self._consumers(consumers),
+            concurrency,
+        )
+
+    def unregister_consumers(
+        self, consumers: Iterable[str] = None, concurrency: int = 8
+    ) -> None:
+        """Unregister consumers concurrently, returning their entitlements.
+
+        Args:
+            consumers (Iterable[str], optional): Consumer UUIDs. Defaults to all
+                consumers registered by this account.
+            concurrency (int, optional): Maximal number of concurrent requests.
+                Defaults to 8.
+        """
+        uuids = self._consumers(consumers)
+        map_concurrently(
+            lambda uuid: self.api.candlepin.unregister_consumer(
+                self.username, self.password, uuid
+            ),
+            uuids,
+            concurrency,
+        )
+        removed = set(uuids)
+        with self._lock:
+            self.consumers = [uuid for uuid in self.consumers if uuid not in removed]
+
+    def _consumers(self, consumers: Optional[Iterable[str]]) -> List[str]:
+        """Given consumer UUIDs, or all consumers registered by this account."""
+        with self._lock:
+            return list(self.consumers if consumers is None else consumers)
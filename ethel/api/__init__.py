@@ -3,12 +3,19 @@
 Provides access to all APIs, that are used by Ethel.
 """
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field, fields
+from typing import Dict, Optional, Tuple
 
+from .base import APIBase
+from .breaker import CircuitBreaker
 from .candlepin import Candlepin
-from .exceptions import EthelConnectionError, EthelError
+from .deadline import deadline
+from .exceptions import (CircuitOpenError, DeadlineExceeded, EthelConnectionError,
+                         EthelError)
+from .hedge import Hedger
 from .subscription import ActivationV2, RegnumV5
 from .terms import TermsV1
+from .throttle import RateLimiter
 from .user import UserV1
 
 
@@ -19,6 +26,21 @@ class API:
     regnum: RegnumV5
     activation: ActivationV2
     terms: TermsV1
+    hosts: Optional[Tuple[str, str]] = field(
+        default=None, compare=False, metadata=dict(client=False)
+    )
+
+    def clients(self) -> Dict[str, APIBase]:
+        """API clients by their service name.
+
+        Returns:
+            Dict[str, APIBase]: All API clients.
+        """
+        return {
+            f.name: getattr(self, f.name)
+            for f in fields(self)
+            if f.metadata.get("client", True)
+        }
 
 
 def initialize_apis(rest_host: str, candlepin_host: str) -> API:
@@ -39,7 +61,19 @@ def initialize_apis(rest_host: str, candlepin_host: str) -> API:
         regnum=RegnumV5(rest_host),
         activation=ActivationV2(rest_host),
         terms=TermsV1(rest_host),
+        hosts=(rest_host, candlepin_host),
     )
 
 
-__all__ = ("API", "initialize_apis", "EthelError", "EthelConnectionError")
+__all__ = (
+    "API",
+    "initialize_apis",
+    "EthelError",
+    "EthelConnectionError",
+    "CircuitBreaker",
+    "CircuitOpenError",
+    "DeadlineExceeded",
+    "deadline",
+    "Hedger",
+    "RateLimiter",
+)
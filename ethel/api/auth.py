@@ -0,0 +1,97 @@
+"""Authentication reuse
+
+Reuse server sessions instead of sending credentials on every request, so the server
+doesn't have to verify them each time.
+"""
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+
+import requests
+from requests.utils import dict_from_cookiejar
+
+Credentials = Tuple[str, str]
+
+
+class AuthSessions:
+    def __init__(self, max_size: int = 10000) -> None:
+        """Session cookies by credentials.
+
+        A request is authenticated by the session cookies set by a previous response
+        to the same credentials, if there are any, or by HTTP Basic auth. A session
+        rejected by the server (401) is dropped and the request is sent once more with
+        the credentials, which renews the session. Servers which don't set any cookies
+        get Basic auth on every request, as before.
+
+        Sessions are never shared by different credentials. Safe to use from multiple
+        threads.
+
+        Args:
+            max_size (int, optional): Maximal number of sessions kept, the least
+                recently used are dropped first. Defaults to 10000.
+        """
+        self.max_size = max_size
+        self._sessions: "OrderedDict[Credentials, Dict[str, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._sessions)
+
+    def get(self, credentials: Credentials) -> Optional[Dict[str, str]]:
+        """Session cookies of credentials, None if there is no session."""
+        with self._lock:
+            cookies = self._sessions.get(credentials)
+            if cookies is not None:
+                self._sessions.move_to_end(credentials)
+            return cookies
+
+    def store(self, credentials: Credentials, response: requests.Response) -> None:
+        """Remember session cookies set by a response."""
+        received = dict_from_cookiejar(response.cookies)
+        if not received:
+            return
+        with self._lock:
+            cookies = self._sessions.get(credentials, {})
+            self._sessions[credentials] = {**cookies, **received}
+            self._sessions.move_to_end(credentials)
+            while len(self._sessions) > self.max_size:
+                self._sessions.popitem(last=False)
+
+    def forget(self, credentials: Credentials) -> None:
+        """Drop the session of credentials."""
+        with self._lock:
+            self._sessions.pop(credentials, None)
+
+    def clear(self) -> None:
+        """Drop all sessions."""
+        with self._lock:
+            self._sessions.clear()
+
+    def send(
+        self, send: Callable[..., requests.Response], credentials: Credentials, **kwargs
+    ) -> requests.Response:
+        """Send a request authenticated by a session or credentials.
+
+        Args:
+            send (Callable[..., requests.Response]): Request method to call, accepting
+                requests' auth and cookies arguments.
+            credentials (Credentials): Username and password.
+            **kwargs: Other arguments of send.
+
+        Returns:
+            requests.Response: Response.
+        """
+        cookies = self.get(credentials)
+        if cookies is not None:
+            response = send(cookies=cookies, **kwargs)
+            if response.status_code != 401:
+                self.store(credentials, response)
+                return response
+            # Release the connection of the rejected request before sending another
+            response.close()
+            self.forget(credentials)
+
+        response = send(auth=credentials, **kwargs)
+        if response.ok:
+            self.store(credentials, response)
+        return response
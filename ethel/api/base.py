@@ -1,11 +1,26 @@
 import atexit
 import os
-from typing import Tuple
+import threading
+import time
+from functools import partial
+from typing import Callable, Tuple, Union
 
 import requests
+from requests.adapters import HTTPAdapter
+
+from .breaker import CircuitBreaker
+from .deadline import check
+from .hedge import Hedger
+from .throttle import RateLimiter
+from .transport import POOL_MAXSIZE, TRANSPORTS, RequestsTransport, Transport
 
 CERT = (os.getenv("EBS_CERT_PUBLIC", ""), os.getenv("EBS_CERT_KEY", ""))
 
+# Connect and read timeouts in seconds
+DEFAULT_TIMEOUT = (10.0, 60.0)
+
+Timeout = Union[float, Tuple[float, float]]
+
 
 class APISession(requests.Session):
     def __init__(
@@ -16,6 +31,14 @@ class APISession(requests.Session):
         A requests.Session with a base url and certificates settings available. It allows
         user to set a common host for all API requests to lower any confusion.
 
+        Requests time out after `timeout` (connect and read timeout in seconds), or
+        sooner if a deadline set by ethel.api.deadline.deadline is closer.
+
+        The session is safe to share across threads. Requests are sent by a transport,
+        see ethel.api.transport. The default "requests" transport sends them by a
+        session private to the calling thread, which shares headers, cookies and
+        transport adapters (and therefore the connection pool) with this session.
+
         Args:
             api_base_url (str): Base URL (API host)
             cert (tuple, optional): SSL client certificate to use for all requests.
@@ -28,18 +51,167 @@ class APISession(requests.Session):
         self.cert = cert
         self.verify = verify
         self.api_base_url = api_base_url.rstrip("/")
+        self.limiter: RateLimiter = None  # type: ignore
+        self.breaker: CircuitBreaker = None  # type: ignore
+        self.hedger: Hedger = None  # type: ignore
+        self.timeout: Tuple[float, float] = DEFAULT_TIMEOUT
+        self.transport: Transport = RequestsTransport(self)
+        self._local = threading.local()
+
+        adapter = HTTPAdapter(pool_maxsize=POOL_MAXSIZE)
+        self.mount("https://", adapter)
+        self.mount("http://", adapter)
 
         # Inject api_base_url to the url param of every request.
-        def override(parent_method):
+        def override(method):
             def wrapper(url, *args, **kwargs):
-                return parent_method(self.api_base_url + url, *args, **kwargs)
+                url = self.api_base_url + url
+                send = partial(self.transport.request, method)
+                try:
+                    return self.dispatch(send, url, *args, **kwargs)
+                except requests.Timeout:
+                    check()  # Timed out due to the deadline
+                    raise
 
             return wrapper
 
-        parent = super()
         for method in ("get", "options", "head", "post", "put", "patch", "delete"):
-            parent_method = getattr(parent, method)
-            setattr(self, method, override(parent_method))
+            setattr(self, method, override(method))
+
+    def request_timeout(self, timeout: Timeout = None) -> Tuple[float, float]:
+        """Connect and read timeout for a request.
+
+        Args:
+            timeout (Timeout, optional): Requested timeout, either a single value for
+                both or a (connect, read) tuple. Defaults to None (session timeout).
+
+        Raises:
+            DeadlineExceeded: Current deadline has already passed.
+
+        Returns:
+            Tuple[float, float]: Timeout, capped by the time left until the deadline.
+        """
+        if timeout is None:
+            timeout = self.timeout
+        connect, read = timeout if isinstance(timeout, tuple) else (timeout, timeout)
+
+        left = check()
+        if left is None:
+            return connect, read
+        return min(connect, left), min(read, left)
+
+    def prewarm(self) -> None:
+        """Open a connection to the API host and keep it in the connection pool.
+
+        Sends a HEAD request to the base URL, bypassing rate limiter, circuit
+        breaker and hedger. The response status is ignored.
+        """
+        response = self.transport.request(
+            "head", self.api_base_url, timeout=self.request_timeout()
+        )
+        response.close()
+
+    def use_transport(self, name: str) -> None:
+        """Send requests by another transport.
+
+        Switch transports before sending requests, the previous transport is closed.
+
+        Args:
+            name (str): Transport name: "requests", "urllib3" or "http2".
+
+        Raises:
+            ValueError: Unknown transport.
+            ImportError: Transport dependencies are not installed.
+        """
+        if name not in TRANSPORTS:
+            raise ValueError(f"Unknown transport '{name}'")
+        previous, self.transport = self.transport, TRANSPORTS[name](self)
+        previous.close()
+
+    def close(self) -> None:
+        """Close the transport, the hedger and all adapters."""
+        self.transport.close()
+        if self.hedger:
+            self.hedger.close()
+        super().close()
+
+    def thread_session(self) -> requests.Session:
+        """Session private to the calling thread.
+
+        Created on first use. Shares headers, cookies and transport adapters with this
+        session, while other settings are copied.
+
+        Returns:
+            requests.Session: Session of the current thread.
+        """
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            session.headers = self.headers
+            session.cookies = self.cookies
+            session.adapters = self.adapters
+            session.auth = self.auth
+            session.cert = self.cert
+            session.verify = self.verify
+            session.proxies = self.proxies
+            self._local.session = session
+        return session
+
+    def dispatch(
+        self,
+        send: Callable[..., requests.Response],
+        url: str,
+        *args,
+        hedge: bool = False,
+        **kwargs,
+    ) -> requests.Response:
+        """Send a request, respecting the circuit breaker and rate limiter if set.
+
+        The request timeout is capped by the current deadline once the request is
+        admitted, so time spent waiting for the rate limiter counts too.
+
+        Args:
+            send (Callable[..., requests.Response]): Request method to call.
+            url (str): Full request URL.
+            hedge (bool, optional): The request is idempotent and may be hedged if
+                a hedger is set. Defaults to False.
+
+        Raises:
+            CircuitOpenError: Circuit breaker is open, request was not sent.
+            DeadlineExceeded: Current deadline passed before the request was sent.
+
+        Returns:
+            requests.Response: Response.
+        """
+        if hedge and self.hedger:
+            return self.hedger.send(lambda: self.dispatch(send, url, *args, **kwargs))
+
+        if self.limiter is None and self.breaker is None:
+            kwargs["timeout"] = self.request_timeout(kwargs.get("timeout"))
+            return send(url, *args, **kwargs)
+
+        if self.limiter:
+            self.limiter.acquire()
+        try:
+            kwargs["timeout"] = self.request_timeout(kwargs.get("timeout"))
+            if self.breaker:
+                self.breaker.before_request()
+        except BaseException:
+            if self.limiter:
+                self.limiter.cancel()
+            raise
+
+        start = time.monotonic()
+        status_code = None
+        try:
+            response = send(url, *args, **kwargs)
+            status_code = response.status_code
+            return response
+        finally:
+            if self.limiter:
+                self.limiter.release(time.monotonic() - start, status_code)
+            if self.breaker:
+                self.breaker.record(status_code)
 
 
 class APIBase:
@@ -0,0 +1,125 @@
+import threading
+import time
+from typing import Dict, Tuple
+
+from .exceptions import CircuitOpenError
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half-open"
+
+
+class CircuitBreaker:
+    FAILURE_STATUS_CODES = (502, 503, 504)
+
+    def __init__(
+        self, api_base_url: str, failure_threshold: int = 5, reset_timeout: float = 30
+    ) -> None:
+        """Circuit breaker for a single API.
+
+        After `failure_threshold` consecutive failures (connection errors, timeouts or
+        502, 503 and 504 responses) the circuit opens and all requests fail immediately.
+        Once `reset_timeout` passes, a single trial request is let through (half-open
+        state). Its success closes the circuit, its failure opens it again.
+
+        Args:
+            api_base_url (str): Base URL of the guarded API.
+            failure_threshold (int, optional): Consecutive failures needed to open the
+                circuit. Defaults to 5.
+            reset_timeout (float, optional): Seconds before a trial request is allowed.
+                Defaults to 30.
+        """
+        self.api_base_url = api_base_url
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._trial_in_progress = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        """Current state: "closed", "open" or "half-open"."""
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self) -> str:
+        if self._state == OPEN and self._retry_after() <= 0:
+            self._state = HALF_OPEN
+        return self._state
+
+    def _retry_after(self) -> float:
+        return self._opened_at + self.reset_timeout - time.monotonic()
+
+    def before_request(self) -> None:
+        """Check whether a request may be sent.
+
+        Raises:
+            CircuitOpenError: Circuit is open or a trial request is already running.
+        """
+        with self._lock:
+            state = self._current_state()
+            if state == CLOSED:
+                return
+            if state == HALF_OPEN and not self._trial_in_progress:
+                self._trial_in_progress = True
+                return
+            raise CircuitOpenError(self.api_base_url, max(0.0, self._retry_after()))
+
+    def record(self, status_code: int = None) -> None:
+        """Record a request outcome.
+
+        Args:
+            status_code (int, optional): Response status code, None if the request
+                failed to get a response. Defaults to None.
+        """
+        failed = status_code is None or status_code in self.FAILURE_STATUS_CODES
+        with self._lock:
+            self._trial_in_progress = False
+            if not failed:
+                self.failures = 0
+                self._state = CLOSED
+                return
+
+            self.failures += 1
+            if self._state == HALF_OPEN or self.failures >= self.failure_threshold:
+                self._state = OPEN
+                self._opened_at = time.monotonic()
+
+    def reset(self) -> None:
+        """Close the circuit manually."""
+        with self._lock:
+            self.failures = 0
+            self._state = CLOSED
+            self._trial_in_progress = False
+
+
+_BREAKERS: Dict[Tuple[str, int, float], CircuitBreaker] = {}
+_BREAKERS_LOCK = threading.Lock()
+
+
+def get_circuit_breaker(
+    api_base_url: str, failure_threshold: int = 5, reset_timeout: float = 30
+) -> CircuitBreaker:
+    """Get the circuit breaker shared by all sessions with the same base URL.
+
+    Breakers are process-wide and keyed by the base URL and thresholds, so sessions
+    asking for different thresholds get separate breakers. Thresholds of a breaker
+    never change.
+
+    Args:
+        api_base_url (str): Base URL of the guarded API.
+        failure_threshold (int, optional): Consecutive failures needed to open the
+            circuit. Defaults to 5.
+        reset_timeout (float, optional): Seconds before a trial request is allowed.
+            Defaults to 30.
+
+    Returns:
+        CircuitBreaker: Circuit breaker for the API and thresholds.
+    """
+    key = (api_base_url, failure_threshold, reset_timeout)
+    with _BREAKERS_LOCK:
+        if key not in _BREAKERS:
+            _BREAKERS[key] = CircuitBreaker(*key)
+        return _BREAKERS[key]
@@ -1,7 +1,15 @@
 import os
+from datetime import date
+from functools import partial
+from http.cookiejar import DefaultCookiePolicy
+from typing import Any, Dict, Iterable
 
+import requests
+
+from .auth import AuthSessions, Credentials
 from .base import APIBase
 from .exceptions import raises_from_candlepin as raises_ethel_exception
+from .utils import parse_json
 
 ADMIN_AUTH = (
     os.getenv("CANDLEPIN_USERNAME", "candlepin_admin"),
@@ -15,10 +23,23 @@ class Candlepin(APIBase):
 
         Access the Candlepin API for subscription pool management.
 
+        Sessions set by Candlepin are reused per account (and for the admin) instead
+        of sending credentials on every request, see ethel.api.auth.AuthSessions.
+
         Args:
             api_host (str): Base API host
         """
         super().__init__(f"http://{api_host}/candlepin")
+        self.sessions = AuthSessions()
+        # Session cookies are kept per credentials only, never shared by accounts
+        self.api.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+
+    def _request(
+        self, method: str, url: str, credentials: Credentials, **kwargs
+    ) -> requests.Response:
+        """Send a request authenticated by a reused session or the credentials."""
+        send = partial(getattr(self.api, method), url)
+        return self.sessions.send(send, credentials, **kwargs)
 
     def refresh(self, org_id: int) -> dict:
         """Force a Candlepin refresh.
@@ -32,13 +53,14 @@ class Candlepin(APIBase):
         Returns:
             dict: Refresh job details
         """
-        response = self.api.put(
+        response = self._request(
+            "put",
             f"/owners/{org_id}/subscriptions",
+            ADMIN_AUTH,
             params=dict(auto_create_owner=True),
-            auth=ADMIN_AUTH,
         )
         response.raise_for_status()
-        return response.json()
+        return parse_json(response)
 
     @raises_ethel_exception
     def get_job(self, job_id: str) -> dict:
@@ -50,9 +72,9 @@ class Candlepin(APIBase):
         Returns:
             dict: Job details
         """
-        response = self.api.get(f"/jobs/{job_id}", auth=ADMIN_AUTH,)
+        response = self._request("get", f"/jobs/{job_id}", ADMIN_AUTH, hedge=True)
         response.raise_for_status()
-        return response.json()
+        return parse_json(response)
 
     @raises_ethel_exception
     def get_owners(self, username: str, password: str) -> list:
@@ -65,17 +87,37 @@ class Candlepin(APIBase):
         Returns:
             list: List of account owners. Should contain 1 owner only.
         """
-        response = self.api.get(f"/users/{username}/owners", auth=(username, password),)
+        response = self._request(
+            "get", f"/users/{username}/owners", (username, password), hedge=True
+        )
         response.raise_for_status()
-        return response.json()
+        return parse_json(response)
 
-    def delete_owner(self, username: str, password: str, owner_id: int) -> None:
-        # pylint: disable=missing-function-docstring
-        raise NotImplementedError
+    @raises_ethel_exception
+    def delete_owner(self, owner_id: int) -> None:
+        """Delete an owner with all its pools.
+
+        Args:
+            owner_id (int): Owner ID to delete.
+        """
+        response = self._request(
+            "delete", f"/owners/{owner_id}", ADMIN_AUTH, params=dict(revoke=True)
+        )
+        response.raise_for_status()
 
     @raises_ethel_exception
     def get_pools(
-        self, username: str, password: str, owner_id: int, future: bool = False
+        self,
+        username: str,
+        password: str,
+        owner_id: int,
+        future: bool = False,
+        product: str = None,
+        fields: Iterable[str] = None,
+        active_on: date = None,
+        matches: str = None,
+        attributes: Dict[str, str] = None,
+        consumer: str = None,
     ) -> list:
         """Get list of subscription pools.
 
@@ -85,22 +127,140 @@ class Candlepin(APIBase):
             owner_id (int): Account's owner ID.
             future (bool, optional): List also subscription pools available in future.
                 Defaults to False.
+            product (str, optional): List only pools for this product (SKU).
+                Defaults to None.
+            fields (Iterable[str], optional): Let Candlepin include only these pool
+                attributes in the response. Defaults to None (all attributes).
+            active_on (date, optional): List only pools active on this date.
+                Defaults to None.
+            matches (str, optional): List only pools whose product ID, name or
+                attributes match this string, "*" and "?" are wildcards. Defaults to
+                None.
+            attributes (Dict[str, str], optional): List only pools with these
+                attribute values. Defaults to None.
+            consumer (str, optional): List only pools available to this consumer
+                UUID. Defaults to None.
 
         Returns:
             list: List of pools available to the account.
         """
-        response = self.api.get(
-            f"/owners/{owner_id}/pools",
-            params=dict(listall=True, add_future=future),
-            auth=(username, password),
+        params: Dict[str, Any] = dict(listall=True, add_future=future)
+        if product is not None:
+            params["product"] = product
+        if fields is not None:
+            params["include"] = list(fields)
+        if active_on is not None:
+            params["activeon"] = active_on.isoformat()
+        if matches is not None:
+            params["matches"] = matches
+        if attributes:
+            params["attribute"] = [f"{k}:{v}" for k, v in attributes.items()]
+        if consumer is not None:
+            params["consumer"] = consumer
+
+        response = self._request(
+            "get", f"/owners/{owner_id}/pools", (username, password), params=params
+        )
+        response.raise_for_status()
+        return parse_json(response)
+
+    @raises_ethel_exception
+    def delete_pool(self, pool_id: str) -> None:
+        """Delete a subscription pool.
+
+        Args:
+            pool_id (str): Pool ID to delete.
+        """
+        response = self._request("delete", f"/pools/{pool_id}", ADMIN_AUTH)
+        response.raise_for_status()
+
+    @raises_ethel_exception
+    def register_consumer(
+        self,
+        username: str,
+        password: str,
+        owner_id: int,
+        name: str,
+        facts: Dict[str, str] = None,
+        consumer_type: str = "system",
+    ) -> dict:
+        """Register a consumer (e.g. a system) under an owner.
+
+        Args:
+            username (str): Account's username.
+            password (str): Account's password.
+            owner_id (int): Account's owner ID.
+            name (str): Consumer name.
+            facts (Dict[str, str], optional): Consumer facts. Defaults to None.
+            consumer_type (str, optional): Consumer type label. Defaults to "system".
+
+        Returns:
+            dict: Registered consumer, its "uuid" identifies it.
+        """
+        response = self._request(
+            "post",
+            "/consumers",
+            (username, password),
+            params=dict(owner=owner_id),
+            json=dict(name=name, type=dict(label=consumer_type), facts=facts or {}),
+        )
+        response.raise_for_status()
+        return parse_json(response)
+
+    @raises_ethel_exception
+    def attach_pool(
+        self,
+        username: str,
+        password: str,
+        consumer_uuid: str,
+        pool_id: str,
+        quantity: int = 1,
+    ) -> list:
+        """Attach a pool to a consumer.
+
+        Args:
+            username (str): Account's username.
+            password (str): Account's password.
+            consumer_uuid (str): Consumer UUID.
+            pool_id (str): Pool ID to consume.
+            quantity (int, optional): Consumed quantity. Defaults to 1.
+
+        Returns:
+            list: Created entitlements.
+        """
+        response = self._request(
+            "post",
+            f"/consumers/{consumer_uuid}/entitlements",
+            (username, password),
+            params=dict(pool=pool_id, quantity=quantity),
+        )
+        response.raise_for_status()
+        return parse_json(response)
+
+    @raises_ethel_exception
+    def unregister_consumer(
+        self, username: str, password: str, consumer_uuid: str
+    ) -> None:
+        """Unregister a consumer, returning its entitlements to their pools.
+
+        Args:
+            username (str): Account's username.
+            password (str): Account's password.
+            consumer_uuid (str): Consumer UUID.
+        """
+        response = self._request(
+            "delete", f"/consumers/{consumer_uuid}", (username, password)
         )
         response.raise_for_status()
-        return response.json()
 
-    def delete_pool(self, username: str, password: str, pool_id: int) -> None:
-        # pylint: disable=missing-function-docstring
-        raise NotImplementedError
+    @raises_ethel_exception
+    def delete_user(self, username: str) -> None:
+        """Delete the Candlepin user.
+
+        The user account itself is kept by the User service.
 
-    def delete_user(self, username: str, password: str) -> None:
-        # pylint: disable=missing-function-docstring
-        raise NotImplementedError
+        Args:
+            username (str): Account's username.
+        """
+        response = self._request("delete", f"/users/{username}", ADMIN_AUTH)
+        response.raise_for_status()
@@ -0,0 +1,82 @@
+import contextvars
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional, Tuple, TypeVar
+
+from .exceptions import DeadlineExceeded
+
+T = TypeVar("T")
+
+# Monotonic time by which the current operation has to finish and its timeout
+_DEADLINE: contextvars.ContextVar[Optional[Tuple[float, float]]] = contextvars.ContextVar(
+    "ethel_deadline", default=None
+)
+
+
+@contextmanager
+def deadline(timeout: float) -> Iterator[None]:
+    """Limit the total time of all requests within the block.
+
+    Each request gets only the remaining time as its connect and read timeout and no
+    request is sent once the deadline passes. Nested deadlines can only shorten the
+    outer one. Deadlines follow work submitted to other threads through propagate.
+
+    Examples:
+    >>> with deadline(60):
+    ...     account.subscribe("SKU_A")
+    ...     account.subscribe("SKU_B")
+
+    Args:
+        timeout (float): Seconds the block may take.
+    """
+    current = _DEADLINE.get()
+    expires_at = time.monotonic() + timeout
+    if current is not None and current[0] <= expires_at:
+        yield
+        return
+
+    token = _DEADLINE.set((expires_at, timeout))
+    try:
+        yield
+    finally:
+        _DEADLINE.reset(token)
+
+
+def remaining() -> Optional[float]:
+    """Seconds left until the current deadline, None if there's no deadline."""
+    current = _DEADLINE.get()
+    return None if current is None else current[0] - time.monotonic()
+
+
+def check() -> Optional[float]:
+    """Ensure the current deadline hasn't passed yet.
+
+    Raises:
+        DeadlineExceeded: Deadline has passed.
+
+    Returns:
+        Optional[float]: Seconds left, None if there's no deadline.
+    """
+    left = remaining()
+    if left is not None and left <= 0:
+        raise DeadlineExceeded(_DEADLINE.get()[1])  # type: ignore
+    return left
+
+
+def propagate(func: Callable[..., T]) -> Callable[..., T]:
+    """Run a function in the context (and the deadline) of the caller.
+
+    Wrap functions submitted to thread pools, which don't inherit context variables.
+
+    Args:
+        func (Callable[..., T]): Function to wrap.
+
+    Returns:
+        Callable[..., T]: Function running in a copy of the current context.
+    """
+    context = contextvars.copy_context()
+
+    def wrapper(*args, **kwargs) -> T:
+        return context.copy().run(func, *args, **kwargs)
+
+    return wrapper
@@ -1,9 +1,11 @@
 from functools import wraps
+from typing import TYPE_CHECKING
 
 from requests import ConnectionError as RequestsConnectionError
 from requests import HTTPError, Timeout
 
-from .base import APIBase
+if TYPE_CHECKING:
+    from .base import APIBase  # pylint: disable=cyclic-import
 
 
 class EthelError(IOError):
@@ -13,7 +15,7 @@ class EthelError(IOError):
         *args,
         raw_error: HTTPError,
         status_code: str = None,
-        source: APIBase = None,
+        source: "APIBase" = None,
         exception_type: str = None,
         message_type: str = None,
         uuid: str = None,
@@ -57,6 +59,43 @@ class EthelConnectionError(RequestsConnectionError, Timeout):
     """Ethel's shorthand for easier catching of RequestsConnectionError and Timeout."""
 
 
+class CircuitOpenError(EthelConnectionError):
+    def __init__(self, api_base_url: str, retry_after: float) -> None:
+        """Circuit breaker is open.
+
+        Raised instead of sending a request to a backend which is considered down.
+
+        Args:
+            api_base_url (str): Base URL of the unavailable API.
+            retry_after (float): Seconds until the circuit breaker allows a trial
+                request.
+        """
+        self.api_base_url = api_base_url
+        self.retry_after = retry_after
+        super().__init__(
+            f"Circuit open for {api_base_url}, retry after {retry_after:.1f} seconds"
+        )
+
+
+# Caught both as a connection error and as a timeout, like any other request timeout
+class DeadlineExceeded(  # pylint: disable=too-many-ancestors
+    EthelConnectionError, TimeoutError
+):
+    def __init__(self, timeout: float = None) -> None:
+        """Deadline of an operation passed.
+
+        Raised instead of sending a request once the deadline set by
+        ethel.api.deadline.deadline has passed.
+
+        Args:
+            timeout (float, optional): Seconds the operation was given. Defaults to
+                None (unknown).
+        """
+        self.timeout = timeout
+        given = f" of {timeout:.1f} seconds" if timeout is not None else ""
+        super().__init__(f"Deadline{given} exceeded")
+
+
 def raises_from_candlepin(func):
     """Map Candlepin exception response JSON to EthelError.
 
@@ -71,7 +110,7 @@ def raises_from_candlepin(func):
     """
 
     @wraps(func)
-    def wrapper(self: APIBase, *args, **kwargs):
+    def wrapper(self: "APIBase", *args, **kwargs):
         try:
             return func(self, *args, **kwargs)
         except HTTPError as http_error:
@@ -111,7 +150,7 @@ def raises_from_ebs(func):
     """
 
     @wraps(func)
-    def wrapper(self: APIBase, *args, **kwargs):
+    def wrapper(self: "APIBase", *args, **kwargs):
         try:
             return func(self, *args, **kwargs)
         except HTTPError as http_error:
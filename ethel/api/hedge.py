@@ -0,0 +1,122 @@
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, Optional
+
+import requests
+
+from .deadline import propagate
+
+
+class Hedger:
+    def __init__(
+        self,
+        percentile: float = 0.95,
+        max_extra: float = 0.05,
+        window: int = 100,
+        min_samples: int = 20,
+        max_workers: int = 32,
+    ) -> None:
+        """Request hedging.
+
+        If a request doesn't respond within a latency percentile learned from recent
+        requests, a duplicate request is sent and whichever responds first is used.
+        Use for idempotent requests only.
+
+        Args:
+            percentile (float, optional): Latency percentile after which a duplicate
+                request is sent. Defaults to 0.95.
+            max_extra (float, optional): Maximal ratio of duplicate requests to all
+                requests. Defaults to 0.05.
+            window (int, optional): Number of recent latencies to learn from.
+                Defaults to 100.
+            min_samples (int, optional): Don't hedge until this many latencies are
+                known. Defaults to 20.
+            max_workers (int, optional): Maximal number of concurrently running
+                requests. Defaults to 32.
+        """
+        self.percentile = percentile
+        self.max_extra = max_extra
+        self.min_samples = min_samples
+        self.requests = 0
+        self.hedged = 0
+        self._latencies: deque = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers, thread_name_prefix="ethel-hedge")
+        self._args = (percentile, max_extra, window, min_samples, max_workers)
+
+    def __reduce__(self):
+        # Pickle settings only, an unpickled hedger starts with no known latencies
+        return self.__class__, self._args
+
+    def delay(self) -> Optional[float]:
+        """Current hedging delay.
+
+        Returns:
+            Optional[float]: Seconds after which a duplicate request is sent, None if
+                not enough latencies are known yet.
+        """
+        with self._lock:
+            if len(self._latencies) < self.min_samples:
+                return None
+            latencies = sorted(self._latencies)
+        return latencies[min(len(latencies) - 1, int(len(latencies) * self.percentile))]
+
+    def _allow_hedge(self) -> bool:
+        with self._lock:
+            if self.hedged + 1 > self.requests * self.max_extra:
+                return False
+            self.hedged += 1
+            return True
+
+    def _timed(self, request: Callable[[], requests.Response]) -> requests.Response:
+        start = time.monotonic()
+        response = request()
+        with self._lock:
+            self._latencies.append(time.monotonic() - start)
+        return response
+
+    def send(self, request: Callable[[], requests.Response]) -> requests.Response:
+        """Send a request, hedge it if it's slow.
+
+        Args:
+            request (Callable[[], requests.Response]): Sends the request.
+
+        Returns:
+            requests.Response: The first successful response.
+        """
+        with self._lock:
+            self.requests += 1
+
+        delay = self.delay()
+        if delay is None:
+            return self._timed(request)
+
+        primary = self._executor.submit(propagate(self._timed), request)
+        done, _ = wait([primary], timeout=delay)
+        if done or not self._allow_hedge():
+            return primary.result()
+
+        secondary = self._executor.submit(propagate(self._timed), request)
+        pending = {primary, secondary}
+        while True:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            winner = next((f for f in done if f.exception() is None), None)
+            if winner is not None or not pending:
+                break
+
+        for future in done | pending:
+            if future is not winner:
+                future.add_done_callback(_close_response)
+        return (winner or primary).result()
+
+    def close(self) -> None:
+        """Stop the worker threads once running requests finish."""
+        self._executor.shutdown(wait=False)
+
+
+def _close_response(future: Future) -> None:
+    """Release connection of a response nobody is interested in."""
+    if future.exception() is None:
+        future.result().close()
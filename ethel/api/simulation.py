@@ -0,0 +1,578 @@
+"""Simulated backend
+
+In-process simulation of EBS and Candlepin APIs. Plugged into API sessions as
+a requests transport adapter, so the real client code (requests, status checks and
+error mapping) runs end to end without any sockets.
+"""
+import base64
+import fnmatch
+import itertools
+import json
+import re
+import threading
+import time
+import uuid
+from datetime import date, timedelta
+from http import HTTPStatus
+from http.cookies import SimpleCookie
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from requests import PreparedRequest, ReadTimeout, Response
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+
+from .candlepin import ADMIN_AUTH
+
+EBS_EXCEPTIONS = "com.redhat.services"
+DEFAULT_TERMS = [
+    dict(id="1", isOptional=False, translations=[dict(termsPdfId="required-terms-pdf")]),
+    dict(id="2", isOptional=True, translations=[dict(termsPdfId="optional-terms-pdf")]),
+]
+
+MULTI_VALUE_PARAMS = ("include", "attribute")
+
+# Session cookie set by Candlepin after a successful Basic authentication
+SESSION_COOKIE = "JSESSIONID"
+
+Result = Tuple[int, Any]
+
+
+class SimulatedError(Exception):
+    def __init__(self, status_code: int, payload: dict) -> None:
+        """Error response of the simulated backend.
+
+        Args:
+            status_code (int): HTTP status code.
+            payload (dict): Error response body.
+        """
+        super().__init__(payload)
+        self.status_code = status_code
+        self.payload = payload
+
+
+def ebs_error(status_code: int, exception_type: str, message: str) -> SimulatedError:
+    """Error in the EBS response format."""
+    return SimulatedError(
+        status_code,
+        dict(
+            msgName="com.redhat.services.util.rest.ExceptionMessage",
+            type=[f"{EBS_EXCEPTIONS}.{exception_type}"],
+            message=[message],
+        ),
+    )
+
+
+def candlepin_error(status_code: int, message: str) -> SimulatedError:
+    """Error in the Candlepin response format."""
+    return SimulatedError(
+        status_code, dict(displayMessage=message, requestUuid=str(uuid.uuid4()))
+    )
+
+
+def candlepin_date(value: date) -> str:
+    """Format a date the way Candlepin does."""
+    return f"{value.isoformat()}T00:00:00+0000"
+
+
+class SimulatedBackend:
+    def __init__(
+        self, terms: List[dict] = None, latency: float = 0, sessions: bool = True
+    ) -> None:
+        """Stateful simulation of users, orgs, orders, pools and terms.
+
+        Args:
+            terms (List[dict], optional): Terms and Conditions every user has to
+                accept. Defaults to a single required and a single optional terms.
+            latency (float, optional): Seconds each response takes. Responses slower
+                than the read timeout of a request raise ReadTimeout. Defaults to 0.
+            sessions (bool, optional): Candlepin sets a session cookie after each
+                successful Basic authentication, which authenticates later requests.
+                Defaults to True.
+        """
+        self.terms = DEFAULT_TERMS if terms is None else terms
+        self.latency = latency
+        self.issue_sessions = sessions
+        # Candlepin sessions: credentials by session ID
+        self.sessions: Dict[str, Tuple[str, str]] = {}
+        # Number of Candlepin requests authenticated by credentials
+        self.credential_checks = 0
+        self.users: Dict[str, dict] = {}
+        self.orders: Dict[int, dict] = {}
+        self.subscriptions: Dict[int, List[dict]] = {}
+        self.owners: Dict[str, dict] = {}
+        self.pools: Dict[str, List[dict]] = {}
+        self.jobs: Dict[str, dict] = {}
+        self.accepted_terms: Dict[str, set] = {}
+        self.consumers: Dict[str, dict] = {}
+        self.request_count = 0
+        self._ids = itertools.count(10000000)
+        self._lock = threading.RLock()
+        self._routes: List[Tuple[str, str, Callable[..., Result]]] = [
+            ("POST", r"/svcrest/user/v3/create$", self.create_user),
+            ("GET", r"/svcrest/user/v3/login=(?P<login>.+)$", self.find_user),
+            ("PUT", r"/svcrest/regnum/v5/hock/order$", self.order),
+            ("POST", r"/svcrest/activation/v2/activate$", self.activate),
+            ("GET", r"/svcrest/terms/presentation/required$", self.required),
+            ("GET", r"/svcrest/terms/presentation/available$", self.available),
+            ("PUT", r"/svcrest/terms/presentation/ackterms$", self.ackterms),
+            ("PUT", r"/candlepin/owners/(?P<key>[^/]+)/subscriptions$", self.refresh),
+            ("GET", r"/candlepin/jobs/(?P<job_id>[^/]+)$", self.get_job),
+            ("GET", r"/candlepin/users/(?P<login>[^/]+)/owners$", self.get_owners),
+            ("GET", r"/candlepin/owners/(?P<key>[^/]+)/pools$", self.get_pools),
+            ("DELETE", r"/candlepin/owners/(?P<key>[^/]+)$", self.delete_owner),
+            ("DELETE", r"/candlepin/pools/(?P<pool_id>[^/]+)$", self.delete_pool),
+            ("DELETE", r"/candlepin/users/(?P<login>[^/]+)$", self.delete_user),
+            ("POST", r"/candlepin/consumers$", self.register_consumer),
+            (
+                "POST",
+                r"/candlepin/consumers/(?P<consumer_uuid>[^/]+)/entitlements$",
+                self.attach_pool,
+            ),
+            (
+                "DELETE",
+                r"/candlepin/consumers/(?P<consumer_uuid>[^/]+)$",
+                self.unregister_consumer,
+            ),
+        ]
+
+    def next_id(self) -> int:
+        """Generate a new unique numeric ID."""
+        return next(self._ids)
+
+    def handle(self, request: PreparedRequest) -> Tuple[int, Any, Dict[str, str]]:
+        """Handle a request.
+
+        Args:
+            request (PreparedRequest): Request to handle.
+
+        Returns:
+            Tuple[int, Any, Dict[str, str]]: Status code, JSON serializable body (None
+                if empty) and cookies to set.
+        """
+        url = urlsplit(request.url)
+        query = {
+            k: v if k in MULTI_VALUE_PARAMS else v[-1]
+            for k, v in parse_qs(url.query).items()
+        }
+        body = json.loads(request.body) if request.body else None
+        auth = self._parse_auth(request.headers.get("Authorization"))
+        cookies = SimpleCookie(request.headers.get("Cookie", ""))
+        session_id = cookies[SESSION_COOKIE].value if SESSION_COOKIE in cookies else None
+        candlepin = url.path.startswith("/candlepin/")
+
+        with self._lock:
+            self.request_count += 1
+            if candlepin and auth is not None:
+                self.credential_checks += 1
+            elif candlepin and session_id:
+                auth = self.sessions.get(session_id)
+
+            method, path = request.method, url.path
+            status_code, payload = self._route(method, path, query, body, auth)
+
+            set_cookies = {}
+            authenticated = candlepin and auth and status_code < 400
+            if authenticated and self.issue_sessions and session_id not in self.sessions:
+                session_id = uuid.uuid4().hex
+                self.sessions[session_id] = auth  # type: ignore
+                set_cookies[SESSION_COOKIE] = session_id
+            return status_code, payload, set_cookies
+
+    def _route(
+        self, method: str, path: str, query: dict, body: Any, auth: Optional[tuple]
+    ) -> Result:
+        """Pass a request to its handler."""
+        for route_method, pattern, handler in self._routes:
+            match = re.search(pattern, path)
+            if match and route_method == method:
+                try:
+                    return handler(query=query, body=body, auth=auth, **match.groupdict())
+                except SimulatedError as error:
+                    return error.status_code, error.payload
+
+        return 404, dict(displayMessage=f"No route for {method} {path}")
+
+    def expire_sessions(self) -> None:
+        """Invalidate all Candlepin sessions."""
+        with self._lock:
+            self.sessions.clear()
+
+    @staticmethod
+    def _parse_auth(header: Optional[str]) -> Optional[Tuple[str, str]]:
+        if not header or not header.startswith("Basic "):
+            return None
+        username, _, password = base64.b64decode(header[6:]).decode().partition(":")
+        return username, password
+
+    def _user(
+        self,
+        login: str,
+        status_code: int = 500,
+        exception_type: str = "user.UserNotFoundException",
+    ) -> dict:
+        user = self.users.get(login)
+        if user is None:
+            raise ebs_error(status_code, exception_type, f"User {login} not found")
+        return user
+
+    def _authenticate(self, auth: Optional[Tuple[str, str]]) -> dict:
+        user = self.users.get(auth[0]) if auth else None
+        if user is None or user["password"] != auth[1]:  # type: ignore
+            raise candlepin_error(401, "Invalid user credentials")
+        return user
+
+    @staticmethod
+    def _authenticate_admin(auth: Optional[Tuple[str, str]]) -> None:
+        if auth != ADMIN_AUTH:
+            raise candlepin_error(401, "Invalid user credentials")
+
+    def _authorize_owner(self, auth: Optional[Tuple[str, str]], key: str) -> None:
+        if auth == ADMIN_AUTH:
+            return
+        if str(self._authenticate(auth)["orgId"]) != key:
+            raise candlepin_error(403, "Insufficient permissions")
+
+    # EBS User API
+
+    def create_user(self, body: dict, **_) -> Result:
+        """POST /create"""
+        login = body["login"]
+        if login in self.users:
+            raise ebs_error(500, "user.LoginExistsException", login)
+
+        user_id = self.next_id()
+        self.users[login] = dict(
+            id=user_id,
+            login=login,
+            loginUppercase=login.upper(),
+            password=body["password"],
+            orgId=self.next_id(),
+            personalInfo=body.get("personalInfo", {}),
+        )
+        return 200, user_id
+
+    def find_user(self, login: str, **_) -> Result:
+        """GET /login={login}"""
+        user = self.users.get(login)
+        return 200, [dict(user, password=None)] if user else []
+
+    # EBS Subscription API
+
+    def order(self, body: dict, **_) -> Result:
+        """PUT /hock/order"""
+        self._user(body["login"])
+        line = body["lines"][0]["lineItem"]
+        regnum = self.next_id()
+        self.orders[regnum] = dict(
+            login=body["login"],
+            sku=line["sku"],
+            quantity=int(line["quantity"]),
+            duration=int(line["duration"].split()[0]),
+            activated=False,
+        )
+        return 200, dict(regNumbers=[[dict(regNumber=regnum)]])
+
+    def activate(self, body: dict, **_) -> Result:
+        """POST /activate"""
+        order = self.orders.get(int(body["activationKey"]))
+        if order is None or order["activated"]:
+            raise ebs_error(500, "activation.InvalidRegNumberException", "Invalid regnum")
+
+        user = self._user(body["userName"])
+        if int(body["webCustomerId"]) != user["orgId"]:
+            raise ebs_error(500, "activation.InvalidOrgException", "Invalid org")
+
+        order["activated"] = True
+        start_date = date.fromisoformat(body["startDate"])
+        subscription = dict(
+            id=self.next_id(),
+            sku=order["sku"],
+            quantity=order["quantity"],
+            start_date=start_date,
+            end_date=start_date + timedelta(days=order["duration"]),
+            regnum=int(body["activationKey"]),
+        )
+        self.subscriptions.setdefault(user["orgId"], []).append(subscription)
+        return 200, dict(id=subscription["id"], regNumber=subscription["regnum"])
+
+    # EBS Terms API
+
+    def _terms_user(self, login: str) -> dict:
+        return self._user(login, 404, "termsv2.model.exceptions.UserNotFoundException")
+
+    def _pending_terms(self, login: str, optional: bool) -> List[dict]:
+        self._terms_user(login)
+        accepted = self.accepted_terms.get(login, set())
+        return [
+            terms
+            for terms in self.terms
+            if (optional or not terms["isOptional"])
+            and not {t["termsPdfId"] for t in terms["translations"]} & accepted
+        ]
+
+    def required(self, query: dict, **_) -> Result:
+        """GET /required"""
+        return 200, self._pending_terms(query["login"], optional=False)
+
+    def available(self, query: dict, **_) -> Result:
+        """GET /available"""
+        return 200, self._pending_terms(query["login"], optional=True)
+
+    def ackterms(self, query: dict, **_) -> Result:
+        """PUT /ackterms"""
+        self._terms_user(query["login"])
+        pdf_ids = {t["termsPdfId"] for terms in self.terms for t in terms["translations"]}
+        if query["pdfid"] not in pdf_ids:
+            raise ebs_error(
+                404, "termsv2.model.exceptions.NoActiveVerbiageForPdfIdException", ""
+            )
+        self.accepted_terms.setdefault(query["login"], set()).add(query["pdfid"])
+        return 200, None
+
+    # Candlepin API
+
+    def refresh(self, key: str, query: dict, auth: tuple, **_) -> Result:
+        """PUT /owners/{key}/subscriptions"""
+        self._authenticate_admin(auth)
+        if key not in self.owners:
+            if query.get("auto_create_owner") != "True":
+                raise candlepin_error(404, f"Organization with id {key} not found.")
+            self.owners[key] = dict(id=str(uuid.uuid4()), key=key, displayName=key)
+
+        pools = self.pools.setdefault(key, [])
+        known = {pool["subscriptionId"] for pool in pools}
+        for subscription in self.subscriptions.get(int(key), []):
+            if subscription["id"] in known:
+                continue
+            # Candlepin skips expired subscriptions, so their deleted pools don't come
+            # back. Subscriptions created already expired get a pool once, for testing.
+            if subscription.get("refreshed") and subscription["end_date"] < date.today():
+                continue
+            subscription["refreshed"] = True
+            pools.append(self._pool(key, subscription))
+
+        job_id = f"refresh_pools_{uuid.uuid4().hex}"
+        self.jobs[job_id] = dict(id=job_id, state="FINISHED", targetId=key)
+        return 202, self.jobs[job_id]
+
+    @staticmethod
+    def _pool(key: str, subscription: dict) -> dict:
+        return dict(
+            id=uuid.uuid4().hex,
+            owner=dict(key=key),
+            subscriptionId=subscription["id"],
+            productId=subscription["sku"],
+            productName=f"Simulated {subscription['sku']}",
+            startDate=candlepin_date(subscription["start_date"]),
+            endDate=candlepin_date(subscription["end_date"]),
+            quantity=subscription["quantity"],
+            multiplier=1,
+            consumed=0,
+            productAttributes=[],
+        )
+
+    def get_job(self, job_id: str, auth: tuple, **_) -> Result:
+        """GET /jobs/{job_id}"""
+        self._authenticate_admin(auth)
+        if job_id not in self.jobs:
+            raise candlepin_error(404, f"Job with ID {job_id} could not be found.")
+        return 200, self.jobs[job_id]
+
+    def get_owners(self, login: str, auth: tuple, **_) -> Result:
+        """GET /users/{login}/owners"""
+        user = self._authenticate(auth)
+        if user["login"] != login:
+            raise candlepin_error(403, "Insufficient permissions")
+        owner = self.owners.get(str(user["orgId"]))
+        return 200, [owner] if owner else []
+
+    def get_pools(self, key: str, query: dict, auth: tuple, **_) -> Result:
+        """GET /owners/{key}/pools"""
+        user = self._authenticate(auth)
+        if key not in self.owners:
+            raise candlepin_error(404, f"Owner with id {key} could not be found.")
+        if str(user["orgId"]) != key:
+            raise candlepin_error(403, "Insufficient permissions")
+
+        if "consumer" in query:
+            consumer = self._consumer(query["consumer"], auth)
+            if consumer["owner"]["key"] != key:
+                raise candlepin_error(403, "Insufficient permissions")
+
+        active_on = candlepin_date(
+            date.fromisoformat(query["activeon"][:10])
+            if "activeon" in query
+            else date.today()
+        )
+        future = query.get("add_future") == "True" and "activeon" not in query
+        pools = [
+            pool
+            for pool in self.pools.get(key, [])
+            if (future or pool["startDate"] <= active_on)
+            and ("activeon" not in query or active_on <= pool["endDate"])
+            and query.get("product", pool["productId"]) == pool["productId"]
+            and self._pool_matches(pool, query)
+        ]
+
+        if "include" in query:
+            include = query["include"]
+            pools = [{k: pool[k] for k in include if k in pool} for pool in pools]
+        return 200, pools
+
+    @staticmethod
+    def _pool_matches(pool: dict, query: dict) -> bool:
+        attributes = {a["name"]: a["value"] for a in pool["productAttributes"]}
+        for attribute in query.get("attribute", []):
+            name, _, value = attribute.partition(":")
+            if attributes.get(name) != value:
+                return False
+
+        if "matches" not in query:
+            return True
+        pattern = query["matches"].lower()
+        values = [pool["productId"], pool["productName"], *attributes.values()]
+        return any(fnmatch.fnmatchcase(str(v).lower(), pattern) for v in values)
+
+    def delete_owner(self, key: str, auth: tuple, **_) -> Result:
+        """DELETE /owners/{key}"""
+        self._authenticate_admin(auth)
+        if key not in self.owners:
+            raise candlepin_error(404, f"Owner with id {key} could not be found.")
+        del self.owners[key]
+        self.pools.pop(key, None)
+        return 204, None
+
+    def delete_pool(self, pool_id: str, auth: tuple, **_) -> Result:
+        """DELETE /pools/{pool_id}"""
+        self._authenticate_admin(auth)
+        for pools in self.pools.values():
+            for pool in pools:
+                if pool["id"] == pool_id:
+                    pools.remove(pool)
+                    return 204, None
+        raise candlepin_error(404, f"Entitlement Pool with ID {pool_id} not found.")
+
+    def delete_user(self, login: str, auth: tuple, **_) -> Result:
+        """DELETE /users/{login}
+
+        Candlepin users mirror the User service, which keeps the user account.
+        """
+        self._authenticate_admin(auth)
+        if login not in self.users:
+            raise candlepin_error(404, f"User {login} not found")
+        return 204, None
+
+    def register_consumer(self, query: dict, body: dict, auth: tuple, **_) -> Result:
+        """POST /consumers"""
+        key = query.get("owner", "")
+        self._authorize_owner(auth, key)
+        if key not in self.owners:
+            raise candlepin_error(404, f"Owner with id {key} could not be found.")
+
+        consumer_uuid = str(uuid.uuid4())
+        self.consumers[consumer_uuid] = dict(
+            uuid=consumer_uuid,
+            name=body["name"],
+            type=body["type"],
+            facts=body.get("facts", {}),
+            owner=dict(key=key),
+            entitlements=[],
+        )
+        return 200, {
+            k: v for k, v in self.consumers[consumer_uuid].items() if k != "entitlements"
+        }
+
+    def _consumer(self, consumer_uuid: str, auth: tuple) -> dict:
+        consumer = self.consumers.get(consumer_uuid)
+        if consumer is None:
+            raise candlepin_error(404, f"Unit with ID '{consumer_uuid}' not found.")
+        self._authorize_owner(auth, consumer["owner"]["key"])
+        return consumer
+
+    def attach_pool(self, consumer_uuid: str, query: dict, auth: tuple, **_) -> Result:
+        """POST /consumers/{consumer_uuid}/entitlements"""
+        consumer = self._consumer(consumer_uuid, auth)
+        pools = self.pools.get(consumer["owner"]["key"], [])
+        pool = next((p for p in pools if p["id"] == query.get("pool")), None)
+        if pool is None:
+            raise candlepin_error(404, f"Pool with id {query.get('pool')} not found.")
+
+        quantity = int(query.get("quantity", 1))
+        unlimited = pool["quantity"] < 0
+        if not unlimited and pool["consumed"] + quantity > pool["quantity"]:
+            raise candlepin_error(403, "No subscriptions are available.")
+
+        pool["consumed"] += quantity
+        entitlement = dict(
+            id=uuid.uuid4().hex, pool=dict(id=pool["id"]), quantity=quantity
+        )
+        consumer["entitlements"].append(entitlement)
+        return 200, [entitlement]
+
+    def unregister_consumer(self, consumer_uuid: str, auth: tuple, **_) -> Result:
+        """DELETE /consumers/{consumer_uuid}"""
+        consumer = self._consumer(consumer_uuid, auth)
+        pools = {p["id"]: p for p in self.pools.get(consumer["owner"]["key"], [])}
+        for entitlement in consumer["entitlements"]:
+            pool = pools.get(entitlement["pool"]["id"])
+            if pool:
+                pool["consumed"] -= entitlement["quantity"]
+        del self.consumers[consumer_uuid]
+        return 204, None
+
+
+class SimulatedAdapter(BaseAdapter):
+    def __init__(self, backend: SimulatedBackend) -> None:
+        """Requests transport adapter passing requests to a simulated backend.
+
+        Args:
+            backend (SimulatedBackend): Simulated backend.
+        """
+        super().__init__()
+        self.backend = backend
+
+    def send(  # pylint: disable=arguments-differ,unused-argument
+        self, request: PreparedRequest, *args, timeout: Any = None, **kwargs
+    ) -> Response:
+        """Handle request in the simulated backend.
+
+        Args:
+            request (PreparedRequest): Request to send.
+            timeout (Any, optional): Read timeout or a (connect, read) tuple.
+                Defaults to None.
+
+        Raises:
+            ReadTimeout: Backend latency is over the read timeout.
+
+        Returns:
+            Response: Simulated response.
+        """
+        read_timeout = timeout[1] if isinstance(timeout, tuple) else timeout
+        if self.backend.latency:
+            if read_timeout is not None and self.backend.latency > read_timeout:
+                time.sleep(read_timeout)
+                raise ReadTimeout(f"Read timed out. (read timeout={read_timeout})")
+            time.sleep(self.backend.latency)
+
+        status_code, payload, cookies = self.backend.handle(request)
+
+        response = Response()
+        response.status_code = status_code
+        response.reason = HTTPStatus(status_code).phrase
+        response.url = request.url  # type: ignore
+        response.request = request
+        response.encoding = "utf-8"
+        response.headers = CaseInsensitiveDict({"Content-Type": "application/json"})
+        response._content = (  # pylint: disable=protected-access
+            b"" if payload is None else json.dumps(payload).encode()
+        )
+        response._content_consumed = True  # pylint: disable=protected-access
+        host = urlsplit(request.url).hostname
+        for name, value in cookies.items():
+            response.headers["Set-Cookie"] = f"{name}={value}; Path=/candlepin"
+            response.cookies.set(name, value, domain=host, path="/candlepin")
+        return response
+
+    def close(self) -> None:
+        """Nothing to release."""
@@ -2,7 +2,7 @@ from datetime import date, timedelta
 
 from .base import CERT, APIBase
 from .exceptions import raises_from_ebs as raises_ethel_exception
-from .utils import Template
+from .utils import Template, parse_json
 
 
 class RegnumV5(APIBase):
@@ -49,7 +49,7 @@ class RegnumV5(APIBase):
 
         response = self.api.put("/hock/order", json=payload)
         response.raise_for_status()
-        return response.json()
+        return parse_json(response)
 
 
 class ActivationV2(APIBase):
@@ -89,4 +89,4 @@ class ActivationV2(APIBase):
 
         response = self.api.post("/activate", json=params)
         response.raise_for_status()
-        return response.json()
+        return parse_json(response)
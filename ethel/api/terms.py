@@ -1,5 +1,6 @@
 from .base import CERT, APIBase
 from .exceptions import raises_from_ebs as raises_ethel_exception
+from .utils import parse_json
 
 
 class TermsV1(APIBase):
@@ -28,7 +29,7 @@ class TermsV1(APIBase):
         params = dict(login=username, event="attachSubscription", site="candlepin")
         response = self.api.get("/required", params=params)
         response.raise_for_status()
-        return response.json()
+        return parse_json(response)
 
     @raises_ethel_exception
     def get_all_terms(self, username: str) -> list:
@@ -45,7 +46,7 @@ class TermsV1(APIBase):
         params = dict(login=username, event="attachSubscription", site="candlepin")
         response = self.api.get("/available", params=params)
         response.raise_for_status()
-        return response.json()
+        return parse_json(response)
 
     @raises_ethel_exception
     def accept_terms(self, username: str, terms_id: int) -> bool:
@@ -0,0 +1,173 @@
+import threading
+import time
+
+from .deadline import check
+
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: int = None) -> None:
+        """Token bucket rate limiter.
+
+        Allows on average `rate` requests per second, with bursts of up to `burst`
+        requests.
+
+        Args:
+            rate (float): Requests per second.
+            burst (int, optional): Bucket capacity. Defaults to max(1, rate).
+        """
+        self.rate = rate
+        self.capacity = burst or max(1, rate)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        refill = (now - self._updated) * self.rate
+        self._tokens = min(self.capacity, self._tokens + refill)
+        self._updated = now
+
+    def acquire(self) -> None:
+        """Take a token, block until one is available.
+
+        Raises:
+            DeadlineExceeded: Current deadline passed while waiting.
+        """
+        while True:
+            left = check()
+            with self._lock:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                delay = (1 - self._tokens) / self.rate
+            time.sleep(delay if left is None else min(delay, left))
+
+
+class AIMDLimiter:
+    def __init__(
+        self,
+        limit: int = 4,
+        min_limit: int = 1,
+        max_limit: int = 64,
+        backoff: float = 0.5,
+    ) -> None:
+        """Adaptive concurrency limiter.
+
+        Additive increase, multiplicative decrease: each successful request raises the
+        limit by roughly one per round trip, each overloaded request multiplies the
+        limit by `backoff`.
+
+        Args:
+            limit (int, optional): Initial concurrency limit. Defaults to 4.
+            min_limit (int, optional): Lowest concurrency limit. Defaults to 1.
+            max_limit (int, optional): Highest concurrency limit. Defaults to 64.
+            backoff (float, optional): Multiplicative decrease factor. Defaults to 0.5.
+        """
+        self.limit = float(limit)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff = backoff
+        self.in_flight = 0
+        self._condition = threading.Condition()
+
+    def acquire(self) -> None:
+        """Take a concurrency slot, block until one is available.
+
+        Raises:
+            DeadlineExceeded: Current deadline passed while waiting.
+        """
+        with self._condition:
+            while self.in_flight >= int(self.limit):
+                self._condition.wait(check())
+            self.in_flight += 1
+
+    def cancel(self) -> None:
+        """Return a slot of a request which wasn't sent, keep the limit."""
+        with self._condition:
+            self.in_flight -= 1
+            self._condition.notify_all()
+
+    def release(self, overloaded: bool = False) -> None:
+        """Return a concurrency slot and adjust the limit.
+
+        Args:
+            overloaded (bool, optional): The request indicated backend overload.
+                Defaults to False.
+        """
+        with self._condition:
+            self.in_flight -= 1
+            if overloaded:
+                self.limit = max(self.min_limit, self.limit * self.backoff)
+            else:
+                self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+            self._condition.notify_all()
+
+
+class RateLimiter:
+    OVERLOAD_STATUS_CODES = (429, 503)
+
+    def __init__(
+        self,
+        rate: float = None,
+        burst: int = None,
+        concurrency: int = 4,
+        max_concurrency: int = 64,
+        latency_threshold: float = None,
+    ) -> None:
+        """Rate limiter for a single backend service.
+
+        Combines a token bucket, which caps the request rate, with an AIMD concurrency
+        limiter, which backs off on 429 and 503 responses, connection errors and slow
+        responses.
+
+        Args:
+            rate (float, optional): Maximal requests per second. Defaults to None
+                (unlimited).
+            burst (int, optional): Token bucket capacity. Defaults to None.
+            concurrency (int, optional): Initial concurrency limit. Defaults to 4.
+            max_concurrency (int, optional): Highest concurrency limit. Defaults to 64.
+            latency_threshold (float, optional): Responses slower than this many
+                seconds are considered a sign of overload. Defaults to None.
+        """
+        self.bucket = TokenBucket(rate, burst) if rate else None
+        self.concurrency = AIMDLimiter(concurrency, max_limit=max_concurrency)
+        self.latency_threshold = latency_threshold
+        self._args = (rate, burst, concurrency, max_concurrency, latency_threshold)
+
+    def __reduce__(self):
+        # Pickle settings only, an unpickled limiter starts with a fresh state
+        return self.__class__, self._args
+
+    def acquire(self) -> None:
+        """Wait until a request may be sent.
+
+        Raises:
+            DeadlineExceeded: Current deadline passed while waiting.
+        """
+        self.concurrency.acquire()
+        if self.bucket:
+            try:
+                self.bucket.acquire()
+            except BaseException:
+                self.concurrency.cancel()
+                raise
+
+    def cancel(self) -> None:
+        """Report a request which was admitted, but not sent."""
+        self.concurrency.cancel()
+
+    def release(self, latency: float, status_code: int = None) -> None:
+        """Report a finished request.
+
+        Args:
+            latency (float): Request duration in seconds.
+            status_code (int, optional): Response status code, None if the request
+                failed to get a response. Defaults to None.
+        """
+        overloaded = (
+            status_code is None
+            or status_code in self.OVERLOAD_STATUS_CODES
+            or (self.latency_threshold is not None and latency > self.latency_threshold)
+        )
+        self.concurrency.release(overloaded)
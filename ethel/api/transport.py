@@ -0,0 +1,255 @@
+"""HTTP transports
+
+Backends which send requests of an APISession. All transports take requests-style
+arguments, return requests.Response objects and raise requests exceptions, so API
+clients don't depend on the transport in use.
+"""
+import http.client
+import ssl
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, Dict, Iterable, Optional, Tuple, Type, Union
+
+import requests
+import urllib3
+from requests.cookies import MockRequest, MockResponse
+from requests.structures import CaseInsensitiveDict
+
+try:
+    import httpx  # type: ignore
+except ImportError:  # pragma: no cover
+    httpx = None
+
+if TYPE_CHECKING:
+    from .base import APISession  # pylint: disable=cyclic-import
+
+# Connections kept per host, shared by all threads using the same APISession
+POOL_MAXSIZE = 32
+
+
+def _cert_files(cert: Union[str, Tuple[str, str], None]) -> Tuple[Optional[str], ...]:
+    """Client certificate and key file, None if not set."""
+    if not isinstance(cert, tuple):
+        return cert or None, None
+    return tuple(path or None for path in cert)
+
+
+class Transport(ABC):
+    name = ""
+
+    def __init__(self, session: "APISession") -> None:
+        """Sends requests of an APISession.
+
+        Args:
+            session (APISession): Session whose headers, cookies, authentication and
+                TLS settings are used.
+        """
+        self.session = session
+
+    @abstractmethod
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Send a request.
+
+        Args:
+            method (str): HTTP method, lowercase.
+            url (str): Full request URL.
+            **kwargs: Arguments of requests.Session.request.
+
+        Returns:
+            requests.Response: Response.
+        """
+
+    def close(self) -> None:
+        """Release all connections."""
+
+
+class RequestsTransport(Transport):
+    """Requests sent by sessions private to each thread (see APISession.thread_session).
+
+    Supports everything requests does, including transport adapters mounted on the
+    session, like the one of the simulated backend.
+    """
+
+    name = "requests"
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        return getattr(self.session.thread_session(), method)(url, **kwargs)
+
+
+class _PreparedTransport(Transport, ABC):
+    """Transport sending requests prepared by the session.
+
+    Requests are prepared by requests (merging session headers, cookies and
+    authentication), but sent by another HTTP client. Redirects are not followed and
+    proxies are not used. TLS settings are read when the transport is created.
+    """
+
+    def prepare(
+        self, method: str, url: str, **kwargs
+    ) -> Tuple[requests.PreparedRequest, Tuple[float, float]]:
+        """Prepare a request and its connect and read timeout."""
+        timeout = kwargs.pop("timeout", None) or self.session.timeout
+        if not isinstance(timeout, tuple):
+            timeout = (timeout, timeout)
+        request = requests.Request(method.upper(), url, **kwargs)
+        return self.session.prepare_request(request), timeout
+
+    def respond(
+        self,
+        prepared: requests.PreparedRequest,
+        status_code: int,
+        reason: str,
+        headers: Iterable[Tuple[str, str]],
+        content: bytes,
+    ) -> requests.Response:
+        """Build a response, store received cookies in it and in the session."""
+        headers = list(headers)
+        response = requests.Response()
+        response.status_code = status_code
+        response.reason = reason
+        response.headers = CaseInsensitiveDict()
+        for name, value in headers:
+            if name in response.headers:
+                value = f"{response.headers[name]}, {value}"
+            response.headers[name] = value
+        response._content = content  # pylint: disable=protected-access
+        response._content_consumed = True  # pylint: disable=protected-access
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        response.url = prepared.url
+        response.request = prepared
+
+        if "set-cookie" in response.headers:
+            message = http.client.HTTPMessage()
+            for name, value in headers:
+                message[name] = value
+            for jar in (response.cookies, self.session.cookies):
+                jar.extract_cookies(MockResponse(message), MockRequest(prepared))
+        return response
+
+
+class Urllib3Transport(_PreparedTransport):
+    """Requests sent directly by a thread-safe urllib3 pool manager.
+
+    Skips requests' per-request session and environment merging, hooks and adapter
+    lookup.
+    """
+
+    name = "urllib3"
+
+    def __init__(self, session: "APISession") -> None:
+        super().__init__(session)
+        cert_file, key_file = _cert_files(session.cert)
+        verify = session.verify
+        ca_certs = None
+        if verify:
+            ca_certs = verify if isinstance(verify, str) else requests.certs.where()
+        self.pool = urllib3.PoolManager(
+            maxsize=POOL_MAXSIZE,
+            cert_file=cert_file,
+            key_file=key_file,
+            cert_reqs="CERT_REQUIRED" if verify else "CERT_NONE",
+            ca_certs=ca_certs,
+        )
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        prepared, (connect, read) = self.prepare(method, url, **kwargs)
+        exceptions = urllib3.exceptions
+        try:
+            raw = self.pool.urlopen(
+                prepared.method,
+                prepared.url,
+                body=prepared.body,
+                headers=prepared.headers,
+                timeout=urllib3.Timeout(connect=connect, read=read),
+                retries=False,
+                redirect=False,
+            )
+        except exceptions.NewConnectionError as e:
+            raise requests.ConnectionError(e, request=prepared) from e
+        except exceptions.ConnectTimeoutError as e:
+            raise requests.ConnectTimeout(e, request=prepared) from e
+        except exceptions.ReadTimeoutError as e:
+            raise requests.ReadTimeout(e, request=prepared) from e
+        except exceptions.SSLError as e:
+            raise requests.exceptions.SSLError(e, request=prepared) from e
+        except exceptions.HTTPError as e:
+            raise requests.ConnectionError(e, request=prepared) from e
+
+        return self.respond(
+            prepared, raw.status, raw.reason, raw.headers.iteritems(), raw.data
+        )
+
+    def close(self) -> None:
+        self.pool.clear()
+
+
+class HTTP2Transport(_PreparedTransport):
+    """Requests sent by a thread-safe httpx client, multiplexed over HTTP/2.
+
+    Concurrent requests to a host share a single connection if the server supports
+    HTTP/2, otherwise HTTP/1.1 is used. Requires httpx with HTTP/2 support
+    (pip install httpx[http2]).
+    """
+
+    name = "http2"
+
+    def __init__(self, session: "APISession") -> None:
+        super().__init__(session)
+        if httpx is None:
+            raise ImportError("HTTP/2 transport requires httpx[http2]")
+
+        verify = session.verify
+        if verify:
+            context = ssl.create_default_context(
+                cafile=verify if isinstance(verify, str) else requests.certs.where()
+            )
+        else:
+            context = ssl.create_default_context()
+            context.check_hostname = False
+            context.verify_mode = ssl.CERT_NONE
+        cert_file, key_file = _cert_files(session.cert)
+        if cert_file:
+            context.load_cert_chain(cert_file, key_file)
+
+        self.client = httpx.Client(
+            http2=True,
+            verify=context,
+            limits=httpx.Limits(
+                max_connections=POOL_MAXSIZE, max_keepalive_connections=POOL_MAXSIZE
+            ),
+            trust_env=False,
+        )
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        prepared, (connect, read) = self.prepare(method, url, **kwargs)
+        try:
+            raw = self.client.request(
+                prepared.method,  # type: ignore
+                prepared.url,  # type: ignore
+                content=prepared.body,
+                headers=list(prepared.headers.items()),
+                timeout=httpx.Timeout(read, connect=connect),
+            )
+        except httpx.ConnectTimeout as e:
+            raise requests.ConnectTimeout(e, request=prepared) from e
+        except httpx.TimeoutException as e:
+            raise requests.ReadTimeout(e, request=prepared) from e
+        except httpx.TransportError as e:
+            raise requests.ConnectionError(e, request=prepared) from e
+
+        return self.respond(
+            prepared,
+            raw.status_code,
+            raw.reason_phrase,
+            raw.headers.multi_items(),
+            raw.content,
+        )
+
+    def close(self) -> None:
+        self.client.close()
+
+
+# Transports by name
+TRANSPORTS: Dict[str, Type[Transport]] = {
+    transport.name: transport
+    for transport in (RequestsTransport, Urllib3Transport, HTTP2Transport)
+}
@@ -1,6 +1,6 @@
 from .base import CERT, APIBase
 from .exceptions import raises_from_ebs as raises_ethel_exception
-from .utils import Template
+from .utils import Template, parse_json
 
 
 class UserV1(APIBase):
@@ -50,7 +50,7 @@ class UserV1(APIBase):
 
         response = self.api.post("/create", json=payload)
         response.raise_for_status()
-        return response.json()
+        return parse_json(response)
 
     @raises_ethel_exception
     def login(self, username: str) -> list:
@@ -64,9 +64,9 @@ class UserV1(APIBase):
         Returns:
             list: List of users matching the username
         """
-        response = self.api.get(f"/login={username}")
+        response = self.api.get(f"/login={username}", hedge=True)
         response.raise_for_status()
-        return response.json()
+        return parse_json(response)
 
 
 class UserV2(APIBase):
@@ -116,7 +116,7 @@ class UserV2(APIBase):
 
         response = self.api.post("/createUser", json=payload)
         response.raise_for_status()
-        return response.json()
+        return parse_json(response)
 
     @raises_ethel_exception
     def login(self, username: str) -> list:
@@ -136,4 +136,4 @@ class UserV2(APIBase):
         )
         response = self.api.post("/findUser", json=payload)
         response.raise_for_status()
-        return response.json()
+        return parse_json(response)
@@ -1,8 +1,16 @@
+import json
 import os
+from typing import Any
 
+import requests
 import yaml
 from jinja2 import Template as Jinja2Template
 
+try:
+    from orjson import loads as json_loads  # pylint: disable=no-name-in-module
+except ImportError:  # pragma: no cover
+    json_loads = json.loads
+
 
 class Template:
     def __init__(self, filename: str):
@@ -29,3 +37,21 @@ class Template:
         """
         render = self.template.render(**kwargs)
         return yaml.safe_load(render)
+
+
+def parse_json(response: requests.Response) -> Any:
+    """Decode JSON response body.
+
+    Uses orjson if it's installed, which is considerably faster for large responses
+    than the standard library.
+
+    Args:
+        response (requests.Response): Response to decode.
+
+    Raises:
+        ValueError: Response body is not a valid JSON.
+
+    Returns:
+        Any: Decoded response.
+    """
+    return json_loads(response.content)
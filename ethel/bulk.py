@@ -0,0 +1,199 @@
+"""Bulk provisioning
+
+Provision many accounts at once by sharding account specs across worker processes.
+"""
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .account import Account
+from .api import API, Hedger, RateLimiter, initialize_apis
+from .api.base import DEFAULT_TIMEOUT, APISession
+from .api.breaker import get_circuit_breaker
+from .handle import AccountHandle
+
+# API clients of a worker process, initialized once per process
+_WORKER_API: Optional[API] = None
+
+
+@dataclass
+class ProvisioningResult:
+    username: str
+    org_id: Optional[int] = None
+    activations: List[int] = field(default_factory=list)
+    handle: Optional[AccountHandle] = None
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:  # pylint: disable=invalid-name
+        """Account was provisioned successfully."""
+        return self.error is None
+
+
+@dataclass
+class BulkReport:
+    succeeded: List[ProvisioningResult] = field(default_factory=list)
+    failed: List[ProvisioningResult] = field(default_factory=list)
+
+    def add(self, result: ProvisioningResult) -> None:
+        """Aggregate a single provisioning result.
+
+        Args:
+            result (ProvisioningResult): Result to aggregate.
+        """
+        if result.ok:
+            self.succeeded.append(result)
+        else:
+            self.failed.append(result)
+
+    @property
+    def errors(self) -> Dict[str, str]:
+        """Errors by username."""
+        return {result.username: result.error for result in self.failed}  # type: ignore
+
+    def __str__(self):
+        total = len(self.succeeded) + len(self.failed)
+        return f"Provisioned {len(self.succeeded)}/{total} accounts."
+
+
+@dataclass
+class SessionSettings:
+    """Picklable settings of an API session, to be applied in worker processes.
+
+    Rate limiters and hedgers are pickled by their settings, so each worker process
+    limits and hedges its own requests. Circuit breakers are shared by the sessions
+    of a worker process, like they are in the parent process.
+    """
+
+    timeout: Tuple[float, float] = DEFAULT_TIMEOUT
+    transport: str = "requests"
+    limiter: Optional[RateLimiter] = None
+    hedger: Optional[Hedger] = None
+    breaker: Optional[Tuple[int, float]] = None
+
+    @classmethod
+    def from_session(cls, session: APISession) -> "SessionSettings":
+        """Settings of an existing session.
+
+        Args:
+            session (APISession): Configured session.
+        """
+        breaker = session.breaker
+        return cls(
+            timeout=session.timeout,
+            transport=session.transport.name,
+            limiter=session.limiter,
+            hedger=session.hedger,
+            breaker=breaker and (breaker.failure_threshold, breaker.reset_timeout),
+        )
+
+    def apply(self, session: APISession) -> None:
+        """Configure a session by these settings.
+
+        Args:
+            session (APISession): Session to configure.
+        """
+        session.timeout = self.timeout
+        if self.transport != session.transport.name:
+            session.use_transport(self.transport)
+        session.limiter = self.limiter  # type: ignore
+        session.hedger = self.hedger  # type: ignore
+        if self.breaker:
+            session.breaker = get_circuit_breaker(session.api_base_url, *self.breaker)
+
+
+def api_settings(api: API) -> Dict[str, SessionSettings]:
+    """Settings of all API sessions, by service name.
+
+    Args:
+        api (API): Configured API clients.
+    """
+    return {
+        service: SessionSettings.from_session(client.api)
+        for service, client in api.clients().items()
+    }
+
+
+def _init_worker(
+    rest_host: str, candlepin_host: str, settings: Dict[str, SessionSettings] = None
+) -> None:
+    """Create API sessions owned by this worker process."""
+    global _WORKER_API  # pylint: disable=global-statement
+    _WORKER_API = initialize_apis(rest_host, candlepin_host)
+    clients = _WORKER_API.clients()
+    for service, service_settings in (settings or {}).items():
+        service_settings.apply(clients[service].api)
+
+
+def _provision(spec: dict) -> ProvisioningResult:
+    """Provision a single account in a worker process.
+
+    Exceptions are not propagated, they are reported as a string in the result instead,
+    since not all of them survive pickling.
+    """
+    result = ProvisioningResult(username=spec["username"])
+    try:
+        account = Account(_WORKER_API, **spec)  # type: ignore
+        result.org_id = account.org_id
+        result.activations = [record.activation_id for record in account.ledger]
+        result.handle = AccountHandle.from_account(account)
+    except Exception as e:  # pylint: disable=broad-except
+        result.error = f"{e.__class__.__name__}: {e}"
+    return result
+
+
+def _provision_shard(shard: List[dict]) -> List[ProvisioningResult]:
+    """Provision a shard of accounts in a worker process."""
+    return [_provision(spec) for spec in shard]
+
+
+def provision(
+    rest_host: str,
+    candlepin_host: str,
+    specs: Iterable[dict],
+    processes: int = None,
+    shard_size: int = 1,
+    progress: Callable[[int, int, ProvisioningResult], None] = None,
+    settings: Dict[str, SessionSettings] = None,
+) -> Iterator[ProvisioningResult]:
+    """Provision accounts in a pool of worker processes.
+
+    Account specs are split into shards, which are distributed among the worker
+    processes. Each worker keeps its own API sessions, configured by `settings`.
+    Results are yielded as soon as their shard is finished, in order of completion.
+
+    Args:
+        rest_host (str): Base host for all REST APIs.
+        candlepin_host (str): Host of targed Candlepin.
+        specs (Iterable[dict]): Keyword arguments for Account, one dict per account.
+            Each must contain a "username".
+        processes (int, optional): Number of worker processes. Defaults to None
+            (number of CPUs).
+        shard_size (int, optional): Number of accounts sent to a worker at once.
+            Defaults to 1.
+        progress (Callable[[int, int, ProvisioningResult], None], optional): Called
+            with number of finished accounts, total number of accounts and the latest
+            result. Defaults to None.
+        settings (Dict[str, SessionSettings], optional): Session settings by service
+            name, see api_settings. Rate limits apply to each worker separately.
+            Defaults to None (default settings).
+
+    Yields:
+        ProvisioningResult: Result for each account.
+    """
+    specs = list(specs)
+    shards = [specs[i : i + shard_size] for i in range(0, len(specs), shard_size)]
+    done = 0
+
+    with ProcessPoolExecutor(
+        max_workers=processes,
+        initializer=_init_worker,
+        initargs=(rest_host, candlepin_host, settings),
+    ) as executor:
+        futures = [executor.submit(_provision_shard, shard) for shard in shards]
+        for future in as_completed(futures):
+            for result in future.result():
+                done += 1
+                if progress:
+                    progress(done, len(specs), result)
+                yield result
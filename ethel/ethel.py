@@ -1,10 +1,36 @@
+from datetime import date, datetime
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, Optional, Tuple, Union
+
 from .account import Account
-from .api import initialize_apis
+from .api import Hedger, RateLimiter, initialize_apis
+from .api.breaker import get_circuit_breaker
+from .api.simulation import SimulatedAdapter, SimulatedBackend
+from .bulk import ProvisioningResult, api_settings, provision
+from .export import ExportReport, export_pools
+from .inventory import AccountPools, scan_pools
+from .multi import MultiEthel
+from .teardown import TeardownReport, teardown
+from .utils import map_concurrently
 
 HOSTS = dict(
     stage=("stage.api.redhat.com", "candlepin.dist.stage.ext.phx2.redhat.com"),
     qa=("qa.api.redhat.com", "candlepin.corp.qa.redhat.com"),
 )
+SIMULATED_HOSTS = ("api.simulated", "candlepin.simulated")
+
+
+def register_environment(name: str, rest_host: str, candlepin_host: str) -> None:
+    """Register a custom environment.
+
+    Registered environments can be used by Ethel.environment and Ethel.multi.
+
+    Args:
+        name (str): Environment name.
+        rest_host (str): Base host for all REST APIs
+        candlepin_host (str): Host of targed Candlepin
+    """
+    HOSTS[name] = (rest_host, candlepin_host)
 
 
 class Ethel:
@@ -15,17 +41,250 @@ class Ethel:
             candlepin_host (str): Host of targed Candlepin
             rest_host (str): Base host for all REST APIs
         """
+        self.rest_host = rest_host
+        self.candlepin_host = candlepin_host
         self.api = initialize_apis(rest_host, candlepin_host)
+        self.backend: Optional[SimulatedBackend] = None
+
+    @classmethod
+    def stage(cls, prewarm: bool = False) -> "Ethel":
+        """Returns Ethel instance for Stage environment.
+
+        Args:
+            prewarm (bool, optional): Open connections to all hosts. Defaults to False.
+        """
+        return cls.environment("stage", prewarm)
+
+    @classmethod
+    def qa(cls, prewarm: bool = False) -> "Ethel":  # pylint: disable=invalid-name
+        """Returns Ethel instance for QA environment.
+
+        Args:
+            prewarm (bool, optional): Open connections to all hosts. Defaults to False.
+        """
+        return cls.environment("qa", prewarm)
+
+    def prewarm(self, connections: int = 1) -> Dict[str, Optional[Exception]]:
+        """Open connections to all backend services concurrently.
+
+        DNS lookups, TCP and TLS handshakes are done upfront and the connections are
+        kept idle in the connection pools, so the first requests don't pay for them.
+        Failures are reported, not raised.
+
+        Args:
+            connections (int, optional): Connections to open per service. Keep it at
+                most the number of expected concurrent requests. Defaults to 1.
+
+        Raises:
+            ValueError: Less than one connection per service.
+
+        Returns:
+            Dict[str, Optional[Exception]]: Error by service name, None if the
+                connection was opened.
+        """
+        if connections < 1:
+            raise ValueError(f"At least one connection is needed, got {connections}")
+
+        clients = self.api.clients()
+        targets = [service for service in clients for _ in range(connections)]
+
+        def warm(service: str) -> Optional[Exception]:
+            try:
+                clients[service].api.prewarm()
+                return None
+            except Exception as e:  # pylint: disable=broad-except
+                return e
+
+        errors = map_concurrently(warm, targets, concurrency=len(targets))
+        outcome: Dict[str, Optional[Exception]] = dict.fromkeys(clients)
+        for service, error in zip(targets, errors):
+            outcome[service] = outcome[service] or error
+        return outcome
+
+    def rate_limit(self, **limiters: RateLimiter) -> None:
+        """Limit request rate per backend service.
+
+        Examples:
+        >>> ethel.rate_limit(user=RateLimiter(rate=10), candlepin=RateLimiter(rate=50))
+
+        Args:
+            **limiters (RateLimiter): Rate limiter by service name. Supported services
+                are "candlepin", "user", "regnum", "activation" and "terms".
+
+        Raises:
+            ValueError: Unknown service name.
+        """
+        clients = self.api.clients()
+        unknown = set(limiters) - set(clients)
+        if unknown:
+            raise ValueError(f"Unknown services {unknown}")
+
+        for service, limiter in limiters.items():
+            clients[service].api.limiter = limiter
+
+    def set_timeouts(
+        self, timeout: Tuple[float, float] = None, **timeouts: Tuple[float, float]
+    ) -> None:
+        """Set connect and read timeouts of requests, per backend service.
+
+        Examples:
+        >>> ethel.set_timeouts((5, 30), candlepin=(5, 120))
+
+        Args:
+            timeout (Tuple[float, float], optional): Connect and read timeout in
+                seconds for all services. Defaults to None (keep current timeouts).
+            **timeouts (Tuple[float, float]): Connect and read timeout by service
+                name. Supported services are "candlepin", "user", "regnum",
+                "activation" and "terms".
+
+        Raises:
+            ValueError: Unknown service name.
+        """
+        clients = self.api.clients()
+        unknown = set(timeouts) - set(clients)
+        if unknown:
+            raise ValueError(f"Unknown services {unknown}")
+
+        for service, client in clients.items():
+            client.api.timeout = timeouts.get(service, timeout or client.api.timeout)
+
+    def use_transport(self, name: str, services: Iterable[str] = None) -> None:
+        """Send requests by another HTTP transport.
+
+        "requests" (default) supports everything requests does, "urllib3" skips
+        requests' per-request overhead and "http2" multiplexes concurrent requests to
+        a host over a single HTTP/2 connection (requires httpx[http2]). Switch
+        transports before sending requests.
+
+        Examples:
+        >>> ethel.use_transport("http2", services=["candlepin"])
+
+        Args:
+            name (str): Transport name: "requests", "urllib3" or "http2".
+            services (Iterable[str], optional): Services to switch. Defaults to None
+                (all services).
+
+        Raises:
+            ValueError: Unknown transport or service, or a simulated instance, which
+                needs the "requests" transport.
+            ImportError: Transport dependencies are not installed.
+        """
+        if self.backend is not None and name != "requests":
+            raise ValueError("Simulated backend requires the 'requests' transport")
+
+        clients = self.api.clients()
+        unknown = set(services or ()) - set(clients)
+        if unknown:
+            raise ValueError(f"Unknown services {unknown}")
+
+        for service in services or clients:
+            clients[service].api.use_transport(name)
+
+    def enable_circuit_breakers(
+        self, failure_threshold: int = 5, reset_timeout: float = 30
+    ) -> None:
+        """Fail fast when a backend is down.
+
+        Guards every API by a circuit breaker shared by all sessions using the same base
+        URL and thresholds. Requests to an API with an open circuit raise
+        CircuitOpenError (an EthelConnectionError) immediately instead of waiting for
+        connection timeouts.
+
+        Args:
+            failure_threshold (int, optional): Consecutive failures needed to open the
+                circuit. Defaults to 5.
+            reset_timeout (float, optional): Seconds before a trial request is allowed.
+                Defaults to 30.
+        """
+        for client in self.api.clients().values():
+            client.api.breaker = get_circuit_breaker(
+                client.api.api_base_url, failure_threshold, reset_timeout
+            )
+
+    def enable_hedging(
+        self,
+        percentile: float = 0.95,
+        max_extra: float = 0.05,
+        services: Iterable[str] = ("user", "candlepin"),
+    ) -> None:
+        """Hedge slow idempotent lookups.
+
+        Lookups (user login, Candlepin owners and jobs) which don't respond within
+        a latency percentile learned from recent lookups are sent once more and the
+        first response is used.
+
+        Args:
+            percentile (float, optional): Latency percentile after which a duplicate
+                request is sent. Defaults to 0.95.
+            max_extra (float, optional): Maximal ratio of duplicate requests to all
+                hedgeable requests. Defaults to 0.05.
+            services (Iterable[str], optional): Services to hedge lookups for.
+                Defaults to ("user", "candlepin").
+
+        Raises:
+            ValueError: Unknown service name.
+        """
+        clients = self.api.clients()
+        unknown = set(services) - set(clients)
+        if unknown:
+            raise ValueError(f"Unknown services {unknown}")
+
+        for service in services:
+            clients[service].api.hedger = Hedger(percentile, max_extra)
 
     @classmethod
-    def stage(cls) -> "Ethel":
-        """Returns Ethel instance for Stage environment."""
-        return cls(*HOSTS["stage"])
+    def environment(cls, name: str, prewarm: bool = False) -> "Ethel":
+        """Returns Ethel instance for a registered environment.
+
+        Args:
+            name (str): Environment name, e.g. "stage" or "qa".
+            prewarm (bool, optional): Open connections to all hosts. Defaults to False.
+
+        Raises:
+            ValueError: Unknown environment.
+        """
+        if name not in HOSTS:
+            raise ValueError(f"Unknown environment '{name}'")
+        ethel = cls(*HOSTS[name])
+        if prewarm:
+            ethel.prewarm()
+        return ethel
+
+    @staticmethod
+    def multi(environments: Iterable[str]) -> MultiEthel:
+        """Returns Ethel for multiple environments at once.
+
+        Operations on the returned object run concurrently in all environments and
+        results are reported per environment.
+
+        Examples:
+        >>> multi = Ethel.multi(["stage", "qa"])
+        >>> account = multi.create_account("username", "password")
+        >>> account.subscribe("product_sku").results
+        {'stage': 123, 'qa': 456}
+
+        Args:
+            environments (Iterable[str]): Registered environment names.
+        """
+        return MultiEthel({name: Ethel.environment(name) for name in environments})
 
     @classmethod
-    def qa(cls) -> "Ethel":  # pylint: disable=invalid-name
-        """Returns Ethel instance for QA environment."""
-        return cls(*HOSTS["qa"])
+    def simulated(cls, backend: SimulatedBackend = None) -> "Ethel":
+        """Returns Ethel instance backed by an in-process simulation.
+
+        No request leaves the process, yet the whole client code runs as usual.
+
+        Args:
+            backend (SimulatedBackend, optional): Simulated backend to use, can be
+                shared by multiple instances. Defaults to a new backend.
+        """
+        ethel = cls(*SIMULATED_HOSTS)
+        ethel.backend = backend or SimulatedBackend()
+        adapter = SimulatedAdapter(ethel.backend)
+        for client in ethel.api.clients().values():
+            client.api.mount("http://", adapter)
+            client.api.mount("https://", adapter)
+        return ethel
 
     def create_account(self, *args, **kwargs) -> Account:
         """Creates a new account.
@@ -37,3 +296,179 @@ class Ethel:
             Account: Account object.
         """
         return Account(self.api, *args, **kwargs)
+
+    def bulk_create_accounts(
+        self,
+        specs: Iterable[dict],
+        processes: int = None,
+        shard_size: int = 1,
+        progress: Callable[[int, int, ProvisioningResult], None] = None,
+    ) -> Iterator[ProvisioningResult]:
+        """Creates many accounts in parallel worker processes.
+
+        Workers use the timeouts, transports, rate limiters, circuit breakers and
+        hedging of this instance. Rate limits apply to each worker process separately.
+        See ethel.bulk.provision for details.
+
+        Args:
+            specs (Iterable[dict]): Account arguments, one dict per account.
+            processes (int, optional): Number of worker processes. Defaults to None
+                (number of CPUs).
+            shard_size (int, optional): Number of accounts sent to a worker at once.
+                Defaults to 1.
+            progress (Callable[[int, int, ProvisioningResult], None], optional):
+                Progress callback. Defaults to None.
+
+        Raises:
+            ValueError: Simulated instance, its backend can't be shared with worker
+                processes.
+
+        Returns:
+            Iterator[ProvisioningResult]: Results in order of completion.
+        """
+        if self.backend is not None:
+            raise ValueError("Simulated backend can't be used by bulk provisioning")
+
+        return provision(
+            self.rest_host,
+            self.candlepin_host,
+            specs,
+            processes=processes,
+            shard_size=shard_size,
+            progress=progress,
+            settings=api_settings(self.api),
+        )
+
+    @staticmethod
+    def scan_pools(  # pylint: disable=dangerous-default-value,too-many-arguments
+        accounts: Iterable[Account],
+        concurrency: int = 8,
+        future: bool = False,
+        sku: str = None,
+        active_on: Union[datetime, date, str] = None,
+        matches: str = None,
+        attributes: Dict[str, str] = None,
+        where: Callable[[dict], bool] = None,
+        skip_empty: bool = False,
+        filter_attributes: dict = Account.POOL_ATTRIBUTES_MAPPING,
+    ) -> Iterator[AccountPools]:
+        """Lists pools of many accounts concurrently, streaming the results.
+
+        See ethel.inventory.scan_pools for details.
+
+        Examples:
+        >>> for result in Ethel.scan_pools(accounts, concurrency=32, skip_empty=True):
+        ...     print(result.account.username, result.pools)
+
+        Args:
+            accounts (Iterable[Account]): Accounts to scan.
+            concurrency (int, optional): Maximal number of concurrent requests.
+                Defaults to 8.
+            future (bool, optional): Include also pools available in future.
+                Defaults to False.
+            sku (str, optional): Product ID (SKU) of the pools. Defaults to None.
+            active_on (Union[datetime, date, str], optional): Pools active on this
+                date. Defaults to None.
+            matches (str, optional): Pools whose product ID, name or attributes match
+                this string. Defaults to None.
+            attributes (Dict[str, str], optional): Pools with these attribute values.
+                Defaults to None.
+            where (Callable[[dict], bool], optional): Keep only mapped pools passing
+                this predicate. Defaults to None.
+            skip_empty (bool, optional): Don't yield accounts without any (matching)
+                pools. Defaults to False.
+            filter_attributes (dict, optional): Mapping of pool attributes, see
+                Account.list_pools. Defaults to Account.POOL_ATTRIBUTES_MAPPING
+
+        Returns:
+            Iterator[AccountPools]: Pools of each account, in order of completion.
+        """
+        return scan_pools(
+            accounts,
+            concurrency=concurrency,
+            future=future,
+            sku=sku,
+            active_on=active_on,
+            matches=matches,
+            attributes=attributes,
+            where=where,
+            skip_empty=skip_empty,
+            filter_attributes=filter_attributes,
+        )
+
+    @staticmethod
+    def export_pools(
+        accounts: Iterable[Account],
+        path: Union[str, Path],
+        file_format: str = None,
+        concurrency: int = 8,
+        chunk_size: int = 10000,
+    ) -> ExportReport:
+        """Exports pools of many accounts into a CSV, JSON lines, Arrow or Parquet file.
+
+        Pools are scanned concurrently (see Ethel.scan_pools) and written in chunks
+        as they arrive. See ethel.export.export_pools for details.
+
+        Examples:
+        >>> print(Ethel.export_pools(accounts, "pools.parquet", concurrency=32))
+        Exported 123456 pools, 0 accounts failed.
+
+        Args:
+            accounts (Iterable[Account]): Accounts to export pools of.
+            path (Union[str, Path]): File to write.
+            file_format (str, optional): One of "csv", "jsonl", "arrow" and "parquet".
+                Defaults to None (inferred from the file suffix).
+            concurrency (int, optional): Maximal number of concurrent requests.
+                Defaults to 8.
+            chunk_size (int, optional): Number of rows written at once. Defaults to
+                10000.
+
+        Returns:
+            ExportReport: Number of exported pools and errors of accounts whose pools
+                couldn't be listed.
+        """
+        return export_pools(
+            scan_pools(accounts, concurrency=concurrency),
+            path,
+            file_format=file_format,
+            chunk_size=chunk_size,
+        )
+
+    @staticmethod
+    def teardown(
+        accounts: Iterable[Account],
+        expired_only: bool = True,
+        concurrency: int = 4,
+        rate: float = None,
+        today: Union[datetime, date, str] = None,
+    ) -> TeardownReport:
+        """Removes expired pools or retires accounts concurrently.
+
+        See ethel.teardown.teardown for details.
+
+        Examples:
+        >>> report = Ethel.teardown(accounts, concurrency=8, rate=20)
+        >>> print(report)
+        Deleted 42 pools, retired 0/10 accounts, 0 accounts failed.
+
+        Args:
+            accounts (Iterable[Account]): Accounts to clean up.
+            expired_only (bool, optional): Delete only expired pools and keep the
+                accounts. Defaults to True.
+            concurrency (int, optional): Maximal number of concurrent requests.
+                Defaults to 4.
+            rate (float, optional): Maximal number of deletions per second. Defaults
+                to None (unlimited).
+            today (Union[datetime, date, str], optional): Pools ending before this
+                date are expired. Defaults to None (today).
+
+        Returns:
+            TeardownReport: Outcome for each account.
+        """
+        return teardown(
+            accounts,
+            expired_only=expired_only,
+            concurrency=concurrency,
+            rate=rate,
+            today=today,
+        )
@@ -0,0 +1,226 @@
+"""Pool inventory export
+
+Write pool inventories of many accounts into column-oriented files, chunk by chunk, so
+they can be queried by analytics tools. CSV and JSON lines are always available, Arrow
+and Parquet need pyarrow.
+"""
+import csv
+import json
+from dataclasses import dataclass, field
+from itertools import islice
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Sequence, Union
+
+from .account import Account
+from .inventory import AccountPools
+
+try:
+    import pyarrow  # type: ignore
+    import pyarrow.ipc  # type: ignore
+    import pyarrow.parquet  # type: ignore
+except ImportError:  # pragma: no cover
+    pyarrow = None
+
+# Columns of exported rows: the account and POOL_ATTRIBUTES_MAPPING attributes
+COLUMNS = ("username", "owner_id", *Account.POOL_ATTRIBUTES_MAPPING)
+
+# Arrow types of non-string columns
+ARROW_TYPES = dict(muiltiplier="int64", quantity="float64", instance_multiplier="int64")
+
+# File formats by file suffix
+SUFFIXES = {
+    ".csv": "csv",
+    ".jsonl": "jsonl",
+    ".arrow": "arrow",
+    ".feather": "arrow",
+    ".parquet": "parquet",
+}
+
+Row = Dict[str, Any]
+
+
+@dataclass
+class ExportReport:
+    rows: int = 0
+    errors: Dict[str, Exception] = field(default_factory=dict)
+
+    @property
+    def ok(self) -> bool:  # pylint: disable=invalid-name
+        """Pools of all accounts were exported."""
+        return not self.errors
+
+    def __str__(self):
+        return f"Exported {self.rows} pools, {len(self.errors)} accounts failed."
+
+
+def pool_rows(
+    results: Iterable[AccountPools], errors: Dict[str, Exception] = None
+) -> Iterator[Row]:
+    """Flatten pools of accounts into rows.
+
+    Failed accounts are skipped.
+
+    Args:
+        results (Iterable[AccountPools]): Pools of each account, see
+            ethel.inventory.scan_pools.
+        errors (Dict[str, Exception], optional): Collect errors of failed accounts
+            by username into this dict. Defaults to None.
+
+    Yields:
+        Row: Pool attributes with the account's username and owner ID.
+    """
+    for result in results:
+        if not result.ok:
+            if errors is not None:
+                errors[result.account.username] = result.error  # type: ignore
+            continue
+        account = dict(username=result.account.username, owner_id=result.account.owner_id)
+        for pool in result.pools:
+            yield {**account, **pool}
+
+
+def chunks(rows: Iterable[Row], size: int) -> Iterator[List[Row]]:
+    """Split rows into lists of at most size rows."""
+    iterator = iter(rows)
+    chunk = list(islice(iterator, size))
+    while chunk:
+        yield chunk
+        chunk = list(islice(iterator, size))
+
+
+class _CSVWriter:
+    def __init__(self, path: Path, columns: Sequence[str]) -> None:
+        self.file = path.open("w", newline="")
+        self.writer = csv.DictWriter(self.file, columns, extrasaction="ignore")
+        self.writer.writeheader()
+
+    def write(self, rows: List[Row]) -> None:
+        """Append rows to the file."""
+        self.writer.writerows(rows)
+
+    def close(self) -> None:
+        """Close the file."""
+        self.file.close()
+
+
+class _JSONLWriter:
+    def __init__(self, path: Path, columns: Sequence[str]) -> None:
+        self.file = path.open("w")
+        self.columns = columns
+
+    def write(self, rows: List[Row]) -> None:
+        """Append rows to the file, one JSON object per line."""
+        self.file.writelines(
+            json.dumps({column: row.get(column) for column in self.columns}) + "\n"
+            for row in rows
+        )
+
+    def close(self) -> None:
+        """Close the file."""
+        self.file.close()
+
+
+class _ArrowWriter:
+    def __init__(self, path: Path, columns: Sequence[str]) -> None:
+        self.columns = columns
+        self.schema = pyarrow.schema(
+            [(column, ARROW_TYPES.get(column, "string")) for column in columns]
+        )
+        self.writer = self._open(path)
+
+    def _open(self, path: Path):
+        return pyarrow.ipc.new_file(str(path), self.schema)
+
+    def _value(self, column: str, value: Any) -> Any:
+        """Convert a value to the column's Arrow type."""
+        if value is None:
+            return None
+        if column == "quantity":
+            # Unlimited quantity is a string in pool mappings
+            return float("inf") if value == "unlimited" else value
+        return value if column in ARROW_TYPES else str(value)
+
+    def batch(self, rows: List[Row]):
+        """Convert rows into a record batch."""
+        arrays = [
+            pyarrow.array(
+                [self._value(column, row.get(column)) for row in rows],
+                type=self.schema.field(column).type,
+            )
+            for column in self.columns
+        ]
+        return pyarrow.RecordBatch.from_arrays(arrays, schema=self.schema)
+
+    def write(self, rows: List[Row]) -> None:
+        """Append rows to the file as a record batch."""
+        self.writer.write_batch(self.batch(rows))
+
+    def close(self) -> None:
+        """Finish and close the file."""
+        self.writer.close()
+
+
+class _ParquetWriter(_ArrowWriter):
+    def _open(self, path: Path):
+        return pyarrow.parquet.ParquetWriter(str(path), self.schema)
+
+    def write(self, rows: List[Row]) -> None:
+        self.writer.write_table(pyarrow.Table.from_batches([self.batch(rows)]))
+
+
+WRITERS = dict(
+    csv=_CSVWriter, jsonl=_JSONLWriter, arrow=_ArrowWriter, parquet=_ParquetWriter
+)
+
+
+def export_pools(
+    results: Iterable[AccountPools],
+    path: Union[str, Path],
+    file_format: str = None,
+    chunk_size: int = 10000,
+    columns: Sequence[str] = COLUMNS,
+) -> ExportReport:
+    """Export pools of accounts into a file.
+
+    Rows are written in chunks as results arrive, so only a single chunk is kept in
+    memory. Arrow and Parquet files are typed: integers and quantities are numbers
+    (unlimited quantity is infinity), other columns are strings. Accounts whose pools
+    couldn't be listed are reported, not exported.
+
+    Examples:
+    >>> results = Ethel.scan_pools(accounts, concurrency=32)
+    >>> print(export_pools(results, "pools.parquet"))
+    Exported 123456 pools, 0 accounts failed.
+
+    Args:
+        results (Iterable[AccountPools]): Pools of each account, see
+            ethel.inventory.scan_pools.
+        path (Union[str, Path]): File to write.
+        file_format (str, optional): One of "csv", "jsonl", "arrow" and "parquet".
+            Defaults to None (inferred from the file suffix).
+        chunk_size (int, optional): Number of rows written at once. Defaults to 10000.
+        columns (Sequence[str], optional): Columns to export. Defaults to COLUMNS.
+
+    Raises:
+        ValueError: Unknown file format.
+        ImportError: Arrow or Parquet format requested without pyarrow installed.
+
+    Returns:
+        ExportReport: Number of exported rows and errors of failed accounts.
+    """
+    path = Path(path)
+    file_format = file_format or SUFFIXES.get(path.suffix)
+    if file_format not in WRITERS:
+        raise ValueError(f"Unknown export format of '{path}'")
+    if file_format in ("arrow", "parquet") and pyarrow is None:
+        raise ImportError(f"Export to {file_format} requires pyarrow")
+
+    report = ExportReport()
+    writer = WRITERS[file_format](path, columns)
+    try:
+        for chunk in chunks(pool_rows(results, report.errors), chunk_size):
+            writer.write(chunk)
+            report.rows += len(chunk)
+    finally:
+        writer.close()
+    return report
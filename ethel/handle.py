@@ -0,0 +1,119 @@
+"""Account handles
+
+Lightweight, picklable references to provisioned accounts, which can be sent to other
+processes or machines and rebuilt into live accounts there without any requests.
+"""
+import os
+import threading
+from dataclasses import asdict, dataclass, field
+from typing import Dict, Optional, Tuple
+
+from .account import Account
+from .api import API, initialize_apis
+
+# API clients shared by all handles opened in this process, keyed by hosts
+_APIS: Dict[Tuple[str, str], API] = {}
+_APIS_LOCK = threading.Lock()
+
+
+def get_api(rest_host: str, candlepin_host: str) -> API:
+    """Get API clients shared by this process.
+
+    Args:
+        rest_host (str): Base host for all REST APIs
+        candlepin_host (str): Host of targed Candlepin
+
+    Returns:
+        API: API clients, created on first use.
+    """
+    with _APIS_LOCK:
+        if (rest_host, candlepin_host) not in _APIS:
+            _APIS[rest_host, candlepin_host] = initialize_apis(rest_host, candlepin_host)
+        return _APIS[rest_host, candlepin_host]
+
+
+@dataclass(frozen=True)
+class AccountHandle:
+    rest_host: str
+    candlepin_host: str
+    username: str
+    password: Optional[str] = field(default=None, repr=False)
+    password_env: Optional[str] = None
+    org_id: Optional[int] = None
+    owner_id: Optional[int] = None
+
+    @classmethod
+    def from_account(
+        cls, account: Account, password_env: str = None
+    ) -> "AccountHandle":
+        """Create a handle of an account.
+
+        Cached organization and owner IDs are kept, so they don't have to be looked up
+        again.
+
+        Args:
+            account (Account): Account to reference.
+            password_env (str, optional): Name of an environment variable with the
+                password. If set, the password itself is not stored in the handle.
+                Defaults to None.
+
+        Raises:
+            ValueError: Account's API doesn't know its hosts.
+
+        Returns:
+            AccountHandle: Account handle.
+        """
+        if account.api.hosts is None:
+            raise ValueError("Account API hosts are unknown")
+
+        # pylint: disable=protected-access
+        return cls(
+            *account.api.hosts,
+            username=account.username,
+            password=None if password_env else account.password,
+            password_env=password_env,
+            org_id=account._org_id,
+            owner_id=account._owner_id,
+        )
+
+    def resolve_password(self) -> str:
+        """The account's password.
+
+        Raises:
+            ValueError: Password environment variable is not set.
+
+        Returns:
+            str: Password stored in the handle or read from the environment.
+        """
+        if self.password_env is None:
+            return self.password  # type: ignore
+        if self.password_env not in os.environ:
+            raise ValueError(f"Environment variable {self.password_env} is not set")
+        return os.environ[self.password_env]
+
+    def open(self, api: API = None) -> Account:
+        """Rebuild a live account, without any requests.
+
+        Args:
+            api (API, optional): API clients to use. Defaults to clients shared by
+                all handles with the same hosts in this process.
+
+        Returns:
+            Account: Account object.
+        """
+        return Account.restore(
+            api or get_api(self.rest_host, self.candlepin_host),
+            self.username,
+            self.resolve_password(),
+            org_id=self.org_id,
+            owner_id=self.owner_id,
+        )
+
+    def as_dict(self) -> dict:
+        """Convert to a JSON serializable dict."""
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, record: dict) -> "AccountHandle":
+        """Create from a dict produced by as_dict."""
+        return cls(**record)
@@ -0,0 +1,142 @@
+"""Pool inventory
+
+List pools of many accounts concurrently and stream the results as they arrive.
+"""
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextlib import closing
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from functools import partial
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Union
+
+from .account import Account
+from .api.deadline import propagate
+
+
+@dataclass
+class AccountPools:
+    account: Account
+    pools: List[dict] = field(default_factory=list)
+    error: Optional[Exception] = None
+
+    @property
+    def ok(self) -> bool:  # pylint: disable=invalid-name
+        """Pools of this account were listed successfully."""
+        return self.error is None
+
+
+def scan_pools(  # pylint: disable=dangerous-default-value,too-many-arguments
+    accounts: Iterable[Account],
+    concurrency: int = 8,
+    future: bool = False,
+    sku: str = None,
+    active_on: Union[datetime, date, str] = None,
+    matches: str = None,
+    attributes: Dict[str, str] = None,
+    where: Callable[[dict], bool] = None,
+    skip_empty: bool = False,
+    filter_attributes: dict = Account.POOL_ATTRIBUTES_MAPPING,
+) -> Iterator[AccountPools]:
+    """List pools of many accounts concurrently.
+
+    Each account resolves its owner ID and lists its pools on a bounded thread pool.
+    Results are yielded in order of completion, as soon as they arrive, and accounts are
+    consumed lazily, so at most a few more than concurrency accounts are in flight.
+    Closing the iterator early cancels the accounts not started yet. Failures are
+    reported in the results instead of being raised.
+
+    Filters are applied as early as possible: sku, active_on, matches and attributes
+    are sent to Candlepin (see Account.find_pools), so only matching pools are
+    transferred; where is applied to each mapped pool in the worker thread.
+
+    Examples:
+    >>> for result in scan_pools(accounts, concurrency=32, sku="SKU_A"):
+    ...     print(result.account.username, len(result.pools))
+
+    Args:
+        accounts (Iterable[Account]): Accounts to scan.
+        concurrency (int, optional): Maximal number of concurrent requests.
+            Defaults to 8.
+        future (bool, optional): Include also pools available in future. Ignored when
+            any server-side filter is set, see Account.find_pools. Defaults to False.
+        sku (str, optional): Product ID (SKU) of the pools. Defaults to None.
+        active_on (Union[datetime, date, str], optional): Pools active on this date.
+            Defaults to None.
+        matches (str, optional): Pools whose product ID, name or attributes match this
+            string, "*" and "?" are wildcards. Defaults to None.
+        attributes (Dict[str, str], optional): Pools with these attribute values.
+            Defaults to None.
+        where (Callable[[dict], bool], optional): Keep only mapped pools passing this
+            predicate. Defaults to None.
+        skip_empty (bool, optional): Don't yield accounts without any (matching) pools.
+            Failed accounts are yielded anyway. Defaults to False.
+        filter_attributes (dict, optional): Mapping of pool attributes, see
+            Account.list_pools. Defaults to Account.POOL_ATTRIBUTES_MAPPING
+
+    Yields:
+        AccountPools: Pools of each account, in order of completion.
+    """
+    filters = dict(sku=sku, active_on=active_on, matches=matches, attributes=attributes)
+    scan = partial(
+        _scan,
+        filters=filters if any(f is not None for f in filters.values()) else None,
+        future=future,
+        where=where,
+        filter_attributes=filter_attributes,
+    )
+    with closing(_as_completed(scan, accounts, concurrency)) as results:
+        for result in results:
+            if result.ok and skip_empty and not result.pools:
+                continue
+            yield result
+
+
+def _scan(
+    account: Account,
+    filters: Optional[dict],
+    future: bool,
+    where: Optional[Callable[[dict], bool]],
+    filter_attributes: dict,
+) -> AccountPools:
+    """List pools of a single account, record a failure into the result."""
+    result = AccountPools(account)
+    try:
+        if filters is not None:
+            pools = account.find_pools(**filters, filter_attributes=filter_attributes)
+        else:
+            pools = account.list_pools(future=future, filter_attributes=filter_attributes)
+        result.pools = [pool for pool in pools if where is None or where(pool)]
+    except Exception as e:  # pylint: disable=broad-except
+        result.error = e
+    return result
+
+
+def _as_completed(
+    func: Callable[[Account], AccountPools], accounts: Iterable[Account], concurrency: int
+) -> Iterator[AccountPools]:
+    """Call func for each account on a thread pool, yield results as they complete.
+
+    Accounts are consumed lazily, at most 2 * concurrency calls are in flight. Closing
+    the iterator cancels calls not started yet.
+    """
+    pending = iter(accounts)
+    running: Set[Future] = set()
+    executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="ethel")
+    task = propagate(func)
+    try:
+        while True:
+            # Keep the pool busy without consuming all accounts upfront
+            for account in pending:
+                running.add(executor.submit(task, account))
+                if len(running) >= 2 * concurrency:
+                    break
+            if not running:
+                return
+
+            done, running = wait(running, return_when=FIRST_COMPLETED)
+            for completed in done:
+                yield completed.result()
+    finally:
+        for pending_future in running:
+            pending_future.cancel()
+        executor.shutdown(wait=True)
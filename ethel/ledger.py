@@ -0,0 +1,178 @@
+import json
+import threading
+import uuid
+from collections import deque
+from datetime import date, timedelta
+from typing import IO, Deque, Iterator, List, Optional
+
+
+class Subscription:
+    __slots__ = (
+        "sku_id",
+        "quantity",
+        "reg_number",
+        "activation_id",
+        "start_date",
+        "duration",
+    )
+
+    def __init__(
+        self,
+        sku_id: str,
+        quantity: int,
+        reg_number: int,
+        activation_id: int,
+        start_date: date,
+        duration: int,
+    ) -> None:
+        """Subscription record.
+
+        Key facts about an ordered and activated subscription.
+
+        Args:
+            sku_id (str): SKU identifier.
+            quantity (int): SKU quantity.
+            reg_number (int): Registration number from the order system.
+            activation_id (int): Activation ID.
+            start_date (date): Start date of the subscription.
+            duration (int): Subscription duration in days.
+        """
+        self.sku_id = sku_id
+        self.quantity = quantity
+        self.reg_number = reg_number
+        self.activation_id = activation_id
+        self.start_date = start_date
+        self.duration = duration
+
+    @property
+    def end_date(self) -> date:
+        """End date of the subscription."""
+        return self.start_date + timedelta(days=self.duration)
+
+    def as_dict(self) -> dict:
+        """Convert to a JSON serializable dict."""
+        record = {attr: getattr(self, attr) for attr in self.__slots__}
+        record["start_date"] = self.start_date.isoformat()
+        return record
+
+    @classmethod
+    def from_dict(cls, record: dict) -> "Subscription":
+        """Create from a dict produced by as_dict."""
+        return cls(**dict(record, start_date=date.fromisoformat(record["start_date"])))
+
+    def __eq__(self, other):
+        if not isinstance(other, Subscription):
+            return NotImplemented
+        return all(getattr(self, a) == getattr(other, a) for a in self.__slots__)
+
+    def __repr__(self):
+        attrs = ", ".join(f"{a}={getattr(self, a)!r}" for a in self.__slots__)
+        return f"Subscription({attrs})"
+
+
+class Ledger:
+    def __init__(self, max_records: int = None, spill_path: str = None) -> None:
+        """Subscription ledger.
+
+        Keeps subscription records of an account. Retention can be bounded, in which
+        case the oldest records are dropped, or appended to a JSON lines file if
+        spill_path is set. The file may be shared, only records spilled by this ledger
+        are read back.
+
+        Args:
+            max_records (int, optional): Maximal number of records kept in memory.
+                Defaults to None (unbounded).
+            spill_path (str, optional): File to append records evicted from memory
+                to. Defaults to None (evicted records are dropped).
+        """
+        self.max_records = max_records
+        self.spill_path = spill_path
+        self.spilled = 0
+        self._id = uuid.uuid4().hex
+        self._spill_start = 0
+        self._records: Deque[Subscription] = deque()
+        self._lock = threading.Lock()
+
+    def add(self, record: Subscription) -> None:
+        """Add a record, evict the oldest one if over capacity.
+
+        Args:
+            record (Subscription): Record to add.
+        """
+        with self._lock:
+            self._records.append(record)
+            if self.max_records is None or len(self._records) <= self.max_records:
+                return
+
+            evicted = self._records.popleft()
+            if self.spill_path:
+                with open(self.spill_path, "a", encoding="utf-8") as spill:
+                    if not self.spilled:
+                        self._spill_start = spill.tell()
+                    record = dict(evicted.as_dict(), ledger=self._id)
+                    spill.write(json.dumps(record) + "\n")
+                self.spilled += 1
+
+    def records(self, include_spilled: bool = False) -> Iterator[Subscription]:
+        """Iterate over records, oldest first.
+
+        Args:
+            include_spilled (bool, optional): Read also records spilled to disk.
+                Defaults to False.
+
+        Yields:
+            Subscription: Subscription records.
+        """
+        if include_spilled and self.spilled:
+            with open(self.spill_path, "r", encoding="utf-8") as spill:  # type: ignore
+                # Skip records spilled before this ledger and by other ledgers
+                spill.seek(self._spill_start)
+                for line in spill:
+                    record = json.loads(line)
+                    if record.pop("ledger", None) == self._id:
+                        yield Subscription.from_dict(record)
+
+        with self._lock:
+            records = list(self._records)
+        yield from records
+
+    def by_sku(self, sku_id: str, include_spilled: bool = False) -> List[Subscription]:
+        """Find records by SKU.
+
+        Args:
+            sku_id (str): SKU identifier.
+            include_spilled (bool, optional): Search also records spilled to disk.
+                Defaults to False.
+
+        Returns:
+            List[Subscription]: Matching records, oldest first.
+        """
+        return [r for r in self.records(include_spilled) if r.sku_id == sku_id]
+
+    def latest(self) -> Optional[Subscription]:
+        """The most recent record, None if empty."""
+        with self._lock:
+            return self._records[-1] if self._records else None
+
+    def export(self, target: IO[str], include_spilled: bool = True) -> int:
+        """Write records as JSON lines.
+
+        Args:
+            target (IO[str]): Open text file to write to.
+            include_spilled (bool, optional): Export also records spilled to disk.
+                Defaults to True.
+
+        Returns:
+            int: Number of exported records.
+        """
+        count = 0
+        for record in self.records(include_spilled):
+            target.write(json.dumps(record.as_dict()) + "\n")
+            count += 1
+        return count
+
+    def __len__(self):
+        return len(self._records)
+
+    def __iter__(self):
+        return self.records()
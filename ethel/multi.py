@@ -0,0 +1,116 @@
+"""Multi-environment fan-out
+
+Run the same account operations against multiple environments concurrently.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Callable, Dict, TypeVar
+
+from .account import Account
+from .api.deadline import propagate
+
+if TYPE_CHECKING:
+    from .ethel import Ethel  # pylint: disable=cyclic-import
+
+T = TypeVar("T")
+
+
+@dataclass
+class EnvironmentResults:
+    results: Dict[str, Any] = field(default_factory=dict)
+    errors: Dict[str, Exception] = field(default_factory=dict)
+
+    @property
+    def ok(self) -> bool:  # pylint: disable=invalid-name
+        """Operation succeeded in all environments."""
+        return not self.errors
+
+    def raise_for_errors(self) -> None:
+        """Raise the first error, if any environment failed."""
+        for error in self.errors.values():
+            raise error
+
+
+def fan_out(
+    targets: Dict[str, T], func: Callable[[T], Any], max_workers: int = None
+) -> EnvironmentResults:
+    """Call a function for each environment concurrently.
+
+    Args:
+        targets (Dict[str, T]): Function arguments by environment name.
+        func (Callable[[T], Any]): Function to call.
+        max_workers (int, optional): Maximal number of concurrent calls. Defaults to
+            None (one per environment).
+
+    Returns:
+        EnvironmentResults: Results and errors by environment name.
+    """
+    outcome = EnvironmentResults()
+    if not targets:
+        return outcome
+
+    with ThreadPoolExecutor(max_workers=max_workers or len(targets)) as executor:
+        futures = {
+            name: executor.submit(propagate(func), target)
+            for name, target in targets.items()
+        }
+
+    for name, future in futures.items():
+        error = future.exception()
+        if error is None:
+            outcome.results[name] = future.result()
+        else:
+            outcome.errors[name] = error  # type: ignore
+    return outcome
+
+
+class MultiAccount:
+    def __init__(self, accounts: Dict[str, Account], errors: Dict[str, Exception]):
+        """The same account in multiple environments.
+
+        Args:
+            accounts (Dict[str, Account]): Accounts by environment name.
+            errors (Dict[str, Exception]): Errors of environments where the account
+                couldn't be created.
+        """
+        self.accounts = accounts
+        self.errors = errors
+
+    def subscribe(self, *args, **kwargs) -> EnvironmentResults:
+        """Subscribe the account in all environments.
+
+        Accepts the same arguments as Account.subscribe.
+
+        Returns:
+            EnvironmentResults: Subscription IDs by environment name.
+        """
+        return fan_out(self.accounts, lambda account: account.subscribe(*args, **kwargs))
+
+    def __getitem__(self, environment: str) -> Account:
+        return self.accounts[environment]
+
+
+class MultiEthel:
+    def __init__(self, instances: Dict[str, "Ethel"]) -> None:
+        """Ethel for multiple environments.
+
+        Args:
+            instances (Dict[str, Ethel]): Ethel instances by environment name.
+        """
+        self.instances = instances
+
+    def create_account(self, *args, **kwargs) -> MultiAccount:
+        """Creates the same account in all environments concurrently.
+
+        Accepts the same arguments as Ethel.create_account.
+
+        Returns:
+            MultiAccount: Account in each environment it was created in.
+        """
+        outcome = fan_out(
+            self.instances, lambda ethel: ethel.create_account(*args, **kwargs)
+        )
+        return MultiAccount(outcome.results, outcome.errors)
+
+    def __getitem__(self, environment: str) -> "Ethel":
+        return self.instances[environment]
@@ -0,0 +1,74 @@
+"""Pool change detection
+
+Compare pool listings by compact per-pool fingerprints instead of full pool data.
+"""
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+Fingerprint = Tuple[Optional[str], Optional[str], Optional[int]]
+
+# Pool attributes a fingerprint is computed from
+FINGERPRINT_FIELDS = ("id", "startDate", "endDate", "quantity")
+
+
+def fingerprint(pool: dict) -> Fingerprint:
+    """Compact fingerprint of a raw pool: its dates and quantity.
+
+    Args:
+        pool (dict): Raw pool from Candlepin.
+
+    Returns:
+        Fingerprint: Pool fingerprint.
+    """
+    return pool.get("startDate"), pool.get("endDate"), pool.get("quantity")
+
+
+@dataclass(frozen=True)
+class PoolSnapshot:
+    fingerprints: Dict[str, Fingerprint] = field(default_factory=dict)
+
+    def __len__(self):
+        return len(self.fingerprints)
+
+    def __contains__(self, pool_id):
+        return pool_id in self.fingerprints
+
+
+@dataclass
+class PoolChanges:
+    added: List[dict] = field(default_factory=list)
+    changed: List[dict] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    snapshot: PoolSnapshot = field(default_factory=PoolSnapshot)
+
+    def __bool__(self):
+        return bool(self.added or self.changed or self.removed)
+
+
+def diff_pools(raw_pools: Iterable[dict], since: PoolSnapshot = None) -> PoolChanges:
+    """Compare a pool listing to a snapshot.
+
+    Args:
+        raw_pools (Iterable[dict]): Raw pools from Candlepin, each with at least the
+            FINGERPRINT_FIELDS.
+        since (PoolSnapshot, optional): Snapshot of a previous listing. Defaults to
+            None (all pools are added).
+
+    Returns:
+        PoolChanges: Added and changed raw pools, IDs of removed pools and a snapshot
+            of this listing.
+    """
+    previous = since.fingerprints if since else {}
+    changes = PoolChanges()
+    current = changes.snapshot.fingerprints
+
+    for pool in raw_pools:
+        pool_id = pool["id"]
+        current[pool_id] = fingerprint(pool)
+        if pool_id not in previous:
+            changes.added.append(pool)
+        elif previous[pool_id] != current[pool_id]:
+            changes.changed.append(pool)
+
+    changes.removed = [pool_id for pool_id in previous if pool_id not in current]
+    return changes
@@ -0,0 +1,291 @@
+"""Pytest plugin
+
+Session scoped, shared account fixtures. Mark a test with the SKUs its account needs
+and request the `ethel_account` fixture:
+
+    @pytest.mark.ethel_account(skus=["SKU_A", "SKU_B"])
+    def test_something(ethel_account):
+        ...
+
+Accounts are read-only and shared by all tests asking for the same SKUs. All accounts
+needed by the collected tests are provisioned in parallel as soon as collection
+finishes. Existing accounts are reused across runs and reset to the requested SKUs.
+
+With pytest-xdist, each account is provisioned by a single worker chosen by a stable
+hash of its SKUs. The worker publishes an account handle to a directory shared by the
+test run and the other workers open it without any requests. Handles don't contain
+the password, all workers get it from their options.
+
+Outside of the simulated environment, a username prefix unique to the project and a
+password are required, so projects sharing an environment don't share accounts.
+"""
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import replace
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+import pytest  # type: ignore
+
+from .account import Account
+from .ethel import Ethel
+from .handle import AccountHandle
+from .utils import wait_for
+
+Key = Tuple[str, ...]
+
+
+def spec_key(skus: Iterable[str]) -> Key:
+    """Key of an account spec, independent of the SKU order."""
+    return tuple(sorted(skus))
+
+
+def spec_hash(key: Key) -> str:
+    """Stable short hash of an account spec."""
+    return hashlib.sha1("\n".join(key).encode()).hexdigest()[:10]
+
+
+class AccountPool:
+    def __init__(
+        self,
+        ethel: Ethel,
+        prefix: str,
+        password: str,
+        worker: str = "main",
+        worker_count: int = 1,
+        shared_dir: Path = None,
+        concurrency: int = 8,
+        timeout: float = 600,
+    ) -> None:
+        """Shared accounts, provisioned once per test session.
+
+        Args:
+            ethel (Ethel): Ethel instance to provision accounts with.
+            prefix (str): Username prefix.
+            password (str): Password of all accounts.
+            worker (str, optional): Name of this worker. Defaults to "main".
+            worker_count (int, optional): Number of workers. Defaults to 1.
+            shared_dir (Path, optional): Directory shared by all workers to publish
+                account handles in. Required if there are multiple workers.
+            concurrency (int, optional): Maximal number of accounts provisioned at
+                once. Defaults to 8.
+            timeout (float, optional): Seconds to wait for an account provisioned by
+                another worker. Defaults to 600.
+        """
+        self.ethel = ethel
+        self.prefix = prefix
+        self.password = password
+        self.worker = worker
+        self.worker_count = worker_count
+        self.shared_dir = shared_dir
+        self.timeout = timeout
+        self._futures: Dict[Key, Future] = {}
+        self._prefetched: Set[Key] = set()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(concurrency, thread_name_prefix="ethel")
+
+    def owner(self, key: Key) -> int:
+        """Index of the worker responsible for provisioning an account."""
+        return int(spec_hash(key), 16) % self.worker_count
+
+    def username(self, key: Key, owner: int) -> str:
+        """Username of an account, unique per spec and owner."""
+        return f"{self.prefix}-{spec_hash(key)}-{owner}"
+
+    def prefetch(self, specs: Iterable[Iterable[str]]) -> None:
+        """Start provisioning accounts owned by this worker in the background.
+
+        All workers have to prefetch the same specs, accounts owned by other workers
+        are then opened once published.
+
+        Args:
+            specs (Iterable[Iterable[str]]): SKUs of each account.
+        """
+        keys = {spec_key(skus) for skus in specs}
+        self._prefetched |= keys
+        for key in keys:
+            if self.owner(key) == self._index:
+                self._submit(key, self._provision)
+
+    def get(self, skus: Iterable[str] = ()) -> Account:
+        """Get a shared account subscribed to the SKUs.
+
+        Accounts not prefetched by all workers are provisioned by the requesting
+        worker.
+
+        Args:
+            skus (Iterable[str], optional): SKUs of the account. Defaults to no SKUs.
+
+        Returns:
+            Account: Shared account.
+        """
+        key = spec_key(skus)
+        if key in self._prefetched and self.owner(key) != self._index:
+            return self._submit(key, self._open).result()
+        return self._submit(key, self._provision).result()
+
+    def close(self) -> None:
+        """Wait for running provisioning."""
+        self._executor.shutdown(wait=True)
+
+    @property
+    def _index(self) -> int:
+        return int(self.worker[2:]) if self.worker.startswith("gw") else 0
+
+    def _submit(self, key: Key, func) -> Future:
+        with self._lock:
+            if key not in self._futures:
+                self._futures[key] = self._executor.submit(func, key)
+            return self._futures[key]
+
+    def _handle_path(self, key: Key) -> Optional[Path]:
+        if self.shared_dir is None:
+            return None
+        return self.shared_dir / f"{self.username(key, self.owner(key))}.json"
+
+    def _publish(self, key: Key, record: dict) -> None:
+        """Publish a record for other workers, atomically.
+
+        Only records of prefetched accounts owned by this worker are published, other
+        workers provision the rest themselves.
+        """
+        if key not in self._prefetched or self.owner(key) != self._index:
+            return
+        path = self._handle_path(key)
+        if path is not None:
+            partial = path.with_suffix(".partial")
+            partial.write_text(json.dumps(record))
+            partial.rename(path)
+
+    def _provision(self, key: Key) -> Account:
+        """Create or reuse an account, publish its handle for other workers."""
+        username = self.username(key, self._index)
+        try:
+            account = Account.restore(self.ethel.api, username, self.password)
+            if account.does_exist():
+                account.reset(to_skus=key)
+            else:
+                account = self.ethel.create_account(username, self.password)
+                with account.defer_visibility():
+                    for sku_id in key:
+                        account.subscribe(sku_id, wait=True)
+        except Exception as e:
+            self._publish(key, dict(error=f"{e.__class__.__name__}: {e}"))
+            raise
+
+        handle = AccountHandle.from_account(account)
+        self._publish(key, dict(handle.as_dict(), password=None))
+        return account
+
+    def _open(self, key: Key) -> Account:
+        """Open an account provisioned by another worker."""
+        path = self._handle_path(key)
+        wait_for(path.exists, timeout=self.timeout, max_delay=5)  # type: ignore
+        record = json.loads(path.read_text())  # type: ignore
+        if "error" in record:
+            raise RuntimeError(f"Provisioning {path.stem} failed: {record['error']}")
+        handle = replace(AccountHandle.from_dict(record), password=self.password)
+        return handle.open(self.ethel.api)
+
+
+def pytest_addoption(parser) -> None:
+    """Register command line options."""
+    group = parser.getgroup("ethel")
+    group.addoption(
+        "--ethel-env",
+        default=os.getenv("ETHEL_ENV", "stage"),
+        help="Environment to provision accounts in, 'simulated' for an in-process "
+        "simulation. Defaults to $ETHEL_ENV or 'stage'.",
+    )
+    group.addoption(
+        "--ethel-prefix",
+        default=os.getenv("ETHEL_PREFIX"),
+        help="Username prefix of shared accounts, unique to the project. Defaults to "
+        "$ETHEL_PREFIX, required unless the environment is 'simulated'.",
+    )
+    group.addoption(
+        "--ethel-password",
+        default=os.getenv("ETHEL_PASSWORD"),
+        help="Password of shared accounts. Defaults to $ETHEL_PASSWORD, required "
+        "unless the environment is 'simulated'.",
+    )
+
+
+def pytest_configure(config) -> None:
+    """Register the ethel_account marker."""
+    config.addinivalue_line(
+        "markers", "ethel_account(skus): SKUs of the account given by ethel_account"
+    )
+
+
+def _pool(config) -> AccountPool:
+    """Account pool of this test session, created on first use."""
+    pool = getattr(config, "_ethel_pool", None)
+    if pool is not None:
+        return pool
+
+    env = config.getoption("ethel_env")
+    simulated = env == "simulated"
+    prefix = config.getoption("ethel_prefix")
+    password = config.getoption("ethel_password")
+    if not simulated and not (prefix and password):
+        raise pytest.UsageError(
+            f"--ethel-prefix and --ethel-password are required for environment '{env}'"
+        )
+
+    worker = os.getenv("PYTEST_XDIST_WORKER", "main")
+    run_id = os.getenv("PYTEST_XDIST_TESTRUNUID")
+    shared_dir = None
+    if run_id and not simulated:
+        shared_dir = Path(tempfile.gettempdir()) / f"ethel-{run_id}"
+        shared_dir.mkdir(mode=0o700, exist_ok=True)
+
+    pool = AccountPool(
+        Ethel.simulated() if simulated else Ethel.environment(env),
+        prefix=prefix or "ethel",
+        password=password or "ethel-password",
+        # Simulated backends are not shared by workers, each provisions its own
+        worker="main" if simulated else worker,
+        worker_count=1 if simulated else int(os.getenv("PYTEST_XDIST_WORKER_COUNT", "1")),
+        shared_dir=shared_dir,
+    )
+    config._ethel_pool = pool  # pylint: disable=protected-access
+    return pool
+
+
+def pytest_collection_finish(session) -> None:
+    """Start provisioning all accounts needed by the collected tests."""
+    markers = [item.get_closest_marker("ethel_account") for item in session.items]
+    specs = [m.kwargs.get("skus", ()) for m in markers if m is not None]
+    if specs:
+        _pool(session.config).prefetch(specs)
+
+
+def pytest_unconfigure(config) -> None:
+    """Wait for running provisioning."""
+    pool = getattr(config, "_ethel_pool", None)
+    if pool is not None:
+        pool.close()
+
+
+@pytest.fixture(name="ethel_accounts", scope="session")
+def ethel_accounts_fixture(pytestconfig) -> AccountPool:
+    """Pool of shared accounts, use ethel_accounts.get(skus=...)."""
+    return _pool(pytestconfig)
+
+
+@pytest.fixture(name="ethel", scope="session")
+def ethel_fixture(ethel_accounts: AccountPool) -> Ethel:
+    """Ethel instance of the test session."""
+    return ethel_accounts.ethel
+
+
+@pytest.fixture
+def ethel_account(request, ethel_accounts: AccountPool) -> Account:
+    """Shared account with SKUs given by the ethel_account marker."""
+    marker = request.node.get_closest_marker("ethel_account")
+    return ethel_accounts.get(marker.kwargs.get("skus", ()) if marker else ())
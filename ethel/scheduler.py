@@ -0,0 +1,93 @@
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterable, Tuple
+
+from .api.deadline import propagate
+
+
+class PhaseScheduler:
+    def __init__(self, max_workers: int = None) -> None:
+        """Dependency aware phase scheduler.
+
+        Runs named phases (callables without arguments) in a thread pool. A phase is
+        started as soon as all phases it depends on are finished, so independent
+        phases run concurrently and the total time approaches the critical path.
+        Phases run with the deadline of the caller.
+
+        Args:
+            max_workers (int, optional): Maximal number of concurrently running phases.
+                Defaults to None (ThreadPoolExecutor default).
+        """
+        self.max_workers = max_workers
+        self._phases: Dict[str, Tuple[Callable[[], Any], Tuple[str, ...]]] = {}
+
+    def add(
+        self, name: str, func: Callable[[], Any], depends_on: Iterable[str] = ()
+    ) -> None:
+        """Register a phase.
+
+        Args:
+            name (str): Unique phase name.
+            func (Callable[[], Any]): Phase body.
+            depends_on (Iterable[str], optional): Names of phases that have to finish
+                before this phase can start. Defaults to no dependencies.
+
+        Raises:
+            ValueError: Phase name is already registered.
+        """
+        if name in self._phases:
+            raise ValueError(f"Phase '{name}' is already registered")
+        self._phases[name] = (func, tuple(depends_on))
+
+    def _validate(self) -> None:
+        """Ensure all dependencies are known and there are no cycles.
+
+        Raises:
+            ValueError: Unknown dependency or a dependency cycle.
+        """
+        for name, (_, depends_on) in self._phases.items():
+            unknown = set(depends_on) - set(self._phases)
+            if unknown:
+                raise ValueError(f"Phase '{name}' depends on unknown phases {unknown}")
+
+        resolved: set = set()
+        remaining = dict(self._phases)
+        while remaining:
+            ready = [n for n, (_, deps) in remaining.items() if resolved.issuperset(deps)]
+            if not ready:
+                raise ValueError(f"Dependency cycle between phases {set(remaining)}")
+            for name in ready:
+                resolved.add(name)
+                del remaining[name]
+
+    def run(self) -> Dict[str, Any]:
+        """Run all registered phases.
+
+        If any phase fails, no new phases are started, running phases are awaited and
+        the first exception is re-raised.
+
+        Returns:
+            Dict[str, Any]: Return values of all phases by phase name.
+        """
+        self._validate()
+
+        results: Dict[str, Any] = {}
+        pending = dict(self._phases)
+        running: Dict[Future, str] = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while pending or running:
+                for name, (func, depends_on) in list(pending.items()):
+                    if all(dep in results for dep in depends_on):
+                        running[executor.submit(propagate(func))] = name
+                        del pending[name]
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    error = future.exception()
+                    if error is not None:
+                        wait(running)
+                        raise error
+                    results[name] = future.result()
+
+        return results
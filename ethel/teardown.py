@@ -0,0 +1,128 @@
+"""Bulk teardown
+
+Remove expired pools and retired accounts concurrently, at a bounded rate.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from typing import Callable, Dict, Iterable, List, Tuple, Union
+
+from .account import Account
+from .api.deadline import propagate
+from .api.throttle import TokenBucket
+
+
+@dataclass
+class TeardownResult:
+    username: str
+    deleted_pools: List[str] = field(default_factory=list)
+    retired: bool = False
+    errors: List[Exception] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:  # pylint: disable=invalid-name
+        """All deletions of this account succeeded."""
+        return not self.errors
+
+
+@dataclass
+class TeardownReport:
+    results: List[TeardownResult] = field(default_factory=list)
+
+    @property
+    def deleted_pools(self) -> int:
+        """Number of deleted pools."""
+        return sum(len(result.deleted_pools) for result in self.results)
+
+    @property
+    def retired(self) -> int:
+        """Number of retired accounts."""
+        return sum(result.retired for result in self.results)
+
+    @property
+    def errors(self) -> Dict[str, List[Exception]]:
+        """Errors by username."""
+        return {r.username: r.errors for r in self.results if not r.ok}
+
+    def __str__(self):
+        return (
+            f"Deleted {self.deleted_pools} pools, retired {self.retired}/"
+            f"{len(self.results)} accounts, {len(self.errors)} accounts failed."
+        )
+
+
+def _call(result: TeardownResult, func: Callable[[], None]) -> bool:
+    """Call a deletion, record its error into the result."""
+    try:
+        func()
+        return True
+    except Exception as e:  # pylint: disable=broad-except
+        result.errors.append(e)
+        return False
+
+
+def teardown(
+    accounts: Iterable[Account],
+    expired_only: bool = True,
+    concurrency: int = 4,
+    rate: float = None,
+    today: Union[datetime, date, str] = None,
+) -> TeardownReport:
+    """Delete expired pools or whole accounts concurrently.
+
+    With expired_only, expired pools of all accounts are listed first and then deleted
+    pool by pool, so a single account with many pools is cleaned up concurrently too.
+    Otherwise every account is retired (see Account.retire), which deletes all its
+    pools at once. Failures are collected in the report instead of being raised.
+
+    Args:
+        accounts (Iterable[Account]): Accounts to clean up.
+        expired_only (bool, optional): Delete only expired pools and keep the
+            accounts. Defaults to True.
+        concurrency (int, optional): Maximal number of concurrent requests.
+            Defaults to 4.
+        rate (float, optional): Maximal number of deletions per second. Defaults to
+            None (unlimited).
+        today (Union[datetime, date, str], optional): Pools ending before this date
+            are expired. Defaults to None (today).
+
+    Returns:
+        TeardownReport: Outcome for each account.
+    """
+    bucket = TokenBucket(rate) if rate else None
+    targets = [(account, TeardownResult(account.username)) for account in accounts]
+    report = TeardownReport([result for _, result in targets])
+
+    def throttled(func: Callable[[], None]) -> Callable[[], None]:
+        def call() -> None:
+            if bucket:
+                bucket.acquire()
+            func()
+
+        return call
+
+    def retire(account: Account, result: TeardownResult) -> None:
+        result.retired = _call(result, throttled(account.retire))
+
+    def list_expired(
+        account: Account, result: TeardownResult
+    ) -> List[Tuple[Account, TeardownResult, str]]:
+        pool_ids: List[str] = []
+        _call(result, lambda: pool_ids.extend(account.expired_pools(today)))
+        return [(account, result, pool_id) for pool_id in pool_ids]
+
+    def delete_pool(account: Account, result: TeardownResult, pool_id: str) -> None:
+        delete = throttled(lambda: account.api.candlepin.delete_pool(pool_id))
+        if _call(result, delete):
+            result.deleted_pools.append(pool_id)
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        if not expired_only:
+            list(executor.map(propagate(lambda item: retire(*item)), targets))
+            return report
+
+        expired = executor.map(propagate(lambda item: list_expired(*item)), targets)
+        deletions = [deletion for pools in expired for deletion in pools]
+        list(executor.map(propagate(lambda item: delete_pool(*item)), deletions))
+
+    return report
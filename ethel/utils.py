@@ -1,5 +1,11 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, datetime, timedelta
-from typing import Any, Callable, Optional, Union
+from typing import Any, Callable, Iterable, List, Optional, TypeVar, Union
+
+from .api.deadline import check, propagate
+
+T = TypeVar("T")
 
 
 def parse_date(value: Union[datetime, date, str] = None) -> date:
@@ -142,3 +148,59 @@ def get_quantity(source_dict: dict) -> Union[float, str]:
     instance_multiplier = get_instance_multiplier(source_dict) or 1
 
     return quantity / source_dict.get("multiplier", 1) / instance_multiplier
+
+
+def wait_for(
+    predicate: Callable[[], bool],
+    timeout: float = 300,
+    delay: float = 1,
+    max_delay: float = 30,
+    backoff: float = 2,
+) -> None:
+    """Poll until a predicate is satisfied.
+
+    Delay between polls grows exponentially, up to max_delay. Polling stops at the
+    current deadline, if it's closer than the timeout.
+
+    Args:
+        predicate (Callable[[], bool]): Polled function, returns True when done.
+        timeout (float, optional): Give up after this many seconds. Defaults to 300.
+        delay (float, optional): Initial delay between polls. Defaults to 1.
+        max_delay (float, optional): Maximal delay between polls. Defaults to 30.
+        backoff (float, optional): Delay multiplier. Defaults to 2.
+
+    Raises:
+        TimeoutError: Predicate was not satisfied in time.
+        DeadlineExceeded: Current deadline passed before the predicate was satisfied.
+    """
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise TimeoutError(f"Condition not met within {timeout} seconds")
+        left = check()
+        time.sleep(min(delay, remaining, remaining if left is None else left))
+        delay = min(delay * backoff, max_delay)
+
+
+def map_concurrently(
+    func: Callable[[T], Any], items: Iterable[T], concurrency: int = 8
+) -> List[Any]:
+    """Call a function for each item on a bounded thread pool.
+
+    Calls run with the deadline of the caller.
+
+    Args:
+        func (Callable[[T], Any]): Function to call.
+        items (Iterable[T]): Function arguments.
+        concurrency (int, optional): Maximal number of concurrent calls.
+            Defaults to 8.
+
+    Raises:
+        Exception: The first error raised by func, in order of items.
+
+    Returns:
+        List[Any]: Results in order of items.
+    """
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        return list(executor.map(propagate(func), items))
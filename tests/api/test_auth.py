@@ -0,0 +1,79 @@
+from requests import Response
+
+from ethel.api.auth import AuthSessions
+
+
+def response(status_code: int = 200, **cookies) -> Response:
+    """Response setting cookies."""
+    result = Response()
+    result.status_code = status_code
+    for name, value in cookies.items():
+        result.cookies.set(name, value)
+    return result
+
+
+def test_auth_sessions_reuse(mocker):
+    """Should authenticate by credentials once and reuse the session."""
+    send = mocker.Mock(side_effect=[response(SESSION="1"), response()])
+    sessions = AuthSessions()
+
+    sessions.send(send, ("USER", "PASS"), params=dict(a=1))
+    sessions.send(send, ("USER", "PASS"), params=dict(a=1))
+
+    assert send.call_args_list == [
+        mocker.call(auth=("USER", "PASS"), params=dict(a=1)),
+        mocker.call(cookies=dict(SESSION="1"), params=dict(a=1)),
+    ]
+    assert sessions.get(("USER", "OTHER")) is None
+
+
+def test_auth_sessions_renewal(mocker):
+    """Should renew a session rejected by the server."""
+    rejected = response(401)
+    close = mocker.patch.object(rejected, "close")
+    send = mocker.Mock(side_effect=[rejected, response(SESSION="2"), response()])
+    sessions = AuthSessions()
+    sessions.store(("USER", "PASS"), response(SESSION="1"))
+
+    assert sessions.send(send, ("USER", "PASS")).status_code == 200
+    close.assert_called_once_with()
+    assert sessions.get(("USER", "PASS")) == dict(SESSION="2")
+    assert send.call_args_list == [
+        mocker.call(cookies=dict(SESSION="1")),
+        mocker.call(auth=("USER", "PASS")),
+    ]
+
+
+def test_auth_sessions_without_cookies(mocker):
+    """Should send credentials every time if the server sets no cookies."""
+    send = mocker.Mock(return_value=response())
+    sessions = AuthSessions()
+
+    for _ in range(3):
+        sessions.send(send, ("USER", "PASS"))
+
+    assert send.call_args_list == [mocker.call(auth=("USER", "PASS"))] * 3
+    assert not sessions
+
+
+def test_auth_sessions_failed_login(mocker):
+    """Should not keep sessions of rejected credentials."""
+    send = mocker.Mock(return_value=response(401, SESSION="1"))
+    sessions = AuthSessions()
+
+    assert sessions.send(send, ("USER", "WRONG")).status_code == 401
+    assert not sessions
+
+
+def test_auth_sessions_max_size():
+    """Should drop the least recently used sessions."""
+    sessions = AuthSessions(max_size=2)
+    for user in ("A", "B"):
+        sessions.store((user, "PASS"), response(SESSION=user))
+    sessions.get(("A", "PASS"))
+    sessions.store(("C", "PASS"), response(SESSION="C"))
+
+    assert len(sessions) == 2
+    assert sessions.get(("B", "PASS")) is None
+    sessions.clear()
+    assert not sessions
@@ -1,19 +1,31 @@
+from concurrent.futures import ThreadPoolExecutor
+
 import hypothesis.strategies as st
+import pytest  # type: ignore
+import requests
 from hypothesis import given
+from requests import ConnectionError as RequestsConnectionError
 
-from ethel.api.base import APIBase, APISession
+from ethel.api import (
+    CircuitBreaker,
+    CircuitOpenError,
+    DeadlineExceeded,
+    RateLimiter,
+    deadline,
+)
+from ethel.api.base import DEFAULT_TIMEOUT, APIBase, APISession
 
 
 @given(st.sampled_from(["get", "options", "head", "post", "put", "patch", "delete"]))
 def test_api_session(mocker, method):
     """Should prepend base url to requests.Session.<method> call urls."""
-    mocked_session = mocker.patch("ethel.api.base.super")
+    mocked_method = mocker.patch.object(requests.Session, method)
     mocker.patch.object(APISession, "close")
     session = APISession("https://example.com/some/path/")
 
     getattr(session, method)("/endpoint")
-    getattr(mocked_session(), method).assert_called_once_with(
-        "https://example.com/some/path/endpoint"
+    mocked_method.assert_called_once_with(
+        "https://example.com/some/path/endpoint", timeout=DEFAULT_TIMEOUT
     )
 
 
@@ -29,6 +41,12 @@ def test_api_session_optional_params(params):
     assert session.verify == params.get("verify", False)
 
 
+def test_api_session_accept_encoding():
+    """Should negotiate compressed responses."""
+    session = APISession("https://example.com/some/path/")
+    assert "gzip" in session.headers["Accept-Encoding"]
+
+
 def test_api_session_close_on_delete(mocker):
     """Should register a close handler in atexit."""
     register = mocker.patch("atexit.register")
@@ -36,6 +54,14 @@ def test_api_session_close_on_delete(mocker):
     register.assert_called_once_with(session.close)
 
 
+def test_api_session_close_hedger(mocker):
+    """Should close the hedger with the session."""
+    session = APISession("https://example.com/some/path/")
+    session.hedger = mocker.Mock()
+    session.close()
+    session.hedger.close.assert_called_once_with()
+
+
 def test_api_base_pass_to_session(mocker):
     """Should propagate base url to APISession."""
     mocked_session = mocker.patch("ethel.api.base.APISession")
@@ -53,3 +79,105 @@ def test_api_base_repr():
 
     subapi = SubAPI("https://example.com/some/path/")
     assert repr(subapi) == "SubAPI(api_base_url=https://example.com/some/path)"
+
+
+def test_api_session_rate_limiter(mocker):
+    """Should acquire and release the rate limiter around a request."""
+    mocker.patch("requests.Session.get").return_value.status_code = 429
+    session = APISession("https://example.com/some/path/")
+    session.limiter = mocker.Mock()
+
+    session.get("/endpoint")
+    session.limiter.acquire.assert_called_once()
+    session.limiter.release.assert_called_once_with(mocker.ANY, 429)
+
+
+def test_api_session_circuit_breaker(mocker):
+    """Should not send a request when the circuit is open."""
+    get = mocker.patch("requests.Session.get")
+    session = APISession("https://example.com/some/path/")
+    session.breaker = CircuitBreaker(session.api_base_url, failure_threshold=1)
+
+    get.side_effect = RequestsConnectionError
+    with pytest.raises(RequestsConnectionError):
+        session.get("/endpoint")
+
+    with pytest.raises(CircuitOpenError):
+        session.get("/endpoint")
+    get.assert_called_once()
+
+
+def test_api_session_hedge(mocker):
+    """Should pass only hedgeable requests to the hedger."""
+    get = mocker.patch("requests.Session.get")
+    session = APISession("https://example.com/some/path/")
+    session.hedger = mocker.Mock()
+    session.hedger.send.side_effect = lambda request: request()
+
+    session.get("/endpoint")
+    session.hedger.send.assert_not_called()
+    session.get("/endpoint", hedge=True)
+    session.hedger.send.assert_called_once()
+    get.assert_called_with(
+        "https://example.com/some/path/endpoint", timeout=DEFAULT_TIMEOUT
+    )
+
+
+def test_api_session_thread_sessions():
+    """Should use a session per thread sharing the connection pool."""
+    session = APISession("https://example.com/some/path/")
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        other = executor.submit(session.thread_session).result()
+
+    assert session.thread_session() is session.thread_session()
+    assert session.thread_session() is not other
+    assert other.adapters is session.adapters
+    assert other.headers is session.headers
+    assert other.verify == session.verify
+
+
+def test_api_session_timeout(mocker):
+    """Should cap request timeouts by the deadline."""
+    get = mocker.patch("requests.Session.get")
+    session = APISession("https://example.com/some/path/")
+    session.timeout = (1, 2)
+
+    session.get("/endpoint", timeout=5)
+    assert get.call_args[1]["timeout"] == (5, 5)
+
+    with deadline(1.5):
+        session.get("/endpoint")
+    connect, read = get.call_args[1]["timeout"]
+    assert connect == 1 and 1 < read <= 1.5
+
+    with deadline(0), pytest.raises(DeadlineExceeded):
+        session.get("/endpoint")
+    assert get.call_count == 2
+
+
+def test_api_session_deadline_after_limiter(mocker):
+    """Should not send a request once the deadline passed waiting for the limiter."""
+    get = mocker.patch("requests.Session.get")
+    session = APISession("https://example.com/some/path/")
+    session.limiter = RateLimiter(rate=0.5, burst=1)
+
+    with deadline(0.5):
+        session.get("/endpoint")
+        with pytest.raises(DeadlineExceeded):
+            session.get("/endpoint")
+    get.assert_called_once()
+    assert session.limiter.concurrency.in_flight == 0
+
+
+def test_api_session_prewarm(mocker):
+    """Should send a HEAD request to the base URL, bypassing the rate limiter."""
+    head = mocker.patch("requests.Session.head")
+    session = APISession("https://example.com/some/path/")
+    session.limiter = mocker.Mock()
+
+    session.prewarm()
+    head.assert_called_once_with(
+        "https://example.com/some/path", timeout=DEFAULT_TIMEOUT
+    )
+    head.return_value.close.assert_called_once()
+    session.limiter.acquire.assert_not_called()
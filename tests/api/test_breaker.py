@@ -0,0 +1,85 @@
+# pylint: disable=redefined-outer-name
+
+import pytest  # type: ignore
+
+from ethel.api import CircuitOpenError, EthelConnectionError
+from ethel.api.breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, get_circuit_breaker
+
+
+@pytest.fixture
+def clock(mocker):
+    """Mocked monotonic clock."""
+    clock = mocker.patch("ethel.api.breaker.time.monotonic")
+    clock.return_value = 0
+    return clock
+
+
+def test_opens_after_threshold(clock):  # pylint: disable=unused-argument
+    """Should open after consecutive failures and reject requests."""
+    breaker = CircuitBreaker("URL", failure_threshold=3, reset_timeout=10)
+    for _ in range(2):
+        breaker.record(None)
+    assert breaker.state == CLOSED
+
+    breaker.record(503)
+    assert breaker.state == OPEN
+    with pytest.raises(EthelConnectionError) as e:
+        breaker.before_request()
+    assert e.value.retry_after == 10
+
+
+def test_success_resets_failures():
+    """Should count only consecutive failures."""
+    breaker = CircuitBreaker("URL", failure_threshold=2)
+    breaker.record(None)
+    breaker.record(404)
+    breaker.record(None)
+    assert breaker.state == CLOSED
+
+
+def test_half_open_single_trial(clock):
+    """Should let through a single trial request after reset timeout."""
+    breaker = CircuitBreaker("URL", failure_threshold=1, reset_timeout=10)
+    breaker.record(None)
+    clock.return_value = 10
+    assert breaker.state == HALF_OPEN
+
+    breaker.before_request()
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request()
+
+
+@pytest.mark.parametrize("status_code,state", [(200, CLOSED), (None, OPEN)])
+def test_half_open_trial_outcome(clock, status_code, state):
+    """Trial success should close the circuit, failure should open it again."""
+    breaker = CircuitBreaker("URL", failure_threshold=1, reset_timeout=10)
+    breaker.record(None)
+    clock.return_value = 10
+    breaker.before_request()
+    breaker.record(status_code)
+    assert breaker.state == state
+
+
+def test_reset():
+    """Should close the circuit manually."""
+    breaker = CircuitBreaker("URL", failure_threshold=1)
+    breaker.record(None)
+    breaker.reset()
+    assert breaker.state == CLOSED
+    breaker.before_request()
+
+
+def test_get_circuit_breaker_shared():
+    """Should share a breaker per base URL and thresholds."""
+    breaker = get_circuit_breaker("https://example.com/shared", failure_threshold=1)
+    assert get_circuit_breaker("https://example.com/shared", 1) is breaker
+
+    other = get_circuit_breaker(
+        "https://example.com/shared", failure_threshold=2, reset_timeout=5
+    )
+    assert other is not breaker
+    assert breaker.failure_threshold == 1
+    assert breaker.reset_timeout == 30
+    assert other.failure_threshold == 2
+    assert other.reset_timeout == 5
+    assert get_circuit_breaker("https://example.com/other", 1) is not breaker
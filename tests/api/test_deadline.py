@@ -0,0 +1,43 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest  # type: ignore
+
+from ethel.api.deadline import DeadlineExceeded, check, deadline, propagate, remaining
+
+
+def test_no_deadline():
+    """Should not limit anything by default."""
+    assert remaining() is None
+    assert check() is None
+
+
+def test_nested_deadline():
+    """Should only shorten the outer deadline."""
+    with deadline(10):
+        with deadline(20):
+            assert remaining() <= 10
+        with deadline(1):
+            assert remaining() <= 1
+        assert 1 < remaining() <= 10
+    assert remaining() is None
+
+
+def test_deadline_exceeded():
+    """Should raise once the deadline passes."""
+    with deadline(0.01):
+        time.sleep(0.02)
+        with pytest.raises(DeadlineExceeded) as e:
+            check()
+    assert e.value.timeout == 0.01
+    assert isinstance(e.value, TimeoutError)
+
+
+def test_propagate():
+    """Should pass the deadline to other threads."""
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        with deadline(10):
+            left = list(executor.map(propagate(lambda _: remaining()), range(4)))
+            plain = executor.submit(remaining).result()
+    assert all(0 < value <= 10 for value in left)
+    assert plain is None
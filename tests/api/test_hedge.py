@@ -0,0 +1,89 @@
+import threading
+import time
+
+import pytest  # type: ignore
+
+from ethel.api.hedge import Hedger
+
+
+def warm_up(hedger: Hedger, latency: float = 0.01) -> None:
+    """Teach hedger a latency and a request budget."""
+    hedger._latencies.extend([latency] * 10)  # pylint: disable=protected-access
+    hedger.requests = 100
+
+
+def test_no_hedge_without_samples(mocker):
+    """Should send the request directly until enough latencies are known."""
+    hedger = Hedger(min_samples=10)
+    request = mocker.Mock(return_value="RESPONSE")
+    assert hedger.send(request) == "RESPONSE"
+    request.assert_called_once()
+    assert hedger.delay() is None
+
+
+def test_delay_percentile():
+    """Should use the latency percentile as a delay."""
+    hedger = Hedger(percentile=0.5, min_samples=4)
+    hedger._latencies.extend([4, 1, 3, 2])  # pylint: disable=protected-access
+    assert hedger.delay() == 3
+
+
+def test_hedges_slow_request(mocker):
+    """Should send a duplicate request and use the first response."""
+    hedger = Hedger(min_samples=10, max_extra=1)
+    warm_up(hedger)
+    release = threading.Event()
+    slow = mocker.Mock()
+
+    def request():
+        if not slow.called:
+            slow()
+            release.wait(5)
+            return slow
+        return "FAST"
+
+    assert hedger.send(request) == "FAST"
+    assert hedger.hedged == 1
+    release.set()
+
+
+def test_hedge_budget():
+    """Should not hedge over the extra load budget."""
+    hedger = Hedger(min_samples=10, max_extra=0)
+    warm_up(hedger, latency=0)
+    calls = []
+
+    def request():
+        calls.append(1)
+        time.sleep(0.05)
+        return "SLOW"
+
+    assert hedger.send(request) == "SLOW"
+    assert len(calls) == 1
+    assert hedger.hedged == 0
+
+
+def test_hedge_falls_back_on_error():
+    """Should use the other response if the faster request fails."""
+    hedger = Hedger(min_samples=10, max_extra=1)
+    warm_up(hedger)
+    calls = []
+
+    def request():
+        calls.append(1)
+        if len(calls) == 1:
+            time.sleep(0.1)
+            return "SLOW"
+        raise ConnectionError
+
+    assert hedger.send(request) == "SLOW"
+    assert len(calls) == 2
+
+
+def test_close():
+    """Should refuse new requests once closed."""
+    hedger = Hedger(min_samples=10)
+    warm_up(hedger)
+    hedger.close()
+    with pytest.raises(RuntimeError):
+        hedger.send(lambda: time.sleep(0.05))
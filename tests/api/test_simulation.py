@@ -0,0 +1,285 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest  # type: ignore
+from requests import ReadTimeout
+
+from ethel import Account, DeadlineExceeded, Ethel, EthelError
+from ethel.api.simulation import SimulatedBackend
+
+
+def test_create_account(ethel: Ethel):
+    """Should create user, owner and accept required terms."""
+    account = ethel.create_account("USERNAME", "PASSWORD")
+    user = ethel.backend.users["USERNAME"]
+    assert account.org_id == user["orgId"]
+    assert account.owner_id == user["orgId"]
+    assert account.get_refresh_status() == "FINISHED"
+    assert ethel.api.terms.get_required_terms("USERNAME") == []
+    assert len(ethel.api.terms.get_all_terms("USERNAME")) == 1
+
+
+def test_create_existing_user(ethel: Ethel):
+    """Should map EBS errors."""
+    ethel.api.user.create("USERNAME", "PASSWORD")
+    with pytest.raises(EthelError) as e:
+        ethel.api.user.create("USERNAME", "PASSWORD")
+    assert "com.redhat.services.user.LoginExistsException" in e.value.exception_type
+    assert e.value.status_code == 500
+
+
+def test_invalid_credentials(ethel: Ethel):
+    """Should map Candlepin errors."""
+    ethel.create_account("USERNAME", "PASSWORD")
+    with pytest.raises(EthelError) as e:
+        ethel.create_account("USERNAME", "WRONG_PASSWORD")
+    assert e.value.status_code == 401
+    assert e.value.uuid
+
+
+def test_subscribe(ethel: Ethel):
+    """Should make pools visible after refresh."""
+    account = ethel.create_account("USERNAME", "PASSWORD", skus=["SKU_A"])
+    account.subscribe("SKU_B", quantity=3, wait=True)
+    pools = {pool["sku_id"]: pool for pool in account.list_pools()}
+    assert set(pools) == {"SKU_A", "SKU_B"}
+    assert pools["SKU_B"]["quantity"] == 3
+
+
+def test_create_account_with_skus(ethel: Ethel):
+    """Should refresh after all subscriptions, so their pools are visible."""
+    ethel.backend.latency = 0.05
+    account = ethel.create_account("USERNAME", "PASSWORD", skus=["SKU_A", "SKU_B"])
+    assert sorted(p["sku_id"] for p in account.list_pools()) == ["SKU_A", "SKU_B"]
+
+
+def test_subscribe_existing_sku(mocker, ethel: Ethel):
+    """Should not take a pool of a previous subscription for the new one."""
+    account = ethel.create_account("USERNAME", "PASSWORD", skus=["SKU_A"])
+    mocker.patch.object(Account, "start_refresh")
+
+    with pytest.raises(TimeoutError):
+        with account.defer_visibility(timeout=0.1):
+            account.subscribe("SKU_A", wait=True)
+
+
+def test_defer_visibility_per_thread(ethel: Ethel):
+    """Should wait for own subscriptions while another thread defers its own."""
+    account = ethel.create_account("USERNAME", "PASSWORD")
+    entered, subscribed = threading.Event(), threading.Event()
+
+    def deferring():
+        with account.defer_visibility():
+            account.subscribe("SKU_A", wait=True)
+            entered.set()
+            subscribed.wait(timeout=5)
+        return [p["sku_id"] for p in account.find_pools(sku="SKU_A")]
+
+    def waiting():
+        entered.wait(timeout=5)
+        account.subscribe("SKU_B", wait=True)
+        pools = [p["sku_id"] for p in account.find_pools(sku="SKU_B")]
+        subscribed.set()
+        return pools
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        first, second = executor.submit(deferring), executor.submit(waiting)
+        assert second.result() == ["SKU_B"]
+        assert first.result() == ["SKU_A"]
+
+
+def test_future_pools(ethel: Ethel):
+    """Should list future pools only on request."""
+    account = ethel.create_account("USERNAME", "PASSWORD")
+    account.subscribe("SKU", start_date="tomorrow", wait=True)
+    assert account.list_pools() == []
+    assert len(account.list_pools(future=True)) == 1
+
+
+def test_shared_backend():
+    """Should share state between instances using the same backend."""
+    backend = SimulatedBackend()
+    Ethel.simulated(backend).create_account("USERNAME", "PASSWORD")
+    assert Ethel.simulated(backend).api.user.login("USERNAME")
+    assert not Ethel.simulated().api.user.login("USERNAME")
+
+
+def test_unknown_route(ethel: Ethel):
+    """Should respond with 404 to unknown routes."""
+    response = ethel.api.candlepin.api.get("/unknown")
+    assert response.status_code == 404
+
+
+def test_pools_include(ethel: Ethel):
+    """Should return only requested pool attributes."""
+    account = ethel.create_account("USERNAME", "PASSWORD", skus=["SKU"])
+    pools = ethel.api.candlepin.get_pools(
+        "USERNAME", "PASSWORD", account.owner_id, fields=["id", "productId"]
+    )
+    assert [set(pool) for pool in pools] == [{"id", "productId"}]
+
+
+def test_delete_pool(ethel: Ethel):
+    """Should delete pools by admin only."""
+    account = ethel.create_account("USERNAME", "PASSWORD", skus=["SKU"])
+    other = ethel.create_account("OTHER", "PASSWORD")
+    account.subscribe("SKU", wait=True)
+    [pool, _] = account.list_pools()
+
+    response = ethel.api.candlepin.api.delete(
+        f"/pools/{pool['pool_id']}", auth=("USERNAME", "PASSWORD")
+    )
+    assert response.status_code == 401
+
+    ethel.api.candlepin.delete_pool(pool["pool_id"])
+    assert len(account.list_pools()) == 1
+    assert other.list_pools() == []
+
+    with pytest.raises(EthelError) as e:
+        ethel.api.candlepin.delete_pool(pool["pool_id"])
+    assert e.value.status_code == 404
+
+
+def test_delete_user(ethel: Ethel):
+    """Should delete the Candlepin user by admin only and keep the user account."""
+    ethel.create_account("USERNAME", "PASSWORD")
+
+    response = ethel.api.candlepin.api.delete(
+        "/users/USERNAME", auth=("USERNAME", "PASSWORD")
+    )
+    assert response.status_code == 401
+
+    ethel.api.candlepin.delete_user("USERNAME")
+    assert "USERNAME" in ethel.backend.users
+
+    with pytest.raises(EthelError) as e:
+        ethel.api.candlepin.delete_user("UNKNOWN")
+    assert e.value.status_code == 404
+
+
+def test_reset(ethel: Ethel):
+    """Should delete expired pools for good and add missing ones."""
+    account = ethel.create_account("USERNAME", "PASSWORD")
+    account.subscribe("SKU_A", wait=True)
+    account.subscribe("SKU_B", start_date="2000-01-01", duration=10, wait=True)
+
+    account.reset(to_skus=["SKU_A", "SKU_C", "SKU_C"])
+    account.start_refresh()
+
+    skus = sorted(p["sku_id"] for p in account.list_pools(future=True))
+    assert skus == ["SKU_A", "SKU_C", "SKU_C"]
+
+
+def test_refresh_recreates_active_pools(ethel: Ethel):
+    """Should bring back deleted pools of active subscriptions on refresh."""
+    account = ethel.create_account("USERNAME", "PASSWORD", skus=["SKU"])
+    [pool] = account.list_pools()
+
+    ethel.api.candlepin.delete_pool(pool["pool_id"])
+    account.start_refresh()
+
+    assert [p["sku_id"] for p in account.list_pools()] == ["SKU"]
+
+
+def test_consumers(ethel: Ethel):
+    """Should consume pool quantity until consumers are unregistered."""
+    account = ethel.create_account("USERNAME", "PASSWORD")
+    account.subscribe("SKU", quantity=3, wait=True)
+    [pool] = account.list_pools()
+    account.register_consumers(4, concurrency=4)
+
+    with pytest.raises(EthelError) as e:
+        account.attach(pool["pool_id"])
+    assert e.value.status_code == 403
+
+    account.unregister_consumers()
+    assert not ethel.backend.consumers
+    assert ethel.backend.pools[str(account.org_id)][0]["consumed"] == 0
+
+    [uuid] = account.register_consumers()
+    [[entitlement]] = account.attach(pool["pool_id"], quantity=3)
+    assert entitlement["quantity"] == 3
+    assert ethel.backend.consumers[uuid]["entitlements"] == [entitlement]
+
+
+def test_find_pools(ethel: Ethel):
+    """Should filter pools on the server side."""
+    account = ethel.create_account("USERNAME", "PASSWORD")
+    with account.defer_visibility():
+        account.subscribe("SKU_A", wait=True)
+        account.subscribe("SKU_B", start_date="2000-01-01", duration=10, wait=True)
+        account.subscribe("SKU_B", start_date="tomorrow", wait=True)
+    pool = ethel.backend.pools[str(account.org_id)][0]
+    pool["productAttributes"] = [dict(name="arch", value="x86_64")]
+
+    def skus(**filters):
+        return sorted(p["sku_id"] for p in account.find_pools(**filters))
+
+    assert skus() == ["SKU_A", "SKU_B", "SKU_B"]
+    assert skus(sku="SKU_B") == ["SKU_B", "SKU_B"]
+    assert skus(active_on="2000-01-05") == ["SKU_B"]
+    assert skus(active_on="today") == ["SKU_A"]
+    assert skus(matches="*ku_b") == ["SKU_B", "SKU_B"]
+    assert skus(matches="x86*") == ["SKU_A"]
+    assert skus(attributes=dict(arch="x86_64")) == ["SKU_A"]
+    assert skus(attributes=dict(arch="ppc64")) == []
+
+    [consumer] = account.register_consumers()
+    assert skus(sku="SKU_A", consumer=consumer) == ["SKU_A"]
+
+
+def test_concurrent_subscribe(ethel: Ethel):
+    """Should subscribe a shared account from many threads."""
+    account = ethel.create_account("USERNAME", "PASSWORD")
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(account.subscribe, [f"SKU_{i}" for i in range(16)]))
+
+    account.subscribe("SKU_16", wait=True)
+    assert len(account.ledger) == 17
+    assert len(account.list_pools()) == 17
+
+
+def test_account_timeout(ethel: Ethel):
+    """Should abandon account creation after the deadline."""
+    ethel.backend.latency = 0.05
+    with pytest.raises(DeadlineExceeded):
+        ethel.create_account("USERNAME", "PASSWORD", skus=["SKU"], timeout=0.1)
+
+
+def test_read_timeout(ethel: Ethel):
+    """Should time out responses slower than the read timeout."""
+    ethel.backend.latency = 0.05
+    ethel.set_timeouts((1, 0.01))
+    with pytest.raises(ReadTimeout):
+        ethel.create_account("USERNAME", "PASSWORD")
+
+
+def test_candlepin_session_reuse(ethel: Ethel):
+    """Should verify credentials once per account and renew expired sessions."""
+    account = ethel.create_account("USERNAME", "PASSWORD")
+    account.subscribe("SKU", wait=True)
+    checks = ethel.backend.credential_checks
+    for _ in range(3):
+        account.list_pools()
+    assert ethel.backend.credential_checks == checks
+
+    ethel.backend.expire_sessions()
+    assert len(account.list_pools()) == 1
+    assert ethel.backend.credential_checks == checks + 1
+
+    account.password = "WRONG_PASSWORD"
+    with pytest.raises(EthelError) as e:
+        account.list_pools()
+    assert e.value.status_code == 401
+
+
+def test_candlepin_without_sessions():
+    """Should send credentials on every request if Candlepin sets no session."""
+    ethel = Ethel.simulated(SimulatedBackend(sessions=False))
+    account = ethel.create_account("USERNAME", "PASSWORD", skus=["SKU"])
+    account.list_pools()
+    checks = ethel.backend.credential_checks
+    for _ in range(3):
+        account.list_pools()
+    assert ethel.backend.credential_checks == checks + 3
+    assert not ethel.api.candlepin.sessions
@@ -0,0 +1,111 @@
+import threading
+
+import hypothesis.strategies as st
+import pytest  # type: ignore
+from hypothesis import given
+
+from ethel.api.deadline import DeadlineExceeded, deadline
+from ethel.api.throttle import AIMDLimiter, RateLimiter, TokenBucket
+
+
+def test_token_bucket_burst(mocker):
+    """Should allow a burst without waiting."""
+    sleep = mocker.patch("ethel.api.throttle.time.sleep")
+    bucket = TokenBucket(rate=1, burst=3)
+    for _ in range(3):
+        bucket.acquire()
+    sleep.assert_not_called()
+
+
+def test_token_bucket_waits(mocker):
+    """Should wait for a token to be refilled when empty."""
+    mocker.patch("ethel.api.throttle.time.monotonic", side_effect=[0, 0, 0, 0.5])
+    sleep = mocker.patch("ethel.api.throttle.time.sleep")
+    bucket = TokenBucket(rate=2, burst=1)
+    bucket.acquire()
+    bucket.acquire()
+    sleep.assert_called_once_with(0.5)
+
+
+def test_token_bucket_deadline():
+    """Should stop waiting for a token at the deadline."""
+    bucket = TokenBucket(rate=0.5, burst=1)
+    bucket.acquire()
+    with deadline(0.1), pytest.raises(DeadlineExceeded):
+        bucket.acquire()
+
+
+def test_aimd_increase():
+    """Should increase the limit additively on success."""
+    limiter = AIMDLimiter(limit=2, max_limit=3)
+    for _ in range(10):
+        limiter.acquire()
+        limiter.release()
+    assert limiter.limit == 3
+    assert limiter.in_flight == 0
+
+
+def test_aimd_decrease():
+    """Should decrease the limit multiplicatively on overload."""
+    limiter = AIMDLimiter(limit=8, min_limit=1)
+    for expected in (4, 2, 1, 1):
+        limiter.acquire()
+        limiter.release(overloaded=True)
+        assert limiter.limit == expected
+
+
+def test_aimd_blocks_over_limit():
+    """Should block when the concurrency limit is reached."""
+    limiter = AIMDLimiter(limit=1)
+    limiter.acquire()
+    acquired = threading.Event()
+
+    def acquire():
+        limiter.acquire()
+        acquired.set()
+
+    thread = threading.Thread(target=acquire)
+    thread.start()
+    assert not acquired.wait(0.1)
+    limiter.release()
+    assert acquired.wait(5)
+    thread.join()
+
+
+def test_aimd_deadline():
+    """Should stop waiting for a slot at the deadline."""
+    limiter = AIMDLimiter(limit=1)
+    limiter.acquire()
+    with deadline(0.1), pytest.raises(DeadlineExceeded):
+        limiter.acquire()
+    assert limiter.in_flight == 1
+
+
+def test_rate_limiter_deadline():
+    """Should return the concurrency slot when the deadline passes."""
+    limiter = RateLimiter(rate=0.5, burst=1)
+    limiter.acquire()
+    limiter.release(0.1, 200)
+    with deadline(0.1), pytest.raises(DeadlineExceeded):
+        limiter.acquire()
+    assert limiter.concurrency.in_flight == 0
+
+
+@given(
+    st.sampled_from(
+        [
+            (200, 0.1, False),
+            (429, 0.1, True),
+            (503, 0.1, True),
+            (None, 0.1, True),
+            (200, 10, True),
+        ]
+    )
+)
+def test_rate_limiter_overload(params):
+    """Should report overload on throttling, errors and slow responses."""
+    status_code, latency, overloaded = params
+    limiter = RateLimiter(concurrency=4, latency_threshold=1)
+    limiter.acquire()
+    limiter.release(latency, status_code)
+    assert (limiter.concurrency.limit < 4) == overloaded
@@ -0,0 +1,152 @@
+# pylint: disable=redefined-outer-name
+import base64
+import json
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest  # type: ignore
+import requests
+
+from ethel import Ethel
+from ethel.api.base import APISession
+from ethel.api.transport import TRANSPORTS, HTTP2Transport, Transport
+
+
+class EchoHandler(BaseHTTPRequestHandler):
+    """Responds with the received request."""
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        """Echo the request, set a cookie, respond slowly or with an error."""
+        if self.path.startswith("/slow"):
+            time.sleep(0.5)
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        content = json.dumps(
+            dict(
+                method=self.command,
+                path=self.path,
+                body=body.decode(),
+                authorization=self.headers.get("Authorization"),
+                cookie=self.headers.get("Cookie"),
+            )
+        ).encode()
+        self.send_response(404 if self.path.startswith("/missing") else 200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        if self.path.startswith("/cookie"):
+            self.send_header("Set-Cookie", "session=SESSION_ID; Path=/")
+        self.end_headers()
+        self.wfile.write(content)
+
+    do_POST = do_PUT = do_DELETE = do_HEAD = do_GET
+
+    def log_message(self, *args):  # pylint: disable=arguments-differ
+        pass
+
+
+@pytest.fixture(scope="module")
+def server_url():
+    """URL of a local echo server."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), EchoHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+
+
+@pytest.fixture(params=sorted(TRANSPORTS))
+def session(request, server_url):
+    """API session using each transport."""
+    if request.param == "http2":
+        pytest.importorskip("h2")
+        pytest.importorskip("httpx")
+    session = APISession(server_url)
+    session.use_transport(request.param)
+    assert session.transport.name == request.param
+    yield session
+    session.close()
+
+
+def test_transport_abstract():
+    """Should require transports to implement request."""
+    session = APISession("http://example.com")
+    with pytest.raises(TypeError):
+        Transport(session)  # pylint: disable=abstract-class-instantiated
+
+
+def test_transport_request(session):
+    """Should send params, JSON and authentication."""
+    response = session.post(
+        "/path", params=dict(a=["1", "2"]), json=dict(key="value"), auth=("USER", "PASS")
+    )
+    response.raise_for_status()
+    echo = response.json()
+    assert echo["method"] == "POST"
+    assert echo["path"] == "/path?a=1&a=2"
+    assert json.loads(echo["body"]) == dict(key="value")
+    assert echo["authorization"] == f"Basic {base64.b64encode(b'USER:PASS').decode()}"
+    assert response.headers["content-type"] == "application/json"
+
+
+def test_transport_cookies(session):
+    """Should store received cookies in the session and send them back."""
+    assert session.get("/cookie").cookies["session"] == "SESSION_ID"
+    assert session.cookies["session"] == "SESSION_ID"
+    assert session.get("/path").json()["cookie"] == "session=SESSION_ID"
+
+
+def test_transport_errors(session):
+    """Should raise requests exceptions."""
+    with pytest.raises(requests.HTTPError):
+        session.get("/missing").raise_for_status()
+
+    with pytest.raises(requests.ReadTimeout):
+        session.get("/slow", timeout=0.1)
+
+    with socket.socket() as unused:
+        unused.bind(("127.0.0.1", 0))
+        port = unused.getsockname()[1]
+    session.api_base_url = f"http://127.0.0.1:{port}"
+    with pytest.raises(requests.ConnectionError):
+        session.get("/path")
+
+
+def test_transport_prewarm(session):
+    """Should prewarm using the transport."""
+    session.prewarm()
+
+
+def test_transport_concurrent(session):
+    """Should be safe to share across threads."""
+    threads = [threading.Thread(target=session.get, args=("/path",)) for _ in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def test_use_unknown_transport():
+    """Should refuse unknown transports."""
+    with pytest.raises(ValueError):
+        APISession("http://example.com").use_transport("unknown")
+
+
+def test_http2_transport_requires_httpx(mocker):
+    """Should require httpx for HTTP/2."""
+    mocker.patch("ethel.api.transport.httpx", None)
+    with pytest.raises(ImportError):
+        HTTP2Transport(APISession("http://example.com"))
+
+
+def test_ethel_use_transport():
+    """Should switch transports of selected services."""
+    ethel = Ethel("api.example.com", "candlepin.example.com")
+    ethel.use_transport("urllib3", services=["candlepin"])
+    assert ethel.api.candlepin.api.transport.name == "urllib3"
+    assert ethel.api.user.api.transport.name == "requests"
+
+    with pytest.raises(ValueError):
+        ethel.use_transport("urllib3", services=["unknown"])
+    with pytest.raises(ValueError):
+        Ethel.simulated().use_transport("urllib3")
@@ -20,3 +20,9 @@ def test_template_renders(mocker):
     template = utils.Template("template_file.yml")
 
     assert template.render(key="value") == {"key": "value"}
+
+
+def test_parse_json(mocker):
+    """Should decode response body."""
+    response = mocker.Mock(content=b'[{"key": "value"}]')
+    assert utils.parse_json(response) == [{"key": "value"}]
@@ -4,9 +4,11 @@ from urllib.parse import urlsplit, urlunsplit
 
 import pytest  # type: ignore
 
-from ethel import Account
+from ethel import Account, Ethel
 from ethel.api import API
 
+pytest_plugins = ["pytester"]
+
 
 @pytest.fixture
 def api(mocker) -> API:
@@ -30,6 +32,12 @@ def account(api: API, mocker) -> Account:  # pylint: disable=redefined-outer-nam
     return new_account
 
 
+@pytest.fixture
+def ethel() -> Ethel:
+    """Simulated Ethel fixture."""
+    return Ethel.simulated()
+
+
 @pytest.fixture(scope="module")
 def vcr_config() -> dict:
     """Set up VCRpy cassette recorder."""
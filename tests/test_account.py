@@ -1,3 +1,4 @@
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, timedelta
 
 import hypothesis.strategies as st
@@ -52,6 +53,42 @@ def test_account_should_accept_terms(mocker, api: API):
     accept_all_terms.assert_called_once_with()
 
 
+def test_account_should_subscribe(mocker, api: API):
+    """Should subscribe a new account to requested SKUs."""
+    mocker.patch.object(Account, "does_exist", return_value=False)
+    subscribe = mocker.patch.object(Account, "subscribe")
+
+    Account(api, "USERNAME", "PASSWORD", skus=["SKU_A", "SKU_B"])
+    subscribe.assert_has_calls(
+        [mocker.call("SKU_A"), mocker.call("SKU_B")], any_order=True
+    )
+
+
+def test_account_refresh_after_subscriptions(mocker, api: API):
+    """Should start the refresh once all subscriptions are created."""
+    mocker.patch.object(Account, "does_exist", return_value=False)
+    calls = mocker.Mock()
+    mocker.patch.object(Account, "subscribe", calls.subscribe)
+    mocker.patch.object(Account, "start_refresh", calls.start_refresh)
+
+    Account(api, "USERNAME", "PASSWORD", skus=["SKU_A", "SKU_B"])
+    assert [c[0] for c in calls.mock_calls][-1] == "start_refresh"
+    assert calls.subscribe.call_count == 2
+
+
+def test_account_create_fails(mocker, api: API):
+    """Should not run dependent phases if account creation fails."""
+    mocker.patch.object(Account, "does_exist", return_value=False)
+    mocker.patch.object(Account, "create", side_effect=EthelError("", raw_error=None))
+    start_refresh = mocker.patch.object(Account, "start_refresh")
+    accept_all_terms = mocker.patch.object(Account, "accept_all_terms")
+
+    with pytest.raises(EthelError):
+        Account(api, "USERNAME", "PASSWORD")
+    start_refresh.assert_not_called()
+    accept_all_terms.assert_not_called()
+
+
 @given(
     first_name=st.sampled_from(["FIRST_NAME", None]),
     last_name=st.sampled_from(["LAST_NAME", None]),
@@ -227,7 +264,22 @@ def test_list_pools_future(api: API, account: Account):
     """Should list future pools."""
     api.candlepin.get_pools.return_value = []
     account.list_pools(future=True)
-    api.candlepin.get_pools.assert_called_with("USERNAME", "PASSWORD", 1234, future=True)
+    api.candlepin.get_pools.assert_called_with(
+        "USERNAME", "PASSWORD", 1234, future=True, fields=list(Account.POOL_FIELDS)
+    )
+
+
+@given(
+    st.sampled_from(
+        [({"my_id": "id"}, ["id"]), ({}, None), ({"quantity": lambda p: 1}, None)]
+    )
+)
+def test_list_pools_fields(api: API, account: Account, mapping):
+    """Should request only pool attributes needed by the mapping."""
+    filter_attributes, fields = mapping
+    api.candlepin.get_pools.return_value = []
+    account.list_pools(filter_attributes=filter_attributes)
+    assert api.candlepin.get_pools.call_args[1]["fields"] == fields
 
 
 @given(order=custom_st.order, sku_id=st.text(), activation=custom_st.activation)
@@ -240,8 +292,11 @@ def test_subscribe(mocker, api: API, account: Account, order, sku_id, activation
         "USERNAME", sku_id, 1, date.today(), timedelta(days=365)
     )
     api.activation.activate.assert_called_with("USERNAME", 5678, mocker.ANY, date.today())
-    assert order in account.orders
-    assert activation in account.activations
+    record = account.ledger.latest()
+    assert record.sku_id == sku_id
+    assert record.reg_number == order["regNumbers"][0][0]["regNumber"]
+    assert record.activation_id == activation["id"]
+    assert record.end_date == date.today() + timedelta(days=365)
 
 
 @given(
@@ -274,5 +329,175 @@ def test_subscribe_optional_args(
         "USERNAME", sku_id, quantity, start_date, duration
     )
     api.activation.activate.assert_called_with("USERNAME", 5678, mocker.ANY, start_date)
-    assert order in account.orders
-    assert activation in account.activations
+    record = account.ledger.latest()
+    assert record.quantity == quantity
+    assert record.activation_id == activation["id"]
+    assert record.start_date == start_date
+    assert record.duration == duration.days
+
+
+def test_subscribe_wait(mocker, api: API, account: Account):
+    """Should refresh and wait for the pool to appear."""
+    mocker.patch("ethel.utils.time.sleep")
+    api.regnum.order.return_value = dict(regNumbers=[[dict(regNumber=1)]])
+    api.activation.activate.return_value = dict(id=1)
+    api.candlepin.refresh.return_value = dict(id="job")
+    api.candlepin.get_pools.side_effect = [[], [dict(subscriptionId="1")]]
+
+    account.subscribe("SKU", wait=True)
+    api.candlepin.refresh.assert_called_once()
+    api.candlepin.get_pools.assert_called_with(
+        "USERNAME",
+        "PASSWORD",
+        1234,
+        future=True,
+        product="SKU",
+        fields=["subscriptionId"],
+    )
+    assert api.candlepin.get_pools.call_count == 2
+
+
+def test_defer_visibility(mocker, api: API, account: Account):
+    """Should refresh once and poll each SKU until all its pools are visible."""
+    mocker.patch("ethel.utils.time.sleep")
+    api.regnum.order.return_value = dict(regNumbers=[[dict(regNumber=1)]])
+    api.activation.activate.side_effect = [dict(id=1), dict(id=2), dict(id=3)]
+    api.candlepin.refresh.return_value = dict(id="job")
+    pool_1, pool_2, pool_3 = (dict(subscriptionId=str(i)) for i in range(1, 4))
+    visible = dict(SKU_A=[[pool_1], [pool_1, pool_2]], SKU_B=[[pool_3]])
+
+    def get_pools(*_, product, **__):
+        return visible[product].pop(0)
+
+    api.candlepin.get_pools.side_effect = get_pools
+
+    with account.defer_visibility():
+        account.subscribe("SKU_A", wait=True)
+        account.subscribe("SKU_A", wait=True)
+        account.subscribe("SKU_B", wait=True)
+        api.candlepin.refresh.assert_not_called()
+
+    api.candlepin.refresh.assert_called_once()
+    assert api.candlepin.get_pools.call_count == 3
+
+
+def test_wait_for_pools_nothing_pending(api: API, account: Account):
+    """Should not refresh when there's nothing to wait for."""
+    account.wait_for_pools({})
+    account.wait_for_pools(dict(SKU=[]))
+    api.candlepin.refresh.assert_not_called()
+
+
+def test_expired_pools(api: API, account: Account):
+    """Should list pools which ended before the given date."""
+    api.candlepin.get_pools.return_value = [
+        dict(id="OLD", endDate="2020-01-31T00:00:00+0000"),
+        dict(id="CURRENT", endDate="2020-02-01T00:00:00+0000"),
+    ]
+    assert account.expired_pools("2020-02-01") == ["OLD"]
+    assert api.candlepin.get_pools.call_args[1]["fields"] == ["id", "endDate"]
+
+
+def test_retire(api: API, account: Account):
+    """Should delete the owner and the user."""
+    account.retire()
+    api.candlepin.delete_owner.assert_called_once_with(1234)
+    api.candlepin.delete_user.assert_called_once_with("USERNAME")
+
+
+def test_reset(mocker, api: API, account: Account):
+    """Should delete expired pools and subscribe to missing SKUs."""
+    subscribe = mocker.patch.object(Account, "subscribe")
+    wait_for_pools = mocker.patch.object(Account, "wait_for_pools")
+    api.candlepin.get_pools.return_value = [
+        dict(id="EXPIRED", productId="SKU_A", endDate="2000-01-01T00:00:00+0000"),
+        dict(id="KEPT", productId="SKU_A", endDate="2999-01-01T00:00:00+0000"),
+        dict(id="EXTRA", productId="SKU_A", endDate="2999-01-01T00:00:00+0000"),
+        dict(id="OTHER", productId="SKU_C", endDate="2999-01-01T00:00:00+0000"),
+    ]
+
+    account.reset(to_skus=["SKU_A", "SKU_B", "SKU_B"])
+
+    deleted = [c[0][0] for c in api.candlepin.delete_pool.call_args_list]
+    assert deleted == ["EXPIRED"]
+    assert subscribe.call_args_list == [mocker.call("SKU_B", wait=True)] * 2
+    wait_for_pools.assert_called_once_with({}, timeout=300)
+
+
+def test_register_consumers(api: API, account: Account):
+    """Should register consumers and remember their UUIDs."""
+    api.candlepin.register_consumer.side_effect = lambda *args, **_: dict(uuid=args[3])
+    assert account.register_consumers(2) == ["ethel-system-0", "ethel-system-1"]
+    assert account.register_consumers(1, "box") == ["box-2"]
+    assert account.consumers == ["ethel-system-0", "ethel-system-1", "box-2"]
+
+
+def test_attach_and_unregister(api: API, account: Account):
+    """Should attach a pool to and unregister all known consumers by default."""
+    account.consumers = ["A", "B"]
+    api.candlepin.attach_pool.return_value = [dict(id="ENT")]
+
+    assert account.attach("POOL", quantity=2) == [[dict(id="ENT")]] * 2
+    api.candlepin.attach_pool.assert_any_call("USERNAME", "PASSWORD", "B", "POOL", 2)
+
+    account.unregister_consumers(["A"])
+    api.candlepin.unregister_consumer.assert_called_once_with("USERNAME", "PASSWORD", "A")
+    assert account.consumers == ["B"]
+
+
+def test_find_pools(api: API, account: Account):
+    """Should pass filters to Candlepin."""
+    api.candlepin.get_pools.return_value = [dict(id="POOL")]
+    pools = account.find_pools(
+        sku="SKU",
+        active_on="2020-02-01",
+        attributes=dict(arch="x86_64"),
+        filter_attributes={"my_id": "id"},
+    )
+    assert pools == [{"my_id": "POOL"}]
+    api.candlepin.get_pools.assert_called_once_with(
+        "USERNAME",
+        "PASSWORD",
+        1234,
+        future=False,
+        product="SKU",
+        fields=["id"],
+        active_on=date(2020, 2, 1),
+        matches=None,
+        attributes=dict(arch="x86_64"),
+        consumer=None,
+    )
+
+
+def test_pool_changes(api: API, account: Account):
+    """Should map only added and changed pools."""
+    raw_pool = dict(id="A", startDate="S", endDate="E", quantity=1)
+    api.candlepin.get_pools.return_value = [raw_pool]
+
+    changes = account.pool_changes(filter_attributes={"my_id": "id"})
+    assert changes.added == [{"my_id": "A"}]
+    assert api.candlepin.get_pools.call_args[1]["fields"] == [
+        "id",
+        "startDate",
+        "endDate",
+        "quantity",
+    ]
+
+    api.candlepin.get_pools.return_value = [dict(raw_pool, quantity=2)]
+    changes = account.pool_changes(since=changes.snapshot, filter_attributes={})
+    assert changes.changed == [dict(raw_pool, quantity=2)]
+    assert not changes.added and not changes.removed
+
+
+def test_org_id_concurrent(mocker, api: API):
+    """Should look up the organization ID once when accessed concurrently."""
+    mocker.patch.object(Account, "does_exist", return_value=True)
+    mocker.patch.object(Account, "login")
+    account = Account(api, "USERNAME", "PASSWORD")
+    api.user.login.return_value = [dict(orgId=5678)]
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        org_ids = list(executor.map(lambda _: account.org_id, range(8)))
+
+    assert org_ids == [5678] * 8
+    api.user.login.assert_called_once()
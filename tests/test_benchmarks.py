@@ -0,0 +1,44 @@
+import json
+
+import pytest  # type: ignore
+
+from benchmarks import runner
+from benchmarks.cases import CASES
+
+
+@pytest.mark.parametrize("name", CASES)
+def test_case_runs(name):
+    """Should prepare and run each benchmark case."""
+    assert CASES[name](3)() is None
+
+
+def test_compare():
+    """Should report cases slower than the threshold."""
+    results = dict(fast=1.0, slow=1.5, new=1.0)
+    baseline = dict(fast=1.05, slow=1.0)
+    assert runner.compare(results, baseline, threshold=0.1) == dict(slow=0.5)
+
+
+def test_find_baseline():
+    """Should find the latest record of a different revision."""
+    history = [dict(revision="aaa"), dict(revision="bbb"), dict(revision="ccc")]
+    assert runner.find_baseline(history, "ccc") == dict(revision="bbb")
+    assert runner.find_baseline(history, "ccc", baseline="a") == dict(revision="aaa")
+    assert runner.find_baseline(history[:1], "aaa") is None
+
+
+def test_main_stores_and_flags_regressions(tmp_path, mocker):
+    """Should store results per revision and fail on a regression."""
+    history = tmp_path / "history.jsonl"
+    mocker.patch.object(runner, "measure", return_value=dict(quantity=1.0))
+    mocker.patch.object(runner, "git_revision", side_effect=["aaa", "bbb", "ccc"])
+
+    assert runner.main(["--history", str(history)]) == 0
+    runner.measure.return_value = dict(quantity=1.05)
+    assert runner.main(["--history", str(history)]) == 0
+    runner.measure.return_value = dict(quantity=2.0)
+    assert runner.main(["--history", str(history), "--threshold", "0.5"]) == 1
+
+    records = [json.loads(line) for line in history.read_text().splitlines()]
+    assert [record["revision"] for record in records] == ["aaa", "bbb", "ccc"]
+    assert records[-1]["results"] == dict(quantity=2.0)
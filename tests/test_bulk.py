@@ -0,0 +1,73 @@
+import pickle
+from concurrent.futures import ThreadPoolExecutor
+
+from ethel import bulk
+from ethel import api as ethel_api
+from ethel.api.breaker import get_circuit_breaker
+
+SPECS = [dict(username=f"USERNAME_{i}", password="PASSWORD") for i in range(5)]
+
+
+def test_provision(mocker):
+    """Should provision each spec and report progress."""
+    mocker.patch("ethel.bulk.ProcessPoolExecutor", ThreadPoolExecutor)
+    initialize_apis = mocker.patch("ethel.bulk.initialize_apis")
+    account = mocker.patch("ethel.bulk.Account")
+    account.return_value.ledger = [mocker.Mock(activation_id=1)]
+    account.return_value.api.hosts = ("HOST_A", "HOST_B")
+    progress = mocker.Mock()
+
+    results = list(
+        bulk.provision("HOST_A", "HOST_B", SPECS, shard_size=2, progress=progress)
+    )
+
+    initialize_apis.assert_called_with("HOST_A", "HOST_B")
+    assert sorted(r.username for r in results) == [s["username"] for s in SPECS]
+    assert all(r.ok and r.activations == [1] for r in results)
+    assert all(r.handle.rest_host == "HOST_A" for r in results)
+    assert progress.call_count == len(SPECS)
+    assert progress.call_args[0][:2] == (len(SPECS), len(SPECS))
+
+
+def test_provision_reports_errors(mocker):
+    """Should report failures instead of raising."""
+    mocker.patch("ethel.bulk.ProcessPoolExecutor", ThreadPoolExecutor)
+    mocker.patch("ethel.bulk.initialize_apis")
+    mocker.patch("ethel.bulk.Account", side_effect=ValueError("boom"))
+
+    report = bulk.BulkReport()
+    for result in bulk.provision("HOST_A", "HOST_B", SPECS[:2]):
+        report.add(result)
+
+    assert not report.succeeded
+    assert report.errors == {
+        "USERNAME_0": "ValueError: boom",
+        "USERNAME_1": "ValueError: boom",
+    }
+    assert str(report) == "Provisioned 0/2 accounts."
+
+
+def test_init_worker_applies_settings(mocker):
+    """Should configure worker sessions by pickled settings of the parent."""
+    mocker.patch("ethel.bulk._WORKER_API", None)
+    api = ethel_api.initialize_apis("HOST_A", "HOST_B")
+    api.candlepin.api.timeout = (1, 2)
+    api.candlepin.api.limiter = ethel_api.RateLimiter(rate=10, concurrency=2)
+    api.user.api.hedger = ethel_api.Hedger(percentile=0.9)
+    api.user.api.breaker = get_circuit_breaker(api.user.api.api_base_url, 2, 5)
+    api.user.api.use_transport("urllib3")
+
+    settings = pickle.loads(pickle.dumps(bulk.api_settings(api)))
+    bulk._init_worker("HOST_A", "HOST_B", settings)  # pylint: disable=protected-access
+    worker = bulk._WORKER_API  # pylint: disable=protected-access
+
+    assert worker.candlepin.api.timeout == (1, 2)
+    assert worker.candlepin.api.limiter is not api.candlepin.api.limiter
+    assert worker.candlepin.api.limiter.bucket.rate == 10
+    assert worker.candlepin.api.limiter.concurrency.limit == 2
+    assert worker.user.api.hedger.percentile == 0.9
+    assert worker.user.api.breaker.failure_threshold == 2
+    assert worker.user.api.breaker.reset_timeout == 5
+    assert worker.user.api.transport.name == "urllib3"
+    assert worker.regnum.api.limiter is None
+    assert worker.regnum.api.breaker is None
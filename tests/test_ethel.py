@@ -1,3 +1,5 @@
+import pytest  # type: ignore
+
 import ethel
 from ethel.ethel import HOSTS
 
@@ -33,3 +35,133 @@ def test_create_account(mocker):
     mocked_account.assert_called_once_with(
         e.api, "USERNAME", "PASSWORD", accept_terms=False
     )
+
+
+def test_bulk_create_accounts(mocker):
+    """Should pass hosts and session settings to bulk provisioning."""
+    mocked_provision = mocker.patch.object(ethel.ethel, "provision")
+    e = ethel.Ethel("HOSTNAME_A", "HOSTNAME_B")
+    e.set_timeouts(candlepin=(1, 2))
+    e.bulk_create_accounts([dict(username="USERNAME")], processes=2)
+    mocked_provision.assert_called_once_with(
+        "HOSTNAME_A",
+        "HOSTNAME_B",
+        [dict(username="USERNAME")],
+        processes=2,
+        shard_size=1,
+        progress=None,
+        settings=mocker.ANY,
+    )
+    settings = mocked_provision.call_args[1]["settings"]
+    assert settings["candlepin"].timeout == (1, 2)
+
+
+def test_bulk_create_accounts_simulated():
+    """Should refuse to provision against a simulated backend in other processes."""
+    with pytest.raises(ValueError):
+        ethel.Ethel.simulated().bulk_create_accounts([dict(username="USERNAME")])
+
+
+def test_rate_limit():
+    """Should set rate limiters on API sessions."""
+    e = ethel.Ethel("HOSTNAME_A", "HOSTNAME_B")
+    limiter = ethel.api.RateLimiter(rate=10)
+    e.rate_limit(user=limiter)
+    assert e.api.user.api.limiter is limiter
+    assert e.api.candlepin.api.limiter is None
+
+
+def test_rate_limit_unknown_service():
+    """Should refuse unknown services."""
+    e = ethel.Ethel("HOSTNAME_A", "HOSTNAME_B")
+    with pytest.raises(ValueError):
+        e.rate_limit(unknown=ethel.api.RateLimiter())
+
+
+def test_enable_circuit_breakers():
+    """Should guard each API by a breaker keyed by its base URL."""
+    e = ethel.Ethel("HOSTNAME_A", "HOSTNAME_B")
+    e.enable_circuit_breakers(failure_threshold=2)
+    for client in e.api.clients().values():
+        assert client.api.breaker.api_base_url == client.api.api_base_url
+        assert client.api.breaker.failure_threshold == 2
+
+
+def test_enable_hedging():
+    """Should set hedgers for lookup services only."""
+    e = ethel.Ethel("HOSTNAME_A", "HOSTNAME_B")
+    e.enable_hedging(max_extra=0.1)
+    assert e.api.user.api.hedger.max_extra == 0.1
+    assert e.api.candlepin.api.hedger is not e.api.user.api.hedger
+    assert e.api.regnum.api.hedger is None
+
+
+def test_enable_hedging_unknown_service():
+    """Should reject unknown service names."""
+    with pytest.raises(ValueError, match="Unknown services"):
+        ethel.Ethel("HOSTNAME_A", "HOSTNAME_B").enable_hedging(services=["nope"])
+
+
+def test_environment(mocker):
+    """Should create an instance for a registered environment."""
+    mocked_initialize_apis = mocker.patch.object(ethel.ethel, "initialize_apis")
+    mocker.patch.dict(HOSTS)
+    ethel.register_environment("custom", "HOSTNAME_A", "HOSTNAME_B")
+    assert isinstance(ethel.Ethel.environment("custom"), ethel.Ethel)
+    mocked_initialize_apis.assert_called_once_with("HOSTNAME_A", "HOSTNAME_B")
+
+
+def test_environment_unknown():
+    """Should refuse unknown environments."""
+    with pytest.raises(ValueError):
+        ethel.Ethel.environment("unknown")
+
+
+def test_multi(mocker):
+    """Should create an instance per environment."""
+    mocked_initialize_apis = mocker.patch.object(ethel.ethel, "initialize_apis")
+    multi = ethel.Ethel.multi(["stage", "qa"])
+    assert set(multi.instances) == {"stage", "qa"}
+    mocked_initialize_apis.assert_has_calls(
+        [mocker.call(*HOSTS["stage"]), mocker.call(*HOSTS["qa"])]
+    )
+
+
+def test_set_timeouts():
+    """Should set timeouts per service."""
+    instance = ethel.Ethel("HOST_A", "HOST_B")
+    instance.set_timeouts((1, 2), candlepin=(3, 4))
+    assert instance.api.candlepin.api.timeout == (3, 4)
+    assert instance.api.user.api.timeout == (1, 2)
+
+    with pytest.raises(ValueError):
+        instance.set_timeouts(unknown=(1, 1))
+
+
+def test_prewarm(mocker):
+    """Should open connections to all services and report failures."""
+    instance = ethel.Ethel("HOST_A", "HOST_B")
+    prewarm = mocker.patch("ethel.api.base.APISession.prewarm")
+    mocker.patch.object(instance.api.terms.api, "prewarm", side_effect=OSError)
+
+    outcome = instance.prewarm(connections=2)
+
+    assert prewarm.call_count == 8
+    assert isinstance(outcome.pop("terms"), OSError)
+    assert outcome == dict(candlepin=None, user=None, regnum=None, activation=None)
+
+
+def test_prewarm_no_connections():
+    """Should reject less than one connection per service."""
+    with pytest.raises(ValueError, match="At least one connection"):
+        ethel.Ethel("HOST_A", "HOST_B").prewarm(connections=0)
+
+
+def test_stage_prewarm(mocker):
+    """Should prewarm on request."""
+    mocker.patch.object(ethel.ethel, "initialize_apis")
+    prewarm = mocker.patch.object(ethel.Ethel, "prewarm")
+    ethel.Ethel.stage()
+    prewarm.assert_not_called()
+    ethel.Ethel.stage(prewarm=True)
+    prewarm.assert_called_once()
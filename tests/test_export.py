@@ -0,0 +1,116 @@
+# pylint: disable=redefined-outer-name
+import csv
+import json
+from typing import List
+
+import pytest  # type: ignore
+
+from ethel import Account, Ethel, export
+from ethel.inventory import AccountPools, scan_pools
+
+
+@pytest.fixture
+def accounts() -> List[Account]:
+    """Simulated accounts with pools."""
+    ethel = Ethel.simulated()
+    accounts = [
+        ethel.create_account(f"USERNAME_{i}", "PASSWORD", skus=["SKU_A", "SKU_B"])
+        for i in range(3)
+    ]
+    return accounts
+
+
+def test_chunks():
+    """Should split rows into bounded chunks."""
+    assert [len(c) for c in export.chunks(iter(range(5)), 2)] == [2, 2, 1]
+    assert not list(export.chunks([], 2))
+
+
+def test_pool_rows(mocker):
+    """Should attach account to pools and collect errors of failed accounts."""
+    account = mocker.Mock(username="USERNAME", owner_id="OWNER")
+    error = Exception()
+    results = [
+        AccountPools(account, [dict(pool_id="1"), dict(pool_id="2")]),
+        AccountPools(mocker.Mock(username="FAILED"), error=error),
+    ]
+    errors: dict = {}
+    assert list(export.pool_rows(results, errors)) == [
+        dict(username="USERNAME", owner_id="OWNER", pool_id="1"),
+        dict(username="USERNAME", owner_id="OWNER", pool_id="2"),
+    ]
+    assert errors == dict(FAILED=error)
+
+
+def test_export_csv(accounts, tmp_path):
+    """Should export pools of all accounts into CSV."""
+    path = tmp_path / "pools.csv"
+
+    report = Ethel.export_pools(accounts, path, chunk_size=4)
+    assert report.rows == 6
+    assert report.ok
+
+    with path.open() as exported:
+        rows = list(csv.DictReader(exported))
+    assert tuple(rows[0]) == export.COLUMNS
+    assert {row["username"] for row in rows} == {f"USERNAME_{i}" for i in range(3)}
+    assert sorted(row["sku_id"] for row in rows) == ["SKU_A"] * 3 + ["SKU_B"] * 3
+
+
+def test_export_jsonl(accounts, tmp_path):
+    """Should export pools of all accounts into JSON lines."""
+    path = tmp_path / "pools.jsonl"
+
+    assert export.export_pools(scan_pools(accounts), path, chunk_size=4).rows == 6
+
+    rows = [json.loads(line) for line in path.read_text().splitlines()]
+    assert len(rows) == 6
+    assert all(tuple(row) == export.COLUMNS for row in rows)
+    assert {row["owner_id"] for row in rows} == {a.owner_id for a in accounts}
+
+
+@pytest.mark.parametrize("file_format", ["arrow", "parquet"])
+def test_export_arrow(accounts, tmp_path, file_format):
+    """Should export typed columns into Arrow and Parquet."""
+    pyarrow = pytest.importorskip("pyarrow")
+    path = tmp_path / "pools.data"
+    accounts[0].subscribe("SKU_C", quantity=-1, wait=True)
+
+    count = export.export_pools(
+        scan_pools(accounts), path, file_format=file_format, chunk_size=4
+    ).rows
+
+    if file_format == "parquet":
+        table = pyarrow.parquet.read_table(str(path))
+    else:
+        table = pyarrow.ipc.open_file(str(path)).read_all()
+    assert count == table.num_rows == 7
+    assert table.schema.field("quantity").type == pyarrow.float64()
+    assert table.schema.field("owner_id").type == pyarrow.string()
+    assert float("inf") in table.column("quantity").to_pylist()
+
+
+def test_export_unknown_format(tmp_path):
+    """Should refuse unknown formats."""
+    with pytest.raises(ValueError):
+        export.export_pools([], tmp_path / "pools.xlsx")
+
+
+def test_export_without_pyarrow(tmp_path, mocker):
+    """Should require pyarrow for Arrow and Parquet."""
+    mocker.patch.object(export, "pyarrow", None)
+    with pytest.raises(ImportError):
+        export.export_pools([], tmp_path / "pools.parquet")
+    assert export.export_pools([], tmp_path / "pools.csv").rows == 0
+
+
+def test_export_reports_failures(accounts, tmp_path):
+    """Should report accounts whose pools couldn't be listed."""
+    accounts[0].password = "WRONG_PASSWORD"
+
+    report = Ethel.export_pools(accounts, tmp_path / "pools.csv")
+
+    assert report.rows == 4
+    assert list(report.errors) == ["USERNAME_0"]
+    assert report.errors["USERNAME_0"].status_code == 401
+    assert str(report) == "Exported 4 pools, 1 accounts failed."
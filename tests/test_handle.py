@@ -0,0 +1,56 @@
+# pylint: disable=protected-access
+
+import pickle
+
+import pytest  # type: ignore
+
+from ethel import Account, AccountHandle, Ethel
+from ethel.api import API
+from ethel.handle import get_api
+
+
+def test_handle_pickle(api: API):
+    """Should rebuild an account from a pickled handle without any requests."""
+    api.hosts = ("HOST_A", "HOST_B")
+    account = Account.restore(api, "USERNAME", "PASSWORD", org_id=1, owner_id=2)
+
+    handle = pickle.loads(pickle.dumps(AccountHandle.from_account(account)))
+    assert handle == AccountHandle("HOST_A", "HOST_B", "USERNAME", "PASSWORD", None, 1, 2)
+    assert "PASSWORD" not in repr(handle)
+
+    restored = handle.open(api)
+    assert (restored.username, restored.password) == ("USERNAME", "PASSWORD")
+    assert (restored.org_id, restored.owner_id) == (1, 2)
+    assert not any(client.mock_calls for client in api.clients().values())
+    assert AccountHandle.from_dict(handle.as_dict()) == handle
+
+
+def test_handle_password_env(monkeypatch, api: API):
+    """Should read the password from the environment."""
+    api.hosts = ("HOST_A", "HOST_B")
+    account = Account.restore(api, "USERNAME", "PASSWORD")
+    handle = AccountHandle.from_account(account, password_env="ETHEL_PASSWORD")
+    assert handle.password is None
+
+    with pytest.raises(ValueError):
+        handle.open(api)
+
+    monkeypatch.setenv("ETHEL_PASSWORD", "SECRET")
+    assert handle.open(api).password == "SECRET"
+
+
+def test_handle_shared_api():
+    """Should share API clients of handles with the same hosts."""
+    handle = AccountHandle("HOST_A", "HOST_B", "USERNAME", "PASSWORD")
+    assert handle.open().api is handle.open().api is get_api("HOST_A", "HOST_B")
+
+
+def test_handle_simulated():
+    """Should keep using the cached IDs of a live account."""
+    ethel = Ethel.simulated()
+    account = ethel.create_account("USERNAME", "PASSWORD", skus=["SKU"])
+    handle = AccountHandle.from_account(account)
+    assert handle.org_id == account.org_id
+
+    restored = handle.open(ethel.api)
+    assert restored.list_pools(future=True) == account.list_pools(future=True)
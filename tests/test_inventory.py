@@ -0,0 +1,67 @@
+import threading
+
+from ethel import Ethel, EthelError
+from ethel.inventory import scan_pools
+
+
+def test_scan_pools(ethel: Ethel):
+    """Should list pools of all accounts."""
+    accounts = [
+        ethel.create_account(f"USERNAME_{i}", "PASSWORD", skus=["SKU"] * i)
+        for i in range(4)
+    ]
+
+    results = list(Ethel.scan_pools(accounts, concurrency=2))
+
+    assert all(result.ok for result in results)
+    counts = {result.account.username: len(result.pools) for result in results}
+    assert counts == {f"USERNAME_{i}": i for i in range(4)}
+
+
+def test_scan_pools_filters(ethel: Ethel):
+    """Should filter pools on the server and by a predicate, skip empty accounts."""
+    accounts = [
+        ethel.create_account(f"USERNAME_{i}", "PASSWORD", skus=["SKU_A", "SKU_B"])
+        for i in range(3)
+    ]
+    accounts[0].subscribe("SKU_A", quantity=5, wait=True)
+
+    by_sku = list(scan_pools(accounts, sku="SKU_A"))
+    assert all(p["sku_id"] == "SKU_A" for r in by_sku for p in r.pools)
+    assert sum(len(result.pools) for result in by_sku) == 4
+
+    large = list(
+        scan_pools(accounts, where=lambda pool: pool["quantity"] == 5, skip_empty=True)
+    )
+    assert [result.account.username for result in large] == ["USERNAME_0"]
+
+
+def test_scan_pools_reports_errors(ethel: Ethel):
+    """Should report errors and continue with other accounts."""
+    accounts = [ethel.create_account(f"USERNAME_{i}", "PASSWORD") for i in range(2)]
+    accounts[0].password = "WRONG_PASSWORD"
+
+    results = {r.account.username: r for r in scan_pools(accounts, skip_empty=True)}
+
+    assert set(results) == {"USERNAME_0"}
+    assert isinstance(results["USERNAME_0"].error, EthelError)
+
+
+def test_scan_pools_streams_lazily(mocker):
+    """Should consume accounts lazily and cancel the rest when closed early."""
+    consumed = []
+    release = threading.Event()
+
+    def accounts():
+        for i in range(100):
+            account = mocker.Mock(username=f"USERNAME_{i}")
+            account.list_pools.side_effect = lambda **_: release.wait() and []
+            consumed.append(account)
+            yield account
+
+    results = scan_pools(accounts(), concurrency=2)
+    release.set()
+    next(results)
+    results.close()
+
+    assert len(consumed) < 10
@@ -0,0 +1,90 @@
+import io
+import json
+from datetime import date
+
+import hypothesis.strategies as st
+from hypothesis import given
+
+from ethel.ledger import Ledger, Subscription
+
+subscriptions = st.builds(
+    Subscription,
+    sku_id=st.sampled_from(["SKU_A", "SKU_B"]),
+    quantity=st.integers(min_value=1),
+    reg_number=st.integers(min_value=1),
+    activation_id=st.integers(min_value=1),
+    start_date=st.dates(),
+    duration=st.integers(min_value=1),
+)
+
+
+@given(subscriptions)
+def test_subscription_round_trip(record):
+    """Should convert to a dict and back."""
+    assert Subscription.from_dict(record.as_dict()) == record
+
+
+def test_subscription_slots():
+    """Should not carry an instance dict."""
+    record = Subscription("SKU", 1, 2, 3, date(2020, 1, 1), 366)
+    assert not hasattr(record, "__dict__")
+    assert record.end_date == date(2021, 1, 1)
+
+
+@given(st.lists(subscriptions))
+def test_ledger_unbounded(records):
+    """Should keep all records in order."""
+    ledger = Ledger()
+    for record in records:
+        ledger.add(record)
+    assert list(ledger) == records
+    assert ledger.by_sku("SKU_A") == [r for r in records if r.sku_id == "SKU_A"]
+    assert ledger.latest() == (records[-1] if records else None)
+
+
+@given(st.lists(subscriptions, min_size=3))
+def test_ledger_bounded(records):
+    """Should keep only the most recent records."""
+    ledger = Ledger(max_records=2)
+    for record in records:
+        ledger.add(record)
+    assert len(ledger) == 2
+    assert list(ledger) == records[-2:]
+
+
+def test_ledger_spill(tmp_path):
+    """Should spill evicted records to disk and read them back."""
+    records = [
+        Subscription(f"SKU_{i % 2}", 1, i, i, date(2020, 1, 1), 365)
+        for i in range(5)
+    ]
+    ledger = Ledger(max_records=2, spill_path=str(tmp_path / "spill.jsonl"))
+    for record in records:
+        ledger.add(record)
+
+    assert ledger.spilled == 3
+    assert list(ledger) == records[-2:]
+    assert list(ledger.records(include_spilled=True)) == records
+    assert ledger.by_sku("SKU_0", include_spilled=True) == records[::2]
+
+    exported = io.StringIO()
+    assert ledger.export(exported) == 5
+    assert len(exported.getvalue().splitlines()) == 5
+
+
+def test_ledger_spill_shared(tmp_path):
+    """Should read back only records spilled by the ledger itself."""
+    spill_path = tmp_path / "spill.jsonl"
+    earlier = Subscription("SKU_EARLIER", 1, 0, 0, date(2020, 1, 1), 365)
+    spill_path.write_text(json.dumps(earlier.as_dict()) + "\n")
+
+    ledgers = [Ledger(max_records=1, spill_path=str(spill_path)) for _ in range(2)]
+    records = [
+        Subscription(f"SKU_{i}", 1, i, i, date(2020, 1, 1), 365) for i in range(4)
+    ]
+    for i, record in enumerate(records):
+        ledgers[i % 2].add(record)
+
+    assert list(ledgers[0].records(include_spilled=True)) == records[0::2]
+    assert list(ledgers[1].records(include_spilled=True)) == records[1::2]
+    assert not ledgers[0].by_sku("SKU_EARLIER", include_spilled=True)
@@ -0,0 +1,46 @@
+import pytest  # type: ignore
+
+from ethel import Ethel, EthelError
+from ethel.multi import MultiEthel, fan_out
+
+
+def test_fan_out():
+    """Should collect results and errors by environment."""
+    outcome = fan_out(dict(a=1, b=0), lambda value: 1 / value)
+    assert outcome.results == dict(a=1)
+    assert isinstance(outcome.errors["b"], ZeroDivisionError)
+    assert not outcome.ok
+    with pytest.raises(ZeroDivisionError):
+        outcome.raise_for_errors()
+
+
+def test_fan_out_empty():
+    """Should succeed with no environments."""
+    assert fan_out({}, lambda value: value).ok
+
+
+def test_create_account_and_subscribe():
+    """Should create the account and subscribe it in every environment."""
+    multi = MultiEthel(dict(stage=Ethel.simulated(), qa=Ethel.simulated()))
+    account = multi.create_account("USERNAME", "PASSWORD")
+    assert set(account.accounts) == {"stage", "qa"}
+    assert not account.errors
+
+    outcome = account.subscribe("SKU", wait=True)
+    assert outcome.ok
+    for environment in ("stage", "qa"):
+        assert account[environment].list_pools()[0]["sku_id"] == "SKU"
+        assert (
+            outcome.results[environment]
+            == account[environment].ledger.latest().activation_id
+        )
+
+
+def test_create_account_partial_failure():
+    """Should report environments where the account couldn't be created."""
+    multi = MultiEthel(dict(stage=Ethel.simulated(), qa=Ethel.simulated()))
+    multi["qa"].create_account("USERNAME", "OTHER_PASSWORD")
+
+    account = multi.create_account("USERNAME", "PASSWORD")
+    assert set(account.accounts) == {"stage"}
+    assert isinstance(account.errors["qa"], EthelError)
@@ -0,0 +1,35 @@
+from ethel.pools import PoolSnapshot, diff_pools, fingerprint
+
+
+def pool(pool_id: str, quantity: int = 1) -> dict:
+    """Raw pool with fingerprint fields."""
+    return dict(
+        id=pool_id,
+        startDate="2020-01-01T00:00:00+0000",
+        endDate="2021-01-01T00:00:00+0000",
+        quantity=quantity,
+    )
+
+
+def test_fingerprint():
+    """Should ignore attributes other than dates and quantity."""
+    assert fingerprint(pool("A")) == fingerprint(dict(pool("A"), productName="X"))
+    assert fingerprint(pool("A")) != fingerprint(pool("A", quantity=2))
+
+
+def test_diff_pools_initial():
+    """Should report all pools as added without a snapshot."""
+    changes = diff_pools([pool("A"), pool("B")])
+    assert changes.added == [pool("A"), pool("B")]
+    assert not changes.changed and not changes.removed
+    assert len(changes.snapshot) == 2 and "A" in changes.snapshot
+
+
+def test_diff_pools():
+    """Should report added, changed and removed pools only."""
+    snapshot = diff_pools([pool("A"), pool("B"), pool("C")]).snapshot
+    changes = diff_pools([pool("A"), pool("B", quantity=5), pool("D")], snapshot)
+    assert changes.added == [pool("D")]
+    assert changes.changed == [pool("B", quantity=5)]
+    assert changes.removed == ["C"]
+    assert not diff_pools([pool("A")], PoolSnapshot({"A": fingerprint(pool("A"))}))
@@ -0,0 +1,129 @@
+# pylint: disable=protected-access
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest  # type: ignore
+
+from ethel import Ethel
+from ethel.pytest_plugin import AccountPool, spec_key
+
+
+def test_plugin(pytester):
+    """Should share provisioned accounts by SKUs."""
+    pytester.makepyfile("""
+        import pytest
+
+        USERNAMES = {}
+
+        @pytest.mark.ethel_account(skus=["SKU_B", "SKU_A"])
+        def test_first(ethel_account):
+            USERNAMES["first"] = ethel_account.username
+            skus = sorted(p["sku_id"] for p in ethel_account.list_pools())
+            assert skus == ["SKU_A", "SKU_B"]
+
+        @pytest.mark.ethel_account(skus=["SKU_A", "SKU_B"])
+        def test_same(ethel_account):
+            assert ethel_account.username == USERNAMES["first"]
+
+        def test_default(ethel_account, ethel):
+            assert ethel_account.list_pools() == []
+            assert len(ethel.backend.users) == 2
+        """)
+    result = pytester.runpytest(
+        "-p", "ethel.pytest_plugin", "--ethel-env", "simulated", "--ethel-prefix", "x"
+    )
+    result.assert_outcomes(passed=3)
+
+
+def test_plugin_requires_credentials(pytester, monkeypatch):
+    """Should require a prefix and a password outside of the simulated environment."""
+    monkeypatch.delenv("ETHEL_PREFIX", raising=False)
+    monkeypatch.delenv("ETHEL_PASSWORD", raising=False)
+    pytester.makepyfile("""
+        import pytest
+
+        @pytest.mark.ethel_account(skus=["SKU_A"])
+        def test_account(ethel_account):
+            pass
+        """)
+    result = pytester.runpytest("-p", "ethel.pytest_plugin", "--ethel-env", "qa")
+    result.stderr.fnmatch_lines(["*--ethel-prefix and --ethel-password are required*"])
+    assert result.ret == pytest.ExitCode.USAGE_ERROR
+
+
+def test_account_pool_workers(tmp_path):
+    """Should provision each account by a single worker only."""
+    ethel = Ethel.simulated()
+    pools = [
+        AccountPool(ethel, "x", "PASSWORD", f"gw{i}", 2, shared_dir=tmp_path)
+        for i in range(2)
+    ]
+    specs = [[f"SKU_{i}"] for i in range(6)]
+    for pool in pools:
+        pool.prefetch(specs)
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        accounts = list(executor.map(lambda pool: [pool.get(s) for s in specs], pools))
+
+    assert len(ethel.backend.users) == len(specs)
+    assert [a.username for a in accounts[0]] == [a.username for a in accounts[1]]
+    owners = {pools[0].owner(spec_key(s)) for s in specs}
+    assert owners == {0, 1}
+
+
+def test_account_pool_handles_without_password(tmp_path):
+    """Should not publish passwords to the shared directory."""
+    ethel = Ethel.simulated()
+    owner, other = [
+        AccountPool(ethel, "x", "PASSWORD", f"gw{i}", 2, shared_dir=tmp_path)
+        for i in range(2)
+    ]
+    key = next(
+        k for k in (spec_key([f"SKU_{i}"]) for i in range(10)) if owner.owner(k) == 0
+    )
+    owner.prefetch([key])
+    other.prefetch([key])
+
+    assert other.get(key).password == "PASSWORD"
+    [handle] = tmp_path.glob("*.json")
+    assert "PASSWORD" not in handle.read_text()
+
+
+def test_account_pool_not_prefetched(tmp_path):
+    """Should provision accounts requested only by a single worker itself."""
+    ethel = Ethel.simulated()
+    pool = AccountPool(ethel, "x", "PASSWORD", "gw1", 2, shared_dir=tmp_path)
+    account = pool.get(["SKU_A"])
+    assert account.username.endswith("-1")
+    assert not list(tmp_path.iterdir())
+
+
+def test_account_pool_reuse():
+    """Should reset existing accounts."""
+    ethel = Ethel.simulated()
+    account = AccountPool(ethel, "x", "PASSWORD").get(["SKU_A"])
+    account.subscribe("SKU_B", start_date="2000-01-01", duration=10, wait=True)
+
+    reused = AccountPool(ethel, "x", "PASSWORD").get(["SKU_A"])
+    assert reused.username == account.username
+    assert [p["sku_id"] for p in reused.list_pools(future=True)] == ["SKU_A"]
+
+
+def test_account_pool_error(tmp_path, mocker):
+    """Should pass provisioning errors to other workers."""
+    ethel = Ethel.simulated()
+    owner, other = [
+        AccountPool(ethel, "x", "PASSWORD", f"gw{i}", 2, shared_dir=tmp_path)
+        for i in range(2)
+    ]
+    key = next(
+        k for k in (spec_key([f"SKU_{i}"]) for i in range(10)) if owner.owner(k) == 0
+    )
+    mocker.patch.object(ethel, "create_account", side_effect=ValueError("boom"))
+    owner.prefetch([key])
+    other.prefetch([key])
+
+    with pytest.raises(ValueError):
+        owner.get(key)
+    with pytest.raises(RuntimeError, match="ValueError: boom"):
+        other.get(key)
@@ -0,0 +1,67 @@
+import threading
+
+import pytest  # type: ignore
+
+from ethel.scheduler import PhaseScheduler
+
+
+def test_run_returns_results():
+    """Should run all phases and collect their results."""
+    scheduler = PhaseScheduler()
+    scheduler.add("a", lambda: 1)
+    scheduler.add("b", lambda: 2, depends_on=["a"])
+    assert scheduler.run() == {"a": 1, "b": 2}
+
+
+def test_run_respects_dependencies():
+    """Should start a phase only after its dependencies finished."""
+    order = []
+    scheduler = PhaseScheduler()
+    scheduler.add("last", lambda: order.append("last"), depends_on=["first"])
+    scheduler.add("first", lambda: order.append("first"))
+    scheduler.run()
+    assert order == ["first", "last"]
+
+
+def test_run_independent_phases_concurrently():
+    """Independent phases should overlap in time."""
+    barrier = threading.Barrier(2, timeout=5)
+    scheduler = PhaseScheduler()
+    scheduler.add("a", barrier.wait)
+    scheduler.add("b", barrier.wait)
+    scheduler.run()
+
+
+def test_run_raises_phase_error():
+    """Should re-raise the error and skip dependent phases."""
+    dependent = []
+    scheduler = PhaseScheduler()
+    scheduler.add("fails", lambda: 1 / 0)
+    scheduler.add("dependent", lambda: dependent.append(1), depends_on=["fails"])
+    with pytest.raises(ZeroDivisionError):
+        scheduler.run()
+    assert not dependent
+
+
+def test_add_duplicate():
+    """Should refuse to register the same phase twice."""
+    scheduler = PhaseScheduler()
+    scheduler.add("a", lambda: None)
+    with pytest.raises(ValueError):
+        scheduler.add("a", lambda: None)
+
+
+@pytest.mark.parametrize(
+    "phases",
+    [
+        dict(a=["missing"]),
+        dict(a=["b"], b=["a"]),
+    ],
+)
+def test_run_invalid_dependencies(phases):
+    """Should fail on unknown dependencies and cycles."""
+    scheduler = PhaseScheduler()
+    for name, depends_on in phases.items():
+        scheduler.add(name, lambda: None, depends_on=depends_on)
+    with pytest.raises(ValueError):
+        scheduler.run()
@@ -0,0 +1,47 @@
+from ethel import Ethel, EthelError
+from ethel.teardown import teardown
+
+
+def test_teardown_expired_only(ethel: Ethel):
+    """Should delete only expired pools of all accounts."""
+    accounts = [
+        ethel.create_account(f"USERNAME_{i}", "PASSWORD", skus=["SKU"])
+        for i in range(3)
+    ]
+    for account in accounts:
+        account.subscribe("OLD", start_date="2000-01-01", duration=10, wait=True)
+
+    report = Ethel.teardown(accounts, concurrency=2, rate=100)
+
+    assert report.deleted_pools == 3
+    assert report.retired == 0
+    assert not report.errors
+    for account in accounts:
+        assert not account.expired_pools()
+        assert [p["sku_id"] for p in account.list_pools(future=True)] == ["SKU"]
+
+
+def test_teardown_retire(ethel: Ethel):
+    """Should retire accounts."""
+    account = ethel.create_account("USERNAME", "PASSWORD", skus=["SKU"])
+
+    report = teardown([account], expired_only=False)
+
+    assert report.retired == 1
+    assert str(report) == "Deleted 0 pools, retired 1/1 accounts, 0 accounts failed."
+    assert "USERNAME" in ethel.backend.users
+    assert not ethel.backend.owners
+    assert not ethel.backend.pools
+
+
+def test_teardown_reports_errors(ethel: Ethel):
+    """Should collect errors instead of raising."""
+    account = ethel.create_account("USERNAME", "PASSWORD")
+    account.password = "WRONG_PASSWORD"
+
+    report = teardown([account])
+
+    assert report.deleted_pools == 0
+    [error] = report.errors["USERNAME"]
+    assert isinstance(error, EthelError)
+    assert error.status_code == 401
@@ -124,3 +124,26 @@ def test_get_quantity(source, instance_multiplier, mocker):
 def test_apply_mapping(mapping):
     """Should apply key or function mapping."""
     assert utils.apply_mapping(dict(key="value"), mapping) == "value"
+
+
+def test_wait_for_backoff(mocker):
+    """Should poll with exponentially growing delay."""
+    sleep = mocker.patch("ethel.utils.time.sleep")
+    predicate = mocker.Mock(side_effect=[False, False, False, True])
+    utils.wait_for(predicate, delay=1, max_delay=3, backoff=2)
+    assert predicate.call_count == 4
+    assert [c.args[0] for c in sleep.call_args_list] == [1, 2, 3]
+
+
+def test_wait_for_timeout(mocker):
+    """Should raise TimeoutError if predicate is never satisfied."""
+    mocker.patch("ethel.utils.time.sleep")
+    mocker.patch("ethel.utils.time.monotonic", side_effect=[0, 1, 2, 11])
+    with pytest.raises(TimeoutError):
+        utils.wait_for(lambda: False, timeout=10)
+
+
+def test_map_concurrently():
+    """Should return results in order of items."""
+    results = utils.map_concurrently(lambda x: x * 2, range(5), concurrency=2)
+    assert results == [0, 2, 4, 6, 8]